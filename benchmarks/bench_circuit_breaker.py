@@ -0,0 +1,92 @@
+"""
+Benchmark CircuitBreaker.call overhead against the original unsynchronized breaker.
+
+Usage:
+    python -m benchmarks.bench_circuit_breaker [--calls 200000]
+
+Every thread pushes the same number of successful calls through one shared
+breaker, so the numbers show the cost of the closed-state fast path under
+contention at 1, 8 and 64 threads.
+"""
+import argparse
+import threading
+import time
+from src.core.resilience.circuit_breaker import CircuitBreaker, CircuitState, CircuitBreakerOpenError
+from src.core.exceptions import PermanentError
+
+THREAD_COUNTS = (1, 8, 64)
+
+class LegacyCircuitBreaker:
+    """The breaker as it was before locking was added, kept for comparison."""
+    def __init__(self, service_name: str, failure_threshold: int = 3, recovery_timeout: float = 30.0):
+        self.service_name = service_name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CircuitState.CLOSED
+        self.failure_count = 0
+        self.last_failure_time = None
+
+    def call(self, func, *args, **kwargs):
+        if self.state == CircuitState.OPEN:
+            if time.time() - self.last_failure_time > self.recovery_timeout:
+                self.state = CircuitState.HALF_OPEN
+            else:
+                raise CircuitBreakerOpenError(f"Circuit Breaker for {self.service_name} is OPEN")
+        try:
+            result = func(*args, **kwargs)
+            self._on_success()
+            return result
+        except PermanentError:
+            raise
+        except Exception as e:
+            self._on_failure()
+            raise e
+
+    def _on_success(self):
+        if self.state == CircuitState.HALF_OPEN:
+            self.state = CircuitState.CLOSED
+        self.failure_count = 0
+
+    def _on_failure(self):
+        self.failure_count += 1
+        self.last_failure_time = time.time()
+        if self.state == CircuitState.HALF_OPEN or self.failure_count >= self.failure_threshold:
+            self.state = CircuitState.OPEN
+
+def _noop():
+    return None
+
+def run_case(breaker, threads: int, calls_per_thread: int) -> float:
+    """Return the mean wall-clock nanoseconds per call across all threads."""
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        call = breaker.call
+        barrier.wait()
+        for _ in range(calls_per_thread):
+            call(_noop)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return elapsed / (threads * calls_per_thread) * 1e9
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200000, help="total calls per case")
+    args = parser.parse_args()
+
+    print(f"{'threads':>8} {'legacy ns/call':>16} {'current ns/call':>16} {'ratio':>7}")
+    for threads in THREAD_COUNTS:
+        per_thread = max(1, args.calls // threads)
+        legacy = run_case(LegacyCircuitBreaker("bench"), threads, per_thread)
+        current = run_case(CircuitBreaker("bench"), threads, per_thread)
+        print(f"{threads:>8} {legacy:>16.1f} {current:>16.1f} {current / legacy:>7.2f}")
+
+if __name__ == "__main__":
+    main()
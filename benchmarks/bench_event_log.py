@@ -0,0 +1,106 @@
+"""
+Benchmark the binary event log and columnar analysis against JSONL.
+
+Usage:
+    python -m benchmarks.bench_event_log [--events 200000]
+
+Writes the same synthetic request events as JSONL and as binary records and
+prints bytes per event and encode/decode throughput. Then compares computing
+per-service error rates by re-parsing the JSONL file (what a dashboard
+refresh does today) with loading a converted .npz file and aggregating with
+NumPy. Needs numpy.
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import tempfile
+import time
+from src.monitoring.event_codec import EventEncoder, MAGIC, iter_raw_events
+from src.monitoring.log_analytics import error_rate_by_service
+from src.monitoring.log_columns import convert_logs, load_columns
+
+def make_events(count: int):
+    rng = random.Random(7)
+    start = datetime.datetime(2026, 1, 29, 13, 0, 0)
+    for i in range(count):
+        data = {"circuit_state": "CLOSED", "duration": round(rng.uniform(0.05, 0.5), 4), "attempts": rng.choice((1, 1, 1, 2))}
+        event_type = "REQUEST_SUCCESS"
+        if rng.random() < 0.1:
+            event_type = "REQUEST_FAILURE"
+            data.update(error="ElevenLabs is currently down (Simulated 503)", error_type="ServiceUnavailableError")
+        yield {
+            "timestamp": (start + datetime.timedelta(milliseconds=10 * i)).isoformat(),
+            "service_name": rng.choice(("ElevenLabs", "LLMProvider")),
+            "event_type": event_type,
+            **data
+        }
+
+def json_error_rates(path: str):
+    counts = {}
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            if record["event_type"] in ("REQUEST_SUCCESS", "REQUEST_FAILURE"):
+                total, failed = counts.get(record["service_name"], (0, 0))
+                counts[record["service_name"]] = (total + 1, failed + (record["event_type"] == "REQUEST_FAILURE"))
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200000)
+    args = parser.parse_args()
+    events = list(make_events(args.events))
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "app_logs.json")
+        binary_path = os.path.join(directory, "app_logs.evt")
+        columns_path = os.path.join(directory, "app_logs.npz")
+
+        start = time.perf_counter()
+        with open(json_path, "w") as f:
+            f.write("".join(json.dumps(event) + "\n" for event in events))
+        json_encode = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(binary_path, "wb") as f:
+            f.write(MAGIC + EventEncoder().encode_batch(events))
+        binary_encode = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(json_path) as f:
+            for line in f:
+                json.loads(line)
+        json_decode = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in iter_raw_events(binary_path):
+            pass
+        binary_decode = time.perf_counter() - start
+
+        for name, path, encode, decode in (
+            ("jsonl", json_path, json_encode, json_decode),
+            ("binary", binary_path, binary_encode, binary_decode)
+        ):
+            size = os.path.getsize(path)
+            print(
+                f"{name:<7} {size / args.events:6.1f} bytes/event  "
+                f"encode {args.events / encode:9.0f} events/s  decode {args.events / decode:9.0f} events/s"
+            )
+
+        start = time.perf_counter()
+        convert_logs([binary_path], columns_path)
+        convert_time = time.perf_counter() - start
+        print(f"convert to .npz: {convert_time:.2f}s ({os.path.getsize(columns_path) / args.events:.1f} bytes/event)")
+
+        start = time.perf_counter()
+        json_error_rates(json_path)
+        json_query = time.perf_counter() - start
+        start = time.perf_counter()
+        error_rate_by_service(load_columns(columns_path))
+        columnar_query = time.perf_counter() - start
+        print(f"error rate per service: JSONL re-parse {json_query * 1000:8.1f} ms, columnar {columnar_query * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark the batching structured log sink against the original per-event writer.
+
+Usage:
+    python -m benchmarks.bench_log_sink [--events 50000] [--threads 4]
+
+The original writer opened, wrote and closed app_logs.json once per event on
+the caller's thread. The sink numbers report caller-side throughput (time to
+submit every event) and end-to-end throughput (time until everything is on disk).
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from src.monitoring.log_sink import BatchingLogSink
+
+def legacy_write(path: str, entry: dict):
+    with open(path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+def make_entry(i: int) -> dict:
+    return {
+        "timestamp": "2026-01-29T13:44:02.698736",
+        "service_name": "ElevenLabs",
+        "event_type": "REQUEST_START",
+        "circuit_state": "CLOSED",
+        "seq": i
+    }
+
+def run_threads(threads: int, events: int, write) -> float:
+    per_thread = events // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for i in range(per_thread):
+            write(make_entry(i))
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--policy", default="block", help="sink overflow policy")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.json")
+        elapsed = run_threads(args.threads, args.events, lambda entry: legacy_write(legacy_path, entry))
+        print(f"legacy writer:        {args.events / elapsed:>12,.0f} events/s")
+
+        sink = BatchingLogSink(os.path.join(tmp, "sink.json"), overflow_policy=args.policy)
+        start = time.perf_counter()
+        submit_elapsed = run_threads(args.threads, args.events, sink.submit)
+        sink.close(timeout=None)
+        total_elapsed = time.perf_counter() - start
+        stats = sink.get_stats()
+        print(f"sink (caller side):   {args.events / submit_elapsed:>12,.0f} events/s")
+        print(f"sink (end to end):    {args.events / total_elapsed:>12,.0f} events/s")
+        print(f"sink stats: written={stats['written']} dropped={stats['dropped']} "
+              f"batches={stats['batches']} max_lag={stats['max_lag'] * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    main()
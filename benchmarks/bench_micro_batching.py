@@ -0,0 +1,92 @@
+"""
+Benchmark TTS throughput with and without micro-batching.
+
+Usage:
+    python -m benchmarks.bench_micro_batching [--requests 400] [--threads 32] [--batch-size 8]
+
+Each simulated TTS request costs --synthesis seconds of fixed overhead plus
+--per-char seconds per character. Unbatched, each request pays the overhead,
+and at most --concurrency requests run at once (the vendor's connection limit).
+Batched, concurrent requests share one call to the batch endpoint, so the
+overhead is paid once per batch. Random item failures (10%) are retried per
+item in both modes.
+"""
+import argparse
+import threading
+import time
+from src.monitoring.logger import app_logger
+from src.services.elevenlabs_service import ElevenLabsService
+
+SENTENCE = "Thanks for taking my call today."
+
+def run(service: ElevenLabsService, requests: int, threads: int):
+    latencies = []
+    failures = 0
+    lock = threading.Lock()
+    per_thread = requests // threads
+
+    def worker():
+        nonlocal failures
+        for i in range(per_thread):
+            start = time.perf_counter()
+            try:
+                service.generate_speech(f"{SENTENCE} {i}")
+                ok = True
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                failures += 0 if ok else 1
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    wall = time.perf_counter() - start
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return len(latencies) / wall, p50, p99, 1 - failures / len(latencies)
+
+def make_service(args) -> ElevenLabsService:
+    service = ElevenLabsService(
+        {"max_retries": 3, "initial_delay": 0.01},
+        {"failure_threshold": 1000},
+        cache_config={"enabled": False}
+    )
+    service.synthesis_latency = args.synthesis
+    service.char_latency = args.per_char
+    service.configure_bulkhead(args.concurrency)
+    return service
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--max-wait", type=float, default=0.01)
+    parser.add_argument("--synthesis", type=float, default=0.05)
+    parser.add_argument("--per-char", type=float, default=0.00005)
+    args = parser.parse_args()
+
+    # Measure batching, not the structured log writer
+    app_logger.log_event = lambda *a, **kw: None
+
+    unbatched = make_service(args)
+    batched = make_service(args)
+    batched.configure_batching("generate_speech_call", max_batch_size=args.batch_size, max_wait=args.max_wait)
+
+    for label, service in (("unbatched", unbatched), ("micro-batched", batched)):
+        throughput, p50, p99, success = run(service, args.requests, args.threads)
+        print(f"{label:<14} {throughput:7.1f} req/s  p50={p50 * 1000:7.1f}ms  p99={p99 * 1000:7.1f}ms  "
+              f"success={success:6.1%}")
+
+    status = batched.get_status()["batching"]["generate_speech_call"]
+    print(f"batches={status['batches']} mean_batch_size={status['mean_batch_size']:.1f}")
+
+if __name__ == "__main__":
+    main()
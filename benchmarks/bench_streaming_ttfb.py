@@ -0,0 +1,66 @@
+"""
+Benchmark time to first audio for batch vs streaming calls.
+
+Usage:
+    python -m benchmarks.bench_streaming_ttfb [--runs 5] [--sentences 4]
+
+The simulated LLM takes --first-token seconds to start and --per-token
+seconds per token. The simulated TTS takes --synthesis seconds per request
+plus --per-char seconds per character. In batch mode the first audio arrives
+after the whole response and the whole synthesis. In streaming mode it
+arrives after the first sentence and that sentence's synthesis.
+"""
+import argparse
+import statistics
+import time
+from src.core.streaming import chunk_sentences, stream_speech
+from src.monitoring.logger import app_logger
+from src.services.elevenlabs_service import ElevenLabsService
+from src.services.llm_service import LLMService
+
+PROMPT_SENTENCE = "Thanks for taking my call today, I will only need a minute of your time."
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--sentences", type=int, default=4)
+    parser.add_argument("--first-token", type=float, default=0.3)
+    parser.add_argument("--per-token", type=float, default=0.02)
+    parser.add_argument("--synthesis", type=float, default=0.15)
+    parser.add_argument("--per-char", type=float, default=0.002)
+    args = parser.parse_args()
+
+    # Measure the pipeline, not the structured log writer
+    app_logger.log_event = lambda *a, **kw: None
+
+    retry = {"max_retries": 3, "initial_delay": 0.01}
+    llm = LLMService(retry, {})
+    tts = ElevenLabsService(retry, {"failure_threshold": 100})
+    llm.first_token_latency = args.first_token
+    llm.token_latency = args.per_token
+    tts.synthesis_latency = args.synthesis
+    tts.char_latency = args.per_char
+    prompt = " ".join([PROMPT_SENTENCE] * args.sentences)
+
+    batch_ttfb, stream_ttfb, batch_total, stream_total = [], [], [], []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        tts.generate_speech(llm.get_response(prompt))
+        batch_ttfb.append(time.perf_counter() - start)
+        batch_total.append(batch_ttfb[-1])
+
+        start = time.perf_counter()
+        first = None
+        for _ in stream_speech(chunk_sentences(llm.stream_response(prompt)), tts.generate_speech):
+            if first is None:
+                first = time.perf_counter() - start
+        stream_ttfb.append(first)
+        stream_total.append(time.perf_counter() - start)
+
+    print(f"batch:      first audio {statistics.median(batch_ttfb) * 1000:7.0f}ms   "
+          f"all audio {statistics.median(batch_total) * 1000:7.0f}ms")
+    print(f"streaming:  first audio {statistics.median(stream_ttfb) * 1000:7.0f}ms   "
+          f"all audio {statistics.median(stream_total) * 1000:7.0f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Load-test AICallAgent against simulated provider faults on a virtual clock.
+
+Usage:
+    python -m benchmarks.load_test [--scenario all] [--seed 42] [--output results.json]
+    python -m benchmarks.load_test --baseline results.json [--tolerance 0.1]
+
+Contacts arrive as a Poisson process at --arrival-rate calls per second and
+are handled one at a time through AICallAgent.process_single_call. Waiting
+longer than --max-queue-wait counts as an abandoned call. The mock LLM and
+ElevenLabs services get a FaultProfile per scenario: latency distributions,
+error bursts, brownouts, flapping and outages.
+
+Time is simulated (src/core/clock.py): backoff sleeps, recovery timeouts and
+provider latency advance a VirtualClock instead of waiting. An hour-long
+outage runs in seconds, and the same seed gives the same numbers. Health
+probes run inline at their configured intervals. Hedging, streaming and
+batching are turned off because they depend on real threads.
+
+The JSON report holds, per scenario: throughput, latency percentiles (queue
+wait included), dropped calls and time to recovery after each fault phase.
+With --baseline, the run is compared to an earlier report. The exit code is
+1 if any metric regressed by more than --tolerance.
+"""
+import argparse
+import copy
+import json
+import logging
+import random
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional
+from src.app import AICallAgent
+from src.core import clock
+from src.core.clock import VirtualClock, use_clock
+from src.monitoring.alerts import alerts
+from src.monitoring.logger import app_logger
+from src.services.fault_injection import FaultProfile
+
+STEADY_LLM = {"latency": {"distribution": "lognormal", "median": 0.8, "sigma": 0.3}, "error_rate": 0.01}
+STEADY_TTS = {"latency": {"distribution": "lognormal", "median": 0.4, "sigma": 0.4}, "error_rate": 0.02}
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "steady": {
+        "description": "Normal latency, 1-2% errors",
+        "contacts": 600, "arrival_rate": 0.4,
+        "faults": {"llm": STEADY_LLM, "eleven_labs": STEADY_TTS}
+    },
+    "elevenlabs_503": {
+        "description": "ElevenLabs returns 503 for two minutes, then recovers",
+        "contacts": 300, "arrival_rate": 0.4,
+        "faults": {
+            "llm": STEADY_LLM,
+            "eleven_labs": {**STEADY_TTS, "phases": [{"type": "outage", "start": 120, "duration": 120}]}
+        }
+    },
+    "error_burst": {
+        "description": "Half of ElevenLabs calls fail for five minutes",
+        "contacts": 600, "arrival_rate": 0.4,
+        "faults": {
+            "llm": STEADY_LLM,
+            "eleven_labs": {**STEADY_TTS, "phases": [{"type": "error_burst", "start": 300, "duration": 300, "error_rate": 0.5}]}
+        }
+    },
+    "llm_brownout": {
+        "description": "LLM runs 5x slower with 10% errors for ten minutes",
+        "contacts": 900, "arrival_rate": 0.4,
+        "faults": {
+            "llm": {**STEADY_LLM, "phases": [
+                {"type": "brownout", "start": 600, "duration": 600, "latency_multiplier": 5, "error_rate": 0.1}
+            ]},
+            "eleven_labs": STEADY_TTS
+        }
+    },
+    "flapping": {
+        "description": "ElevenLabs goes up and down every 30 seconds for 20 minutes",
+        "contacts": 900, "arrival_rate": 0.4,
+        "faults": {
+            "llm": STEADY_LLM,
+            "eleven_labs": {**STEADY_TTS, "phases": [
+                {"type": "flapping", "start": 600, "duration": 1200, "period": 30, "down_fraction": 0.5}
+            ]}
+        }
+    },
+    "hour_outage": {
+        "description": "ElevenLabs is down for a full hour in a two-hour run",
+        "contacts": 2880, "arrival_rate": 0.4,
+        "faults": {
+            "llm": STEADY_LLM,
+            "eleven_labs": {**STEADY_TTS, "phases": [{"type": "outage", "start": 1800, "duration": 3600}]}
+        }
+    }
+}
+
+# Lower is better for these report fields; higher is better for throughput
+REGRESSION_CHECKS = (
+    ("throughput_per_s", False),
+    ("latency.p50", True),
+    ("latency.p95", True),
+    ("latency.p99", True),
+    ("dropped", True),
+    ("max_time_to_recovery", True)
+)
+
+def harness_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of the agent config with the thread- and disk-dependent features turned off."""
+    config = copy.deepcopy(config)
+    config['metrics'] = {'enabled': False}
+    # No rows pushed to the Sheet, so no exporter thread or spill file either
+    config.setdefault('logging', {})['sheets'] = {'enabled': False}
+    config.setdefault('call_queue', {}).setdefault('streaming', {})['enabled'] = False
+    for service_config in config['services'].values():
+        service_config.setdefault('pool', {})['hedge'] = False
+        service_config.get('batching', {})['enabled'] = False
+        service_config.get('cache', {}).pop('disk_path', None)
+    return config
+
+@contextmanager
+def quiet():
+    """Silence application logs and alerts inside the block, then put the originals back."""
+    patched = [(app_logger, "log_event"), (alerts, "send_alert")]
+    saved = [vars(target).get(name) for target, name in patched]
+    disabled = logging.root.manager.disable
+    for target, name in patched:
+        setattr(target, name, lambda *a, **kw: None)
+    logging.disable(logging.CRITICAL)
+    try:
+        yield
+    finally:
+        for (target, name), original in zip(patched, saved):
+            if original is None:
+                vars(target).pop(name, None)
+            else:
+                setattr(target, name, original)
+        logging.disable(disabled)
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 4)
+
+def _fallbacks_served(agent: AICallAgent) -> int:
+    return sum(
+        sum(service.fallback.get_stats().values())
+        for service in (agent.eleven_labs, agent.llm) if service.fallback is not None
+    )
+
+def run_scenario(name: str, scenario: Dict[str, Any], config: Dict[str, Any], seed: int, max_queue_wait: float) -> Dict[str, Any]:
+    """Run one scenario on a fresh agent and VirtualClock and return its report."""
+    random.seed(seed)
+    arrivals_rng = random.Random(seed)
+    wall_start = time.perf_counter()
+
+    with use_clock(VirtualClock()) as virtual_clock:
+        agent = AICallAgent(harness_config(config))
+        profiles = {}
+        for index, (key, service) in enumerate((("llm", agent.llm), ("eleven_labs", agent.eleven_labs))):
+            fault_config = scenario.get('faults', {}).get(key)
+            if fault_config is not None:
+                profiles[key] = service.fault_profile = FaultProfile(**fault_config, seed=seed + index + 1)
+
+        arrival = 0.0
+        records = []
+        errors: Dict[str, int] = {}
+        for i in range(scenario['contacts']):
+            arrival += arrivals_rng.expovariate(scenario['arrival_rate'])
+            # Health probes keep running while the agent is idle
+            while clock.monotonic() + 1.0 <= arrival:
+                virtual_clock.advance(1.0)
+                agent.health_manager.run_due_checks()
+            virtual_clock.advance_to(arrival)
+            agent.health_manager.run_due_checks()
+
+            start = clock.monotonic()
+            if start - arrival > max_queue_wait:
+                records.append({"arrival": arrival, "start": start, "end": start, "outcome": "abandoned"})
+                continue
+            fallbacks_before = _fallbacks_served(agent)
+            try:
+                agent.process_single_call(f"Contact {i:05d}")
+                outcome = "fallback" if _fallbacks_served(agent) > fallbacks_before else "success"
+            except Exception as e:
+                outcome = "failed"
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            records.append({"arrival": arrival, "start": start, "end": clock.monotonic(), "outcome": outcome})
+
+        agent.tts_pool.shutdown()
+        agent.llm_pool.shutdown()
+
+    return _report(name, scenario, seed, records, errors, profiles, time.perf_counter() - wall_start)
+
+def _report(
+    name: str,
+    scenario: Dict[str, Any],
+    seed: int,
+    records: List[Dict[str, Any]],
+    errors: Dict[str, int],
+    profiles: Dict[str, FaultProfile],
+    wall_time: float
+) -> Dict[str, Any]:
+    counts = {outcome: 0 for outcome in ("success", "fallback", "failed", "abandoned")}
+    for record in records:
+        counts[record['outcome']] += 1
+    completed = [r for r in records if r['outcome'] in ("success", "fallback")]
+    latencies = [r['end'] - r['arrival'] for r in completed]
+    duration = max(r['end'] for r in records) - records[0]['arrival'] if records else 0.0
+
+    recovery = []
+    for key, profile in profiles.items():
+        for phase in profile.phases:
+            phase_end = profile.started_at + phase.end
+            recovered = next(
+                (r['end'] for r in records if r['outcome'] == "success" and r['start'] >= phase_end), None
+            )
+            recovery.append({
+                "service": key,
+                **phase.to_dict(),
+                "time_to_recovery": None if recovered is None else round(recovered - phase_end, 3)
+            })
+    recovery_times = [item['time_to_recovery'] for item in recovery if item['time_to_recovery'] is not None]
+
+    return {
+        "scenario": name,
+        "description": scenario.get('description', ""),
+        "seed": seed,
+        "contacts": len(records),
+        "simulated_seconds": round(duration, 3),
+        "wall_seconds": round(wall_time, 3),
+        **counts,
+        "dropped": counts['failed'] + counts['abandoned'],
+        "throughput_per_s": round(len(completed) / duration, 4) if duration else 0.0,
+        "latency": {
+            "mean": round(sum(latencies) / len(latencies), 4) if latencies else None,
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": round(max(latencies), 4) if latencies else None
+        },
+        "errors": errors,
+        "recovery": recovery,
+        "max_time_to_recovery": max(recovery_times) if recovery_times else None
+    }
+
+def _lookup(report: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = report
+    for part in path.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Describe every metric that got worse than the baseline by more than tolerance."""
+    regressions = []
+    for name, report in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for path, lower_is_better in REGRESSION_CHECKS:
+            new, old = _lookup(report, path), _lookup(previous, path)
+            if new is None or old is None:
+                continue
+            # One unit of slack keeps small counts (e.g. 0 -> 1 dropped call) from failing the check
+            if lower_is_better and new > old * (1 + tolerance) + (1 if path == "dropped" else 0):
+                regressions.append(f"{name}: {path} rose from {old} to {new}")
+            elif not lower_is_better and new < old * (1 - tolerance):
+                regressions.append(f"{name}: {path} fell from {old} to {new}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", default="all", help=f"One of {', '.join(SCENARIOS)}, or all")
+    parser.add_argument("--scenario-file", help="JSON file with extra scenarios, same shape as SCENARIOS")
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--contacts", type=int, help="Override each scenario's contact count")
+    parser.add_argument("--arrival-rate", type=float, help="Override each scenario's calls per second")
+    parser.add_argument("--max-queue-wait", type=float, default=120.0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="Earlier JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    parser.add_argument("--verbose", action="store_true", help="Keep application logs and alerts")
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        config = json.load(f)
+    scenarios = dict(SCENARIOS)
+    if args.scenario_file:
+        with open(args.scenario_file, "r") as f:
+            scenarios.update(json.load(f))
+    names = list(scenarios) if args.scenario == "all" else [args.scenario]
+
+    results = {}
+    for name in names:
+        scenario = dict(scenarios[name])
+        if args.contacts:
+            scenario['contacts'] = args.contacts
+        if args.arrival_rate:
+            scenario['arrival_rate'] = args.arrival_rate
+        # Measure the call path, not the log writer or alert channels
+        with (nullcontext() if args.verbose else quiet()):
+            results[name] = run_scenario(name, scenario, config, args.seed, args.max_queue_wait)
+        report = results[name]
+        print(
+            f"{name:<16} {report['simulated_seconds']:8.0f}s simulated in {report['wall_seconds']:5.1f}s  "
+            f"throughput={report['throughput_per_s']:.3f}/s  p99={report['latency']['p99'] or 0:6.2f}s  "
+            f"dropped={report['dropped']}  recovery={report['max_time_to_recovery']}",
+            file=sys.stderr
+        )
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
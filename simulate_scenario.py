@@ -1,70 +1,81 @@
 import json
-import time
-import threading
+from benchmarks.load_test import SCENARIOS, harness_config, quiet, run_scenario
 from src.app import AICallAgent
+from src.core.clock import VirtualClock, use_clock
 
-def run_simulation():
-    # Load configuration
-    with open("config.json", "r") as f:
-        config = json.load(f)
+def _call(agent: AICallAgent, contact: str, outcome: str):
+    try:
+        agent.process_single_call(contact)
+        print(f"Result: {contact}'s call completed")
+    except Exception as e:
+        print(f"Result: {contact}'s call {outcome}: {e}")
+    print(f"[Circuit Breaker State after {contact}]: {agent.eleven_labs.circuit_breaker.state.value}")
 
-    agent = AICallAgent(config)
-    agent.start()
+def run_walkthrough(config):
+    """ElevenLabs goes down: failed calls raise alerts, the open breaker skips calls, then it recovers."""
+    print("\n=== WALKTHROUGH: ElevenLabs returns 503 Service Unavailable ===")
+    # Recovery timeouts and backoff sleeps advance a simulated clock instead of waiting
+    with use_clock(VirtualClock()) as virtual_clock:
+        walkthrough_config = harness_config(config)
+        # Without a fallback the failed calls surface, so the alert and skip paths run
+        walkthrough_config['services']['eleven_labs'].pop('fallback', None)
+        agent = AICallAgent(walkthrough_config)
 
-    print("\n=== STARTING SIMULATION SCENARIO ===")
-    print("Scenario: ElevenLabs returns 503 Service Unavailable")
+        print("\n--- Phase 1: Service goes down ---")
+        agent.eleven_labs.is_down = True
 
-    # 1. Trigger Service Failure
-    print("\n--- Phase 1: Service goes down ---")
-    agent.eleven_labs.is_down = True
-    
-    # 2. Process call queue
-    contacts = ["Alice", "Bob", "Charlie", "David"]
-    
-    # We will process in a separate thread to see health checks if needed, 
-    # but for sequential logic, we can just run it.
-    
-    print("\n[Simulating First Call to Alice]")
-    try:
-        agent.process_single_call("Alice")
-    except Exception as e:
-        print(f"Result: Alice's call failed as expected: {e}")
+        print("\n[Simulating First Call to Alice - Its retries trigger CB OPEN]")
+        _call(agent, "Alice", "failed as expected")
 
-    print(f"\n[Circuit Breaker State after Alice]: {agent.eleven_labs.circuit_breaker.state.value}")
-    
-    print("\n[Simulating Second Call to Bob - Should trigger CB OPEN]")
-    try:
-        agent.process_single_call("Bob")
-    except Exception as e:
-        print(f"Result: Bob's call failed: {e}")
+        print("\n[Simulating Second Call to Bob - Should Fail Fast due to OPEN CB]")
+        _call(agent, "Bob", "skipped (Fail Fast)")
 
-    print(f"\n[Circuit Breaker State after Bob]: {agent.eleven_labs.circuit_breaker.state.value}")
+        print("\n[Simulating Third Call to Charlie - Should Fail Fast due to OPEN CB]")
+        _call(agent, "Charlie", "skipped (Fail Fast)")
 
-    print("\n[Simulating Third Call to Charlie - Should Fail Fast due to OPEN CB]")
-    try:
-        agent.process_single_call("Charlie")
-    except Exception as e:
-        print(f"Result: Charlie's call skipped (Fail Fast): {e}")
+        print("\n--- Phase 2: Restoring Service Health ---")
+        agent.eleven_labs.is_down = False
+        recovery_timeout = agent.eleven_labs.circuit_breaker.recovery_timeout
+        print(f"Waiting out the {recovery_timeout}s recovery timeout...")
+        virtual_clock.advance(recovery_timeout + 1)
 
-    # 3. Restore Service
-    print("\n--- Phase 2: Restoring Service Health ---")
-    print("Wait for health check to detect restoration or wait for recovery timeout...")
-    agent.eleven_labs.is_down = False
-    
-    # Wait for recovery timeout (10s in config)
-    time.sleep(11)
-    
-    print(f"\n[Circuit Breaker State before David]: {agent.eleven_labs.circuit_breaker.state.value}")
-    print("[Simulating Fourth Call to David - Should recover to HALF_OPEN -> CLOSED]")
-    try:
-        agent.process_single_call("David")
-    except Exception as e:
-        print(f"Result: David's call unexpectedly failed: {e}")
+        print(f"\n[Circuit Breaker State before David]: {agent.eleven_labs.circuit_breaker.state.value}")
+        print("[Simulating Fourth Call to David - Should recover to HALF_OPEN -> CLOSED]")
+        _call(agent, "David", "unexpectedly failed")
+
+        agent.tts_pool.shutdown()
+        agent.llm_pool.shutdown()
+
+def run_load_scenario(config):
+    """Replay the same outage under load and summarise what callers saw."""
+    scenario = SCENARIOS["elevenlabs_503"]
+    print("\n=== LOAD SCENARIO ===")
+    print(f"Scenario: {scenario['description']}")
+    print(f"{scenario['contacts']} contacts at {scenario['arrival_rate']} calls/s on a simulated clock\n")
+
+    # Keep the console readable; the summary below has the numbers
+    with quiet():
+        report = run_scenario("elevenlabs_503", scenario, config, seed=42, max_queue_wait=120.0)
 
-    print(f"\n[Circuit Breaker State after David]: {agent.eleven_labs.circuit_breaker.state.value}")
+    print(f"Simulated {report['simulated_seconds']:.0f}s in {report['wall_seconds']:.1f}s")
+    print(f"Completed normally:     {report['success']}")
+    print(f"Served by fallback:     {report['fallback']} (circuit OPEN, call degraded instead of failing)")
+    print(f"Failed / abandoned:     {report['failed']} / {report['abandoned']}")
+    print(f"Latency p50/p95/p99:    {report['latency']['p50']}s / {report['latency']['p95']}s / {report['latency']['p99']}s")
+    for phase in report['recovery']:
+        print(f"Recovery after {phase['service']} {phase['type']} "
+              f"({phase['start']}s-{phase['end']}s): {phase['time_to_recovery']}s")
 
-    agent.stop()
+def run_simulation():
+    # Load configuration
+    with open("config.json", "r") as f:
+        config = json.load(f)
+
+    print("\n=== STARTING SIMULATION SCENARIO ===")
+    run_walkthrough(config)
+    run_load_scenario(config)
     print("\n=== SIMULATION COMPLETED ===")
+    print("Run `python -m benchmarks.load_test` for the full scenario suite.")
 
 if __name__ == "__main__":
     run_simulation()
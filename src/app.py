@@ -1,98 +1,347 @@
 import time
 import logging
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List, Optional
 from src.services.elevenlabs_service import ElevenLabsService
 from src.services.llm_service import LLMService
+from src.services.provider_pool import ProviderPool
+from src.services.base_service import BaseService
 from src.monitoring.health_check import HealthCheckManager
 from src.monitoring.alerts import alerts
 from src.monitoring.logger import app_logger
-from src.core.exceptions import AppError, TransientError, PermanentError
+from src.monitoring.metrics import MetricsServer, metrics
+from src.monitoring.tracing import tracer
+from src.monitoring.profiling import Profiler
+from src.core.exceptions import AppError, TransientError, PermanentError, DeadlineExceededError
+from src.core.resilience.deadline import deadline_scope
 from src.core.resilience.circuit_breaker import CircuitBreakerOpenError
+from src.core.resilience.shared_state import create_state_backend
+from src.core.call_queue import CallQueueProcessor, AsyncCallQueueProcessor, CallResult
+from src.core.durable_queue import DurableCallQueue, Lease
+from src.core.streaming import chunk_sentences, stream_speech
 
 logger = logging.getLogger(__name__)
 
 class AICallAgent:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+
+        # Structured log writer and rotation settings
+        app_logger.configure(config.get('logging', {}))
+        # Alert dedup, rate limit and channel breaker settings
+        alerts.configure(config.get('alerts', {}))
+        # Sampled per-call trace spans and the runtime profiler hook
+        tracer.configure(config.get('tracing', {}))
+        self.profiler = Profiler(**config.get('profiling', {}))
+        
+        # Prometheus-style /metrics endpoint, started with the agent
+        metrics_config = dict(config.get('metrics', {}))
+        self.metrics_server = MetricsServer(metrics, **metrics_config) if metrics_config.pop('enabled', False) else None
         
         # Initialize Services
         self.eleven_labs = ElevenLabsService(
             retry_config=config['services']['eleven_labs']['retry'],
-            cb_config=config['services']['eleven_labs']['circuit_breaker']
+            cb_config=config['services']['eleven_labs']['circuit_breaker'],
+            cache_config=config['services']['eleven_labs'].get('cache'),
+            fallback_config=config['services']['eleven_labs'].get('fallback')
         )
         self.llm = LLMService(
             retry_config=config['services']['llm']['retry'],
-            cb_config=config['services']['llm']['circuit_breaker']
+            cb_config=config['services']['llm']['circuit_breaker'],
+            cache_config=config['services']['llm'].get('cache'),
+            fallback_config=config['services']['llm'].get('fallback')
         )
+
+        # Extra backends per role; the services above stay the primaries
+        self.tts_pool = self._build_pool('eleven_labs', self.eleven_labs, ElevenLabsService)
+        self.llm_pool = self._build_pool('llm', self.llm, LLMService)
+        backends = self.tts_pool.backends + self.llm_pool.backends
         
         # Initialize Health Monitoring
-        self.health_manager = HealthCheckManager(check_interval=5.0)
-        self.health_manager.register_service("ElevenLabs", self.eleven_labs.health_check)
-        self.health_manager.register_service("LLMProvider", self.llm.health_check)
+        health_config = dict(config.get('health_check', {}))
+        service_probes = health_config.pop('services', {})
+        drive_breakers = health_config.pop('drive_circuit_breakers', False)
+        health_config.setdefault('check_interval', 5.0)
+        self.health_manager = HealthCheckManager(**health_config)
+        for service in backends:
+            self.health_manager.register_service(
+                service.name,
+                service.health_check,
+                circuit_breaker=service.circuit_breaker if drive_breakers else None,
+                **service_probes.get(service.name, {})
+            )
         
         # Register alerting for CB state changes
-        self.eleven_labs.circuit_breaker.on_state_change = self._handle_cb_state_change
-        self.llm.circuit_breaker.on_state_change = self._handle_cb_state_change
+        for service in backends:
+            service.circuit_breaker.on_state_change = self._handle_cb_state_change
+
+        # Breaker state shared with other agent processes, so they trip, recover and alert as one
+        shared_config = config.get('shared_state', {})
+        self.shared_state = create_state_backend(shared_config)
+        if self.shared_state is not None:
+            for service in backends:
+                service.circuit_breaker.use_shared_state(self.shared_state, shared_config.get('sync_interval', 0.1))
+
+        # Concurrent call queue settings
+        queue_config = config.get('call_queue', {})
+        self.queue_workers = queue_config.get('workers', 1)
+        self.queue_ordered = queue_config.get('ordered', True)
+        # Overall time budget per contact, shared by the LLM and TTS calls and their retries
+        self.call_deadline = queue_config.get('call_deadline')
+        # Start speech synthesis per sentence while the LLM is still generating
+        self.streaming_config = dict(queue_config.get('streaming', {}))
+        self.streaming = self.streaming_config.pop('enabled', False)
+        # Persistent work log so a restarted campaign resumes instead of re-dialing
+        durable_config = dict(queue_config.get('durable', {}))
+        self.retry_delay = durable_config.pop('retry_delay', 60)
+        self.outage_requeue_delay = durable_config.pop('outage_requeue_delay', 120)
+        self.durable_queue = DurableCallQueue(**durable_config) if durable_config.pop('enabled', False) else None
+        # Bulkhead per backend: a plain number is a fixed limit, a dict holds Bulkhead options
+        service_limits = queue_config.get('service_concurrency', {})
+        for key, pool in (('eleven_labs', self.tts_pool), ('llm', self.llm_pool)):
+            limit = service_limits.get(key)
+            options = limit if isinstance(limit, dict) else {'max_concurrent': limit}
+            for service in pool.backends:
+                service.configure_bulkhead(**options)
+            # Vendor quotas are per account, so only the primary uses the service-level rate limit
+            pool.primary.configure_rate_limit(**config['services'][key].get('rate_limit', {}))
+            # Micro-batching: concurrent calls share one request to the vendor's batch endpoint
+            batching = dict(config['services'][key].get('batching', {}))
+            if batching.pop('enabled', False):
+                for func_name in batching.pop('functions', []):
+                    for service in pool.backends:
+                        service.configure_batching(func_name, **batching)
+
+    def _build_pool(self, key: str, primary: BaseService, service_class: type) -> ProviderPool:
+        service_config = self.config['services'][key]
+        pool_config = dict(service_config.get('pool', {}))
+        backends = [primary]
+        for backend_config in pool_config.pop('backends', []):
+            # Backends inherit the primary's retry and breaker settings unless they override them
+            backend = service_class(
+                retry_config=backend_config.get('retry', service_config['retry']),
+                cb_config=backend_config.get('circuit_breaker', service_config['circuit_breaker']),
+                name=backend_config['name']
+            )
+            backend.configure_rate_limit(**backend_config.get('rate_limit', {}))
+            backends.append(backend)
+        return ProviderPool(key, backends, **pool_config)
 
     def _handle_cb_state_change(self, service_name: str, state: Any):
         if state.value == "OPEN":
             alerts.send_alert(
                 f"Circuit Breaker OPEN for {service_name}",
                 f"The service {service_name} has hit the failure threshold and is now disabled.",
-                severity="CRITICAL"
+                severity="CRITICAL",
+                service_name=service_name
             )
         elif state.value == "CLOSED":
             alerts.send_alert(
                 f"Circuit Breaker CLOSED for {service_name}",
                 f"The service {service_name} has recovered.",
-                severity="INFO"
+                severity="INFO",
+                service_name=service_name
             )
 
     def start(self):
         self.health_manager.start()
+        if self.metrics_server:
+            self.metrics_server.start()
+            logger.info(f"Metrics endpoint listening on port {self.metrics_server.port}")
+        self.profiler.install_signal_handler()
         logger.info("AI Call Agent Started")
 
     def stop(self):
         self.health_manager.stop()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        self.tts_pool.shutdown()
+        self.llm_pool.shutdown()
+        if self.durable_queue:
+            self.durable_queue.close()
+        self.profiler.stop()
+        tracer.flush()
+        # Flush-on-shutdown: deliver pending alerts and write out every queued structured log record
+        alerts.shutdown()
+        app_logger.shutdown()
         logger.info("AI Call Agent Stopped")
 
-    def process_call_queue(self, contacts: List[str]):
-        logger.info(f"Starting to process {len(contacts)} contacts...")
-        for contact in contacts:
-            try:
-                self.process_single_call(contact)
-            except Exception as e:
-                logger.error(f"Critical failure processing call for {contact}: {e}")
-                # Graceful degradation: Move to next contact in queue
-                logger.info(f"Skipping contact {contact} and moving to next...")
+    def process_call_queue(
+        self,
+        contacts: List[str],
+        workers: Optional[int] = None,
+        ordered: Optional[bool] = None
+    ) -> List[CallResult]:
+        workers = workers or self.queue_workers
+        ordered = self.queue_ordered if ordered is None else ordered
+        logger.info(f"Starting to process {len(contacts)} contacts with {workers} worker(s)...")
+
+        processor = CallQueueProcessor(self.process_single_call, workers=workers, ordered=ordered)
+        results = processor.process(contacts)
+
+        failed = sum(1 for result in results if not result.success)
+        logger.info(f"Call queue finished: {len(results) - failed} succeeded, {failed} skipped")
+        return results
+
+    def process_durable_queue(self, campaign: str = "default", max_calls: Optional[int] = None) -> List[CallResult]:
+        """
+        Call contacts from the durable queue until none are ready (or max_calls were made).
+
+        Completed contacts are acked. Contacts skipped because a circuit was
+        open come back after outage_requeue_delay without counting as a
+        failure. Permanent errors go to the dead-letter lane. Other failures
+        are retried after retry_delay, up to the queue's max_attempts.
+        """
+        if self.durable_queue is None:
+            raise ValueError("call_queue.durable is not enabled")
+        processor = CallQueueProcessor(self.process_single_call, workers=self.queue_workers, ordered=True)
+        results: List[CallResult] = []
+        while max_calls is None or len(results) < max_calls:
+            batch = self.queue_workers if max_calls is None else min(self.queue_workers, max_calls - len(results))
+            leases = self.durable_queue.lease(batch, campaign=campaign)
+            if not leases:
+                break
+            for lease, result in zip(leases, processor.process([lease.contact for lease in leases])):
+                self._settle_lease(lease, result)
+                results.append(result)
+        self.durable_queue.flush()
+
+        stats = self.durable_queue.get_stats(campaign)
+        logger.info(f"Durable queue pass finished: {len(results)} calls made, queue state {stats}")
+        return results
+
+    def _settle_lease(self, lease: Lease, result: CallResult):
+        error = result.exception
+        if result.success:
+            self.durable_queue.ack(lease)
+        elif isinstance(error, CircuitBreakerOpenError):
+            self.durable_queue.requeue(lease, self.outage_requeue_delay, error)
+        elif isinstance(error, PermanentError):
+            self.durable_queue.dead_letter(lease, error)
+        else:
+            self.durable_queue.nack(lease, error, delay=self.retry_delay)
+
+    async def process_call_queue_async(
+        self,
+        contacts: List[str],
+        workers: Optional[int] = None,
+        ordered: Optional[bool] = None
+    ) -> List[CallResult]:
+        """Async variant of process_call_queue; workers bounds calls in flight on the event loop."""
+        workers = workers or self.queue_workers
+        ordered = self.queue_ordered if ordered is None else ordered
+        logger.info(f"Starting to process {len(contacts)} contacts with {workers} async worker(s)...")
+
+        processor = AsyncCallQueueProcessor(self.process_single_call_async, workers=workers, ordered=ordered)
+        results = await processor.process(contacts)
+
+        failed = sum(1 for result in results if not result.success)
+        logger.info(f"Call queue finished: {len(results) - failed} succeeded, {failed} skipped")
+        return results
 
     def process_single_call(self, contact_name: str):
+        # Root span of the call: attempts, backoff sleeps, log writes and alerts nest under it
+        with tracer.start_trace("call", contact=contact_name):
+            self._process_single_call(contact_name)
+
+    def _process_single_call(self, contact_name: str):
         logger.info(f"--- Processing Call for: {contact_name} ---")
         
         try:
-            # 1. Get LLM Response
-            response_text = self.llm.get_response(f"Hello {contact_name}")
-            logger.info(f"LLM Response: {response_text}")
-            
-            # 2. Generate Speech
-            audio = self.eleven_labs.generate_speech(response_text)
-            logger.info(f"Audio Generated: {audio}")
-            
+            with deadline_scope(self.call_deadline):
+                if self.streaming:
+                    for audio in self.stream_single_call(contact_name):
+                        logger.info(f"Audio Chunk Generated: {audio}")
+                else:
+                    # 1. Get LLM Response
+                    response_text = self.llm_pool.execute("get_response_call", f"Hello {contact_name}")
+                    logger.info(f"LLM Response: {response_text}")
+
+                    # 2. Generate Speech
+                    audio = self.tts_pool.execute("generate_speech_call", response_text)
+                    logger.info(f"Audio Generated: {audio}")
+
             logger.info(f"Call successfully completed for {contact_name}")
             
-        except CircuitBreakerOpenError as e:
-            logger.warning(f"Service unavailable due to open circuit: {e}")
-            alerts.send_alert("Call Blocked", f"Circuit is open. Skipping call for {contact_name}", severity="WARNING")
+        except Exception as e:
+            self._handle_call_error(contact_name, e)
             raise e
-        except PermanentError as e:
-            logger.error(f"Permanent error for {contact_name}: {e}")
-            alerts.send_alert("Permanent Call Failure", f"Call for {contact_name} failed permanently: {e}")
+
+    def stream_single_call(self, contact_name: str) -> Iterator[Any]:
+        """
+        Yield audio chunks for a call as they are synthesized.
+
+        LLM tokens are cut into sentences, and each sentence goes to TTS as
+        soon as it is complete. Each sentence is a separate TTS call with its
+        own retries and circuit breaker check.
+        """
+        options = dict(self.streaming_config)
+        max_parallel = options.pop('max_parallel', 2)
+        with deadline_scope(self.call_deadline):
+            tokens = self.llm_pool.execute("stream_response_call", f"Hello {contact_name}")
+            if isinstance(tokens, str):
+                # A fallback response arrives whole
+                tokens = [tokens]
+            yield from stream_speech(
+                chunk_sentences(tokens, **options),
+                lambda text: self.tts_pool.execute("generate_speech_call", text),
+                max_parallel=max_parallel
+            )
+
+    async def process_single_call_async(self, contact_name: str):
+        with tracer.start_trace("call", contact=contact_name):
+            await self._process_single_call_async(contact_name)
+
+    async def _process_single_call_async(self, contact_name: str):
+        logger.info(f"--- Processing Call for: {contact_name} ---")
+
+        try:
+            with deadline_scope(self.call_deadline):
+                response_text = await self.llm_pool.execute_async("get_response_call", f"Hello {contact_name}")
+                logger.info(f"LLM Response: {response_text}")
+
+                audio = await self.tts_pool.execute_async("generate_speech_call", response_text)
+                logger.info(f"Audio Generated: {audio}")
+
+            logger.info(f"Call successfully completed for {contact_name}")
+
+        except Exception as e:
+            self._handle_call_error(contact_name, e)
             raise e
-        except TransientError as e:
+
+    def start_profiling(self, mode: Optional[str] = None):
+        """Start the runtime profiler ("sampling" or "cprofile"); a no-op if it is already running."""
+        self.profiler.start(mode)
+
+    def stop_profiling(self) -> Optional[str]:
+        """Stop the runtime profiler and return the path of the profile it wrote."""
+        return self.profiler.stop()
+
+    def _handle_call_error(self, contact_name: str, e: Exception):
+        service_name = getattr(e, "service_name", None)
+        if isinstance(e, CircuitBreakerOpenError):
+            logger.warning(f"Service unavailable due to open circuit: {e}")
+            alerts.send_alert(
+                "Call Blocked", f"Circuit is open. Skipping call for {contact_name}",
+                severity="WARNING", service_name=service_name
+            )
+        elif isinstance(e, DeadlineExceededError):
+            logger.error(f"Call deadline exceeded for {contact_name}: {e}")
+            alerts.send_alert(
+                "Call Deadline Exceeded", f"Call for {contact_name} ran out of time: {e}",
+                severity="WARNING", service_name=service_name
+            )
+        elif isinstance(e, PermanentError):
+            logger.error(f"Permanent error for {contact_name}: {e}")
+            alerts.send_alert(
+                "Permanent Call Failure", f"Call for {contact_name} failed permanently: {e}",
+                service_name=service_name
+            )
+        elif isinstance(e, TransientError):
             # If it reaches here, retries have failed
             logger.error(f"Transient error persisted after retries for {contact_name}: {e}")
-            alerts.send_alert("Call Failed after Retries", f"Service issues prevented call for {contact_name}")
-            raise e
-        except Exception as e:
+            alerts.send_alert(
+                "Call Failed after Retries", f"Service issues prevented call for {contact_name}",
+                service_name=service_name
+            )
+        else:
             logger.error(f"Unexpected error: {e}")
-            raise e
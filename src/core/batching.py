@@ -0,0 +1,113 @@
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional
+from src.core.exceptions import DeadlineExceededError
+from src.core.resilience.deadline import current_deadline
+from src.monitoring.metrics import metrics
+
+BATCH_SIZE = metrics.histogram(
+    "micro_batch_size", "Requests sent together in one upstream batch call", ("batcher",),
+    buckets=[1, 2, 4, 8, 16, 32, 64, 128]
+)
+
+class _Batch:
+    def __init__(self):
+        self.items: List[Any] = []
+        self.futures: List[Future] = []
+        self.closed = threading.Event()
+
+class MicroBatcher:
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 16,
+        max_wait: float = 0.01
+    ):
+        """
+        Collect concurrent requests into batches for a batch endpoint.
+
+        The first caller of a batch waits up to max_wait seconds for others
+        to join (or until max_batch_size is reached) and then runs flush()
+        on its own thread, so no background thread is needed and the batch
+        runs in that caller's context. Every other caller just waits for its
+        own result, for no longer than its own call deadline allows.
+
+        flush() gets the items in arrival order and must return one result
+        per item. An exception instance in that list fails only its own
+        caller; an exception raised by flush() fails the whole batch.
+
+        Args:
+            name: Batcher name, for metrics.
+            flush: Sends a list of items upstream and returns their results.
+            max_batch_size: Items after which a batch is sent without waiting.
+            max_wait: Longest the first item waits for company, in seconds.
+        """
+        self.name = name
+        self.flush = flush
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.batches = 0
+        self.items = 0
+        self._pending: Optional[_Batch] = None
+        self._lock = threading.Lock()
+        self._size_histogram = BATCH_SIZE.labels(name)
+
+    def submit(self, item: Any) -> Any:
+        """Add an item to the current batch and block until its result is known."""
+        future: Future = Future()
+        with self._lock:
+            batch = self._pending
+            leader = batch is None
+            if leader:
+                batch = self._pending = _Batch()
+            batch.items.append(item)
+            batch.futures.append(future)
+            if len(batch.items) >= self.max_batch_size:
+                self._close(batch)
+        if leader:
+            batch.closed.wait(self.max_wait)
+            with self._lock:
+                if self._pending is batch:
+                    self._close(batch)
+            self._run(batch)
+        # The batch runs under the leader's deadline; a follower must not outwait its own
+        deadline = current_deadline()
+        try:
+            return future.result(None if deadline is None else deadline.remaining())
+        except FutureTimeoutError:
+            raise DeadlineExceededError(
+                f"Call deadline passed while waiting for batch {self.name}", service_name=self.name
+            ) from None
+
+    def _close(self, batch: _Batch):
+        """Stop a batch from taking more items; must be called with the lock held."""
+        self._pending = None
+        batch.closed.set()
+
+    def _run(self, batch: _Batch):
+        self.batches += 1
+        self.items += len(batch.items)
+        self._size_histogram.observe(len(batch.items))
+        try:
+            results = self.flush(batch.items)
+            if len(results) != len(batch.items):
+                raise ValueError(
+                    f"Batch call for {self.name} returned {len(results)} results for {len(batch.items)} requests"
+                )
+        except BaseException as e:
+            for future in batch.futures:
+                future.set_exception(e)
+            return
+        for future, result in zip(batch.futures, results):
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else None
+        }
@@ -0,0 +1,279 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from src.core import clock
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        # Templated prompts differ only in whitespace surprisingly often
+        return " ".join(value.split())
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalize(value[key]) for key in sorted(value)}
+    return value
+
+def make_cache_key(func_name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    """Stable key for a service call from its function name and normalized arguments."""
+    payload = json.dumps([func_name, _normalize(list(args)), _normalize(kwargs)], default=repr, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+class TTLCache:
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0):
+        """Thread-safe in-memory LRU cache whose entries also expire after ttl seconds."""
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, allow_stale: bool = False) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            # Expired entries stay until LRU eviction so they can still be served stale
+            if expires_at < clock.monotonic() and not allow_stale:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (clock.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SQLiteCacheTier:
+    def __init__(self, path: str, ttl: float = 86400.0, max_entries: int = 100000):
+        """
+        On-disk cache tier that survives restarts (useful for TTS audio).
+
+        Values are stored as raw bytes or as JSON, never pickled, so a tampered
+        database file cannot run code. Other values are kept in memory only.
+
+        Args:
+            path: SQLite database file.
+            ttl: Seconds an entry stays fresh.
+            max_entries: Entries kept; the least recently written are pruned.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Rows in the old "cache" table hold pickles; they are dropped, not read
+        self._conn.execute("DROP TABLE IF EXISTS cache")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB, expires_at REAL)"
+        )
+        self._conn.commit()
+        self._writes = 0
+
+    def get(self, key: str, allow_stale: bool = False) -> Tuple[bool, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (row[1] < clock.time() and not allow_stale):
+            return False, None
+        # SQLite keeps the storage class: bytes come back as BLOB, JSON as TEXT
+        value = row[0]
+        return True, value if isinstance(value, bytes) else json.loads(value)
+
+    def set(self, key: str, value: Any):
+        if isinstance(value, (bytes, bytearray)):
+            stored = bytes(value)
+        else:
+            try:
+                stored = json.dumps(value)
+            except (TypeError, ValueError):
+                return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, stored, clock.time() + self.ttl)
+            )
+            self._writes += 1
+            if self._writes % 1000 == 0:
+                self._prune()
+            self._conn.commit()
+
+    def _prune(self):
+        # Expired rows are kept (they can still be served stale); only the count is bounded
+        self._conn.execute(
+            "DELETE FROM entries WHERE rowid NOT IN (SELECT rowid FROM entries ORDER BY rowid DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 300.0,
+        disk_path: Optional[str] = None,
+        disk_ttl: float = 86400.0,
+        disk_max_entries: int = 100000
+    ):
+        """
+        Two-tier response cache with single-flight loading.
+
+        Concurrent misses for the same key share one upstream call: the first
+        caller loads, the others wait for its result. Failures are never cached.
+        get_or_load_async() does the same for coroutines within one event loop.
+
+        Args:
+            max_entries: In-memory LRU capacity.
+            ttl: In-memory entry lifetime in seconds.
+            disk_path: Optional SQLite file for a persistent second tier.
+            disk_ttl: Disk entry lifetime in seconds.
+            disk_max_entries: Disk tier capacity.
+        """
+        self.memory = TTLCache(max_entries, ttl)
+        self.disk = SQLiteCacheTier(disk_path, disk_ttl, disk_max_entries) if disk_path else None
+        self._in_flight: Dict[str, Future] = {}
+        # asyncio futures belong to one loop, so async loads are shared per loop
+        self._in_flight_async: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+        # Guards the in-flight maps and the counters
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        hit, value = self.memory.get(key)
+        if not hit and self.disk is not None:
+            hit, value = self.disk.get(key)
+            if hit:
+                self.memory.set(key, value)
+        if hit:
+            with self._lock:
+                self.hits += 1
+        return hit, value
+
+    def record_miss(self):
+        """Count a lookup that went upstream."""
+        with self._lock:
+            self.misses += 1
+
+    def get_stale(self, key: str) -> Tuple[bool, Any]:
+        """The last stored value for key, ignoring TTLs. Not counted as a hit."""
+        hit, value = self.memory.get(key, allow_stale=True)
+        if not hit and self.disk is not None:
+            hit, value = self.disk.get(key, allow_stale=True)
+        return hit, value
+
+    def set(self, key: str, value: Any):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Tuple[bool, Any]:
+        """Return (was_cached, value), calling loader at most once per key at a time."""
+        hit, value = self.get(key)
+        if hit:
+            return True, value
+
+        with self._lock:
+            pending = self._in_flight.get(key)
+            if pending is None:
+                pending = self._in_flight[key] = Future()
+                is_leader = True
+            else:
+                is_leader = False
+                self.coalesced += 1
+
+        if not is_leader:
+            return True, pending.result()
+
+        try:
+            # Another leader may have filled the cache between our lookup and registration
+            hit, value = self.memory.get(key)
+            if hit:
+                with self._lock:
+                    self.hits += 1
+                pending.set_result(value)
+                return True, value
+            self.record_miss()
+            value = loader()
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        else:
+            self.set(key, value)
+            pending.set_result(value)
+            return False, value
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    async def get_or_load_async(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Tuple[bool, Any]:
+        """Async get_or_load(): concurrent misses in one event loop await a single loader()."""
+        hit, value = self.get(key)
+        if hit:
+            return True, value
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pending = self._in_flight_async.get((loop, key))
+            if pending is None:
+                pending = self._in_flight_async[(loop, key)] = loop.create_future()
+                is_leader = True
+            else:
+                is_leader = False
+                self.coalesced += 1
+
+        if not is_leader:
+            # Shielded: a cancelled follower must not cancel the shared load
+            return True, await asyncio.shield(pending)
+
+        try:
+            hit, value = self.memory.get(key)
+            if hit:
+                with self._lock:
+                    self.hits += 1
+                pending.set_result(value)
+                return True, value
+            self.record_miss()
+            value = await loader()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                pending.cancel()
+            else:
+                pending.set_exception(e)
+                # Retrieved here so a load without followers is not reported as unhandled
+                pending.exception()
+            raise
+        else:
+            self.set(key, value)
+            pending.set_result(value)
+            return False, value
+        finally:
+            with self._lock:
+                self._in_flight_async.pop((loop, key), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "cache_coalesced": self.coalesced,
+            "cache_size": len(self.memory)
+        }
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional
+from src.core import clock
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CallResult:
+    """Outcome of a single contact processed from the call queue."""
+    contact: str
+    success: bool
+    error_type: Optional[str] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+    # The raised exception, so callers can tell outages from permanent failures
+    exception: Optional[BaseException] = field(default=None, repr=False, compare=False)
+
+def _failed_result(contact: str, e: Exception, start: float) -> CallResult:
+    logger.error(f"Critical failure processing call for {contact}: {e}")
+    # Graceful degradation: Move to next contact in queue
+    logger.info(f"Skipping contact {contact} and moving to next...")
+    return CallResult(
+        contact=contact,
+        success=False,
+        error_type=type(e).__name__,
+        error=str(e),
+        duration=clock.monotonic() - start,
+        exception=e
+    )
+
+class CallQueueProcessor:
+    def __init__(
+        self,
+        handler: Callable[[str], None],
+        workers: int = 4,
+        ordered: bool = True
+    ):
+        """
+        Process a queue of contacts concurrently.
+
+        Args:
+            handler: Function that processes one contact and raises on failure.
+            workers: Number of contacts processed at the same time.
+            ordered: Return results in queue order (True) or completion order (False).
+        """
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.ordered = ordered
+
+    def _run_one(self, contact: str) -> CallResult:
+        start = clock.monotonic()
+        try:
+            self.handler(contact)
+            return CallResult(contact=contact, success=True, duration=clock.monotonic() - start)
+        except Exception as e:
+            return _failed_result(contact, e, start)
+
+    def process(self, contacts: List[str]) -> List[CallResult]:
+        if self.workers == 1:
+            return [self._run_one(contact) for contact in contacts]
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="call-worker") as pool:
+            futures = [pool.submit(self._run_one, contact) for contact in contacts]
+            if self.ordered:
+                return [future.result() for future in futures]
+            return [future.result() for future in as_completed(futures)]
+
+class AsyncCallQueueProcessor:
+    def __init__(
+        self,
+        handler: Callable[[str], Awaitable[None]],
+        workers: int = 100,
+        ordered: bool = True
+    ):
+        """Event-loop counterpart of CallQueueProcessor; workers bounds concurrent calls."""
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.ordered = ordered
+
+    async def _run_one(self, contact: str, slots: asyncio.Semaphore) -> CallResult:
+        async with slots:
+            start = clock.monotonic()
+            try:
+                await self.handler(contact)
+                return CallResult(contact=contact, success=True, duration=clock.monotonic() - start)
+            except Exception as e:
+                return _failed_result(contact, e, start)
+
+    async def process(self, contacts: List[str]) -> List[CallResult]:
+        slots = asyncio.Semaphore(self.workers)
+        tasks = [asyncio.ensure_future(self._run_one(contact, slots)) for contact in contacts]
+        if self.ordered:
+            return list(await asyncio.gather(*tasks))
+        return [await task for task in asyncio.as_completed(tasks)]
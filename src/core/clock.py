@@ -0,0 +1,90 @@
+import threading
+import time as _time
+from contextlib import contextmanager
+from typing import Iterator
+
+class Clock:
+    """Wall-clock time. Resilience code reads time through this module so tests can swap it."""
+
+    def monotonic(self) -> float:
+        return _time.monotonic()
+
+    def perf_counter(self) -> float:
+        return _time.perf_counter()
+
+    def time(self) -> float:
+        return _time.time()
+
+    def sleep(self, seconds: float):
+        _time.sleep(seconds)
+
+class VirtualClock(Clock):
+    def __init__(self, start: float = 0.0, epoch: float = 1_700_000_000.0):
+        """
+        Simulated time: sleep() advances the clock at once instead of waiting.
+
+        Meant for single-threaded simulations such as the load-test harness,
+        where an hour of backoff, recovery timeouts and provider latency
+        passes in a fraction of a second, and two runs with the same seed
+        see exactly the same timeline.
+
+        Args:
+            start: Initial monotonic reading.
+            epoch: Wall-clock time (time()) at monotonic reading 0.
+        """
+        self._now = start
+        self.epoch = epoch
+        self._lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        return self._now
+
+    def perf_counter(self) -> float:
+        return self._now
+
+    def time(self) -> float:
+        return self.epoch + self._now
+
+    def sleep(self, seconds: float):
+        self.advance(seconds)
+
+    def advance(self, seconds: float):
+        with self._lock:
+            self._now += max(0.0, seconds)
+
+    def advance_to(self, moment: float):
+        """Move forward to a monotonic reading; never moves backward."""
+        with self._lock:
+            self._now = max(self._now, moment)
+
+_current: Clock = Clock()
+
+def get_clock() -> Clock:
+    return _current
+
+def set_clock(new_clock: Clock) -> Clock:
+    """Install a clock for the whole process and return the previous one."""
+    global _current
+    previous, _current = _current, new_clock
+    return previous
+
+@contextmanager
+def use_clock(new_clock: Clock) -> Iterator[Clock]:
+    """Run a block with new_clock installed, restoring the previous clock afterwards."""
+    previous = set_clock(new_clock)
+    try:
+        yield new_clock
+    finally:
+        set_clock(previous)
+
+def monotonic() -> float:
+    return _current.monotonic()
+
+def perf_counter() -> float:
+    return _current.perf_counter()
+
+def time() -> float:
+    return _current.time()
+
+def sleep(seconds: float):
+    _current.sleep(seconds)
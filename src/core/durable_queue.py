@@ -0,0 +1,227 @@
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+from src.core import clock
+
+QUEUED, LEASED, DONE, DEAD = "queued", "leased", "done", "dead"
+
+@dataclass
+class Lease:
+    """A contact handed to one worker until visibility_timeout passes."""
+    job_id: int
+    contact: str
+    attempt: int
+    failures: int
+
+class DurableCallQueue:
+    def __init__(
+        self,
+        path: str,
+        visibility_timeout: float = 300.0,
+        max_attempts: int = 5,
+        commit_batch: int = 100,
+        commit_interval: float = 0.5
+    ):
+        """
+        Persistent contact queue on SQLite in WAL mode.
+
+        A leased contact is invisible for visibility_timeout seconds. If the
+        worker does not ack or nack it by then (e.g. the process died), it is
+        leased again, so every contact is called at least once. Contacts are
+        unique per campaign, so enqueueing the same list after a restart
+        does not dial anyone twice.
+
+        Writes are committed in groups of commit_batch operations, or once
+        commit_interval seconds have passed. A crash can lose at most the
+        last group: unsaved leases simply expire, and unsaved acks mean a
+        contact is dialed again. Use commit_batch=1 to commit every write.
+        Several processes can share one database file; give them
+        commit_batch=1, since an open group holds SQLite's write lock.
+
+        Args:
+            path: SQLite database file.
+            visibility_timeout: Seconds a lease hides a contact from other workers.
+            max_attempts: Failed attempts before a contact is dead-lettered.
+            commit_batch: Writes grouped into one commit.
+            commit_interval: Longest a write waits for its commit, in seconds.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.commit_batch = max(1, commit_batch)
+        self.commit_interval = commit_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY, campaign TEXT NOT NULL, contact TEXT NOT NULL,"
+            " state TEXT NOT NULL, available_at REAL NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,"
+            " failures INTEGER NOT NULL DEFAULT 0, error_type TEXT, error TEXT, updated_at REAL,"
+            " UNIQUE (campaign, contact))"
+        )
+        # Only queued and leased rows are ever scanned for work
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (available_at) WHERE state IN ('queued', 'leased')"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_campaign_ready ON jobs (campaign, available_at)"
+            " WHERE state IN ('queued', 'leased')"
+        )
+        self._conn.commit()
+        self._uncommitted = 0
+        self._last_commit = clock.monotonic()
+
+    def _wrote(self, count: int = 1):
+        """Count writes and commit once the group is full or old enough; lock must be held."""
+        self._uncommitted += count
+        if self._uncommitted >= self.commit_batch or clock.monotonic() - self._last_commit >= self.commit_interval:
+            self._commit()
+
+    def _commit(self):
+        self._conn.commit()
+        self._uncommitted = 0
+        self._last_commit = clock.monotonic()
+
+    def flush(self):
+        """Commit every pending write."""
+        with self._lock:
+            self._commit()
+
+    def enqueue(self, contacts: Iterable[str], campaign: str = "default", delay: float = 0.0) -> int:
+        """Add contacts (ignoring ones already in the campaign); returns how many were new."""
+        available_at = clock.time() + delay
+        rows = [(campaign, contact, QUEUED, available_at, available_at) for contact in contacts]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (campaign, contact, state, available_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            added = self._conn.total_changes - before
+            # A bulk enqueue is one transaction on its own
+            self._commit()
+        return added
+
+    def lease(self, max_items: int = 1, campaign: Optional[str] = None) -> List[Lease]:
+        """Hand out up to max_items ready contacts, oldest first."""
+        now = clock.time()
+        query = "SELECT id, contact, attempts, failures FROM jobs WHERE state IN ('queued', 'leased') AND available_at <= ?"
+        params: List[Any] = [now]
+        if campaign is not None:
+            query += " AND campaign = ?"
+            params.append(campaign)
+        query += " ORDER BY available_at LIMIT ?"
+        params.append(max_items)
+        with self._lock:
+            if not self._conn.in_transaction:
+                # Take the write lock before reading, so two processes cannot lease the same rows
+                self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(query, params).fetchall()
+            if not rows:
+                self._commit()
+                return []
+            expires_at = now + self.visibility_timeout
+            self._conn.executemany(
+                "UPDATE jobs SET state = ?, available_at = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [(LEASED, expires_at, now, row[0]) for row in rows]
+            )
+            self._wrote(len(rows))
+        return [Lease(job_id=row[0], contact=row[1], attempt=row[2] + 1, failures=row[3]) for row in rows]
+
+    def _settle(self, lease: Lease, state: str, available_at: float, failures: int, error: Optional[BaseException]) -> bool:
+        """Apply an outcome if the lease is still held; returns False if it expired and was re-leased."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = ?, available_at = ?, failures = ?, error_type = ?, error = ?, updated_at = ?"
+                " WHERE id = ? AND attempts = ? AND state = ?",
+                (
+                    state, available_at, failures,
+                    type(error).__name__ if error else None, str(error) if error else None,
+                    clock.time(), lease.job_id, lease.attempt, LEASED
+                )
+            )
+            self._wrote()
+            return cursor.rowcount == 1
+
+    def ack(self, lease: Lease) -> bool:
+        """Mark a contact as done."""
+        return self._settle(lease, DONE, clock.time(), lease.failures, None)
+
+    def nack(self, lease: Lease, error: Optional[BaseException] = None, delay: float = 0.0) -> bool:
+        """
+        Record a failed attempt and make the contact visible again after
+        delay seconds, or dead-letter it once max_attempts attempts failed.
+        """
+        failures = lease.failures + 1
+        if failures >= self.max_attempts:
+            return self._settle(lease, DEAD, clock.time(), failures, error)
+        return self._settle(lease, QUEUED, clock.time() + delay, failures, error)
+
+    def requeue(self, lease: Lease, delay: float, error: Optional[BaseException] = None) -> bool:
+        """Put a contact back after delay seconds without counting a failure (e.g. skipped during an outage)."""
+        return self._settle(lease, QUEUED, clock.time() + delay, lease.failures, error)
+
+    def dead_letter(self, lease: Lease, error: Optional[BaseException] = None) -> bool:
+        """Move a contact to the dead-letter lane (e.g. after a PermanentError)."""
+        return self._settle(lease, DEAD, clock.time(), lease.failures + 1, error)
+
+    def dead_letters(self, campaign: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        query = "SELECT id, campaign, contact, failures, error_type, error, updated_at FROM jobs WHERE state = ?"
+        params: List[Any] = [DEAD]
+        if campaign is not None:
+            query += " AND campaign = ?"
+            params.append(campaign)
+        query += " ORDER BY updated_at LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        keys = ("job_id", "campaign", "contact", "failures", "error_type", "error", "updated_at")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def retry_dead_letters(self, campaign: Optional[str] = None) -> int:
+        """Queue every dead-lettered contact again with a clean failure count."""
+        query = "UPDATE jobs SET state = ?, available_at = ?, failures = 0 WHERE state = ?"
+        params: List[Any] = [QUEUED, clock.time(), DEAD]
+        if campaign is not None:
+            query += " AND campaign = ?"
+            params.append(campaign)
+        with self._lock:
+            count = self._conn.execute(query, params).rowcount
+            self._commit()
+        return count
+
+    def next_ready_at(self, campaign: Optional[str] = None) -> Optional[float]:
+        """Wall-clock time the next queued or leased contact becomes visible, or None if none are left."""
+        query = "SELECT MIN(available_at) FROM jobs WHERE state IN ('queued', 'leased')"
+        params: List[Any] = []
+        if campaign is not None:
+            query += " AND campaign = ?"
+            params.append(campaign)
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def get_stats(self, campaign: Optional[str] = None) -> Dict[str, int]:
+        """Contacts per state; "delayed" are queued contacts that are not visible yet."""
+        query = "SELECT state, available_at > ? AS delayed, COUNT(*) FROM jobs"
+        params: List[Any] = [clock.time()]
+        if campaign is not None:
+            query += " WHERE campaign = ?"
+            params.append(campaign)
+        query += " GROUP BY state, delayed"
+        stats = {QUEUED: 0, "delayed": 0, LEASED: 0, DONE: 0, DEAD: 0}
+        with self._lock:
+            for state, delayed, count in self._conn.execute(query, params):
+                key = "delayed" if state == QUEUED and delayed else state
+                stats[key] += count
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._commit()
+            self._conn.close()
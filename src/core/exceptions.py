@@ -1,3 +1,5 @@
+from typing import Optional
+
 class AppError(Exception):
     """Base exception for the AI Call Agent application."""
     def __init__(self, message: str, service_name: str = "Unknown"):
@@ -26,6 +28,13 @@ class NetworkError(TransientError):
     """General network failure."""
     pass
 
+class RateLimitExceededError(TransientError):
+    """Too many requests (429), from the vendor or our own client-side limiter."""
+    def __init__(self, message: str, service_name: str = "Unknown", retry_after: Optional[float] = None):
+        super().__init__(message, service_name)
+        # Seconds the caller should wait before trying again, when known
+        self.retry_after = retry_after
+
 # Permanent Errors
 class AuthenticationError(PermanentError):
     """Invalid credentials or unauthorized (401)."""
@@ -42,3 +51,7 @@ class QuotaExceededError(PermanentError):
 class ResourceNotFoundError(PermanentError):
     """Requested resource does not exist (404)."""
     pass
+
+class DeadlineExceededError(TransientError):
+    """The call ran out of its overall time budget before it could finish."""
+    pass
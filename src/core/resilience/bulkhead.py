@@ -0,0 +1,235 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+from src.core import clock
+from src.core.exceptions import TransientError
+from src.monitoring.metrics import metrics
+
+LIMIT_GAUGE = metrics.gauge("bulkhead_limit", "Current concurrency limit per service", ("service",))
+REJECTED = metrics.counter(
+    "bulkhead_rejected_total", "Calls rejected because the bulkhead stayed full for queue_timeout", ("service",)
+)
+
+class BulkheadFullError(TransientError):
+    """Raised when no bulkhead slot frees up within the queue timeout."""
+    pass
+
+class AIMDLimiter:
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        latency_tolerance: float = 2.0,
+        min_slowdown: float = 0.05,
+        backoff_ratio: float = 0.9,
+        smoothing: float = 0.2,
+        baseline_window: int = 500
+    ):
+        """
+        Additive-increase / multiplicative-decrease concurrency limit.
+
+        Latency is smoothed with an EWMA and compared to a baseline (the
+        lowest smoothed latency seen recently). When the provider slows past
+        latency_tolerance x baseline (and by at least min_slowdown seconds),
+        or an attempt fails, the limit is multiplied by backoff_ratio, at
+        most once per smoothed latency (and at most every 100ms). While
+        latency stays normal and the limit is actually used, it grows by
+        about one per limit's worth of samples.
+
+        Args:
+            initial_limit: Starting limit.
+            min_limit: Lowest limit allowed.
+            max_limit: Highest limit allowed.
+            latency_tolerance: Slowdown over the baseline treated as congestion.
+            min_slowdown: Absolute slowdown in seconds also required, so jitter
+                on a sub-millisecond baseline does not count as congestion.
+            backoff_ratio: Multiplier applied on congestion.
+            smoothing: EWMA weight of the newest latency sample.
+            baseline_window: Samples after which the baseline is re-measured,
+                so a permanent latency shift is eventually accepted.
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_tolerance = latency_tolerance
+        self.min_slowdown = min_slowdown
+        self.backoff_ratio = backoff_ratio
+        self.smoothing = smoothing
+        self.baseline_window = baseline_window
+        self._limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._latency: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._samples = 0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_sample(self, latency: float, failed: bool, in_flight: int) -> int:
+        """Feed one attempt's latency and outcome; returns the new limit."""
+        now = clock.monotonic()
+        with self._lock:
+            if self._latency is None:
+                self._latency = latency
+            else:
+                self._latency += self.smoothing * (latency - self._latency)
+            self._samples += 1
+            if self._baseline is None or self._samples % self.baseline_window == 0:
+                self._baseline = self._latency
+            else:
+                self._baseline = min(self._baseline, self._latency)
+
+            threshold = max(self.latency_tolerance * self._baseline, self._baseline + self.min_slowdown)
+            if failed or self._latency > threshold:
+                if now - self._last_decrease >= max(self._latency, 0.1):
+                    self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                    self._last_decrease = now
+            elif in_flight >= int(self._limit) - 1:
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+            return int(self._limit)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "latency_ewma": self._latency,
+            "latency_baseline": self._baseline
+        }
+
+class Bulkhead:
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        queue_timeout: Optional[float] = None,
+        adaptive: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Caps in-flight calls to one dependency so it cannot take every worker.
+
+        Callers beyond the limit wait up to queue_timeout seconds (None waits
+        as long as needed, 0 rejects at once) and then get BulkheadFullError.
+        With `adaptive` options an AIMDLimiter moves the limit between
+        min_limit and max_limit (default max_concurrent) from observed latency.
+
+        Args:
+            name: Service name, for errors and metrics.
+            max_concurrent: Fixed limit, or the starting limit when adaptive.
+            queue_timeout: Seconds a caller may wait for a slot.
+            adaptive: AIMDLimiter options; omit for a fixed limit.
+        """
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.queue_timeout = queue_timeout
+        self.limiter: Optional[AIMDLimiter] = None
+        if adaptive is not None:
+            options = {"max_limit": self.max_concurrent, **adaptive}
+            self.limiter = AIMDLimiter(self.max_concurrent, **options)
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._cond = threading.Condition()
+        self._async_waiters: deque = deque()
+        self._limit_gauge = LIMIT_GAUGE.labels(name)
+        self._limit_gauge.set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        return self.limiter.limit if self.limiter else self.max_concurrent
+
+    def _wait_budget(self, timeout: Optional[float]) -> Optional[float]:
+        return self.queue_timeout if timeout is None else timeout
+
+    def _reject(self):
+        self.rejected += 1
+        REJECTED.labels(self.name).inc()
+        raise BulkheadFullError(
+            f"Bulkhead for {self.name} is full ({self.in_flight}/{self.limit} in flight)", service_name=self.name
+        )
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Take a slot, waiting up to timeout (default queue_timeout) seconds."""
+        timeout = self._wait_budget(timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self.waiting += 1
+            try:
+                while self.in_flight >= self.limit:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._reject()
+                    self._cond.wait(remaining)
+                self.in_flight += 1
+            finally:
+                self.waiting -= 1
+
+    async def acquire_async(self, timeout: Optional[float] = None):
+        """Async variant of acquire(); waiting yields the event loop."""
+        timeout = self._wait_budget(timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._reject()
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+                self.waiting += 1
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._cond:
+                    self.waiting -= 1
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._wake_one()
+
+    def _wake_one(self):
+        """Wake one thread waiter and one async waiter; must be called with the lock held."""
+        self._cond.notify()
+        while self._async_waiters:
+            loop, waiter = self._async_waiters.popleft()
+            if not waiter.done():
+                loop.call_soon_threadsafe(_set_waiter_done, waiter)
+                break
+
+    def record(self, latency: float, failed: bool = False):
+        """Feed one attempt's latency to the adaptive limiter (no-op for a fixed limit)."""
+        if self.limiter is None:
+            return
+        previous = self.limiter.limit
+        limit = self.limiter.on_sample(latency, failed, self.in_flight)
+        self._limit_gauge.set(limit)
+        if limit > previous:
+            with self._cond:
+                # Room for more: let queued callers in
+                for _ in range(limit - previous):
+                    self._wake_one()
+
+    def get_status(self) -> Dict[str, Any]:
+        status = {
+            "limit": self.limit,
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "adaptive": self.limiter is not None
+        }
+        if self.limiter is not None:
+            status.update(self.limiter.get_status())
+        return status
+
+def _set_waiter_done(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
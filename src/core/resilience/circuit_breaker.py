@@ -1,19 +1,44 @@
-import time
 import logging
+import threading
 from enum import Enum
-from typing import Callable, Any, Optional
-from src.core.exceptions import TransientError, PermanentError
+from typing import Awaitable, Callable, Any, Optional
+from src.core import clock
+from src.core.exceptions import TransientError, PermanentError, RateLimitExceededError
+from src.core.resilience.shared_state import BreakerStateBackend, SharedBreakerState, SharedTimeWindow
+from src.core.resilience.sliding_window import CountBasedSlidingWindow, TimeBasedSlidingWindow
+from src.monitoring.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+STATE_TRANSITIONS = metrics.counter(
+    "circuit_breaker_transitions_total", "Circuit breaker state changes", ("service", "state")
+)
+REJECTED_CALLS = metrics.counter(
+    "circuit_breaker_rejected_calls_total", "Calls rejected because the circuit was open", ("service",)
+)
+STATE_GAUGE = metrics.gauge(
+    "circuit_breaker_state", "Current circuit state (0 = CLOSED, 1 = HALF_OPEN, 2 = OPEN)", ("service",)
+)
+
 class CircuitState(Enum):
     CLOSED = "CLOSED"
     OPEN = "OPEN"
     HALF_OPEN = "HALF_OPEN"
 
+_STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
 class CircuitBreakerOpenError(Exception):
     """Raised when the circuit breaker is open."""
-    pass
+    def __init__(self, message: str, service_name: str = "Unknown"):
+        super().__init__(message)
+        self.service_name = service_name
+        self.message = message
+
+# Supported values for CircuitBreaker(window_type=...)
+WINDOW_TYPES = {
+    "count": CountBasedSlidingWindow,
+    "time": TimeBasedSlidingWindow,
+}
 
 class CircuitBreaker:
     def __init__(
@@ -21,59 +46,387 @@ class CircuitBreaker:
         service_name: str,
         failure_threshold: int = 3,
         recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        window_type: str = "consecutive",
+        window_size: int = 100,
+        failure_rate_threshold: float = 50.0,
+        slow_call_rate_threshold: float = 100.0,
+        slow_call_duration: float = 5.0,
+        minimum_calls: int = 10,
         on_state_change: Optional[Callable[[str, CircuitState], None]] = None
     ):
+        """
+        Thread-safe circuit breaker.
+
+        Args:
+            service_name: Name of the protected service.
+            failure_threshold: Consecutive failures that trip the circuit.
+            recovery_timeout: Seconds to stay OPEN before probing in HALF_OPEN.
+            half_open_max_calls: Probe calls admitted while HALF_OPEN; all of them
+                must succeed to close the circuit again.
+            window_type: "consecutive" trips on failure_threshold consecutive failures.
+                "count" (last window_size calls) or "time" (last window_size seconds)
+                trip on failure or slow-call rates over a sliding window.
+            window_size: Calls or seconds covered by the sliding window.
+            failure_rate_threshold: Failure percentage that trips a windowed circuit.
+            slow_call_rate_threshold: Slow-call percentage that trips a windowed circuit.
+            slow_call_duration: Calls taking longer than this many seconds count as slow.
+            minimum_calls: Calls needed in the window before rates are evaluated.
+            on_state_change: Callback invoked with (service_name, new_state).
+        """
         self.service_name = service_name
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
         self.on_state_change = on_state_change
-        
+
+        if window_type != "consecutive" and window_type not in WINDOW_TYPES:
+            raise ValueError(f"Unknown circuit breaker window_type: {window_type}")
+        self.window_type = window_type
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.minimum_calls = max(1, minimum_calls)
+        self._window = WINDOW_TYPES[window_type](window_size) if window_type in WINDOW_TYPES else None
+
         self.state = CircuitState.CLOSED
         self.failure_count = 0
-        self.last_failure_time: Optional[float] = None
+        # Wall-clock time of the last failure, for status reports only. Timeouts
+        # use monotonic timestamps, which are immune to wall-clock jumps.
+        self.last_failure_at: Optional[float] = None
 
-    def _set_state(self, new_state: CircuitState):
-        if self.state != new_state:
-            logger.info(f"Circuit Breaker for {self.service_name} changed state: {self.state} -> {new_state}")
-            self.state = new_state
-            if self.on_state_change:
-                self.on_state_change(self.service_name, new_state)
+        # Guards every state mutation. The CLOSED fast path only reads attributes
+        # (atomic under the GIL) and never takes the lock.
+        self._lock = threading.Lock()
+        self._opened_at = 0.0
+        self._half_open_permits = 0
+        self._half_open_successes = 0
+        self._half_open_at = 0.0
 
-    def call(self, func: Callable, *args, **kwargs) -> Any:
-        if self.state == CircuitState.OPEN:
-            if time.time() - self.last_failure_time > self.recovery_timeout:
-                self._set_state(CircuitState.HALF_OPEN)
+        # Set by use_shared_state() when several workers share this circuit
+        self._shared: Optional[BreakerStateBackend] = None
+        self._shared_version = 0
+        self._shared_failures = 0
+        self._sync_interval = 0.1
+        self._last_sync = 0.0
+
+        self._rejected_calls = REJECTED_CALLS.labels(service_name)
+        self._state_gauge = STATE_GAUGE.labels(service_name)
+        self._state_gauge.set(0)
+
+    def use_shared_state(self, backend: BreakerStateBackend, sync_interval: float = 0.1):
+        """
+        Share this circuit with every worker using the same backend.
+
+        State changes are published with a compare-and-set, so when several
+        workers see the same outage only the first one trips the circuit (and
+        alerts); the others adopt its state on their next sync, at most
+        sync_interval seconds later. Consecutive failures and time windows are
+        counted across workers. Count windows stay per worker.
+
+        Args:
+            backend: Shared store, see src.core.resilience.shared_state.
+            sync_interval: Seconds between reads of the shared state.
+        """
+        with self._lock:
+            self._shared = backend
+            self._sync_interval = sync_interval
+            if self.window_type == "time":
+                self._window = SharedTimeWindow(backend, self.service_name, self._window.size)
+            self._sync()
+
+    def _shared_op(self, op: str, *args, default: Any = None) -> Any:
+        """Run a backend operation; if the backend is unreachable, carry on with local state."""
+        try:
+            return getattr(self._shared, op)(self.service_name, *args)
+        except Exception as e:
+            logger.warning(f"Shared circuit state for {self.service_name} unavailable ({op}): {e}")
+            return default
+
+    def _sync(self):
+        """Adopt the shared state if another worker changed it; must be called with the lock held."""
+        self._last_sync = clock.monotonic()
+        remote = self._shared_op("get")
+        if remote is None:
+            return
+        self._shared_failures = remote.failures
+        if remote.version > self._shared_version:
+            self._adopt(remote)
+
+    def _adopt(self, remote: SharedBreakerState):
+        """Follow a transition made by another worker, without notifying."""
+        self._shared_version = remote.version
+        # opened_at is wall-clock time; map it onto this process's monotonic clock
+        since = clock.monotonic() - max(0.0, clock.time() - remote.opened_at)
+        new_state = CircuitState(remote.state)
+        if new_state != self.state:
+            logger.info(f"Circuit Breaker for {self.service_name} follows shared state: {self.state} -> {new_state}")
+            self._enter_state(new_state, since)
+            if new_state == CircuitState.CLOSED and self._window is not None and not isinstance(self._window, SharedTimeWindow):
+                self._window.reset()
+        elif new_state == CircuitState.OPEN:
+            self._opened_at = since
+        if new_state == CircuitState.HALF_OPEN:
+            # The worker that moved to HALF_OPEN owns the probe calls
+            self._half_open_permits = 0
+            self._half_open_at = since
+
+    def _enter_state(self, new_state: CircuitState, since: float):
+        """Apply a state locally; must be called with the lock held."""
+        self.state = new_state
+        STATE_TRANSITIONS.labels(self.service_name, new_state.value).inc()
+        self._state_gauge.set(_STATE_VALUES[new_state])
+        if new_state == CircuitState.OPEN:
+            self._opened_at = since
+        elif new_state == CircuitState.HALF_OPEN:
+            self._half_open_permits = self.half_open_max_calls
+            self._half_open_successes = 0
+            self._half_open_at = since
+
+    def _publish(self, new_state: CircuitState) -> bool:
+        """Claim a transition in the shared state; lock must be held. False if another worker moved first."""
+        won, remote = self._shared_op(
+            "transition", self._shared_version, new_state.value, clock.time(), default=(True, None)
+        )
+        if remote is None:
+            return True
+        if not won:
+            self._adopt(remote)
+            return False
+        self._shared_version = remote.version
+        self._shared_failures = remote.failures
+        return True
+
+    def _set_state(self, new_state: CircuitState) -> bool:
+        """Switch state; must be called with the lock held. Returns True if the state changed."""
+        if self.state == new_state:
+            return False
+        if self._shared is not None and not self._publish(new_state):
+            return False
+        logger.info(f"Circuit Breaker for {self.service_name} changed state: {self.state} -> {new_state}")
+        self._enter_state(new_state, clock.monotonic())
+        if new_state == CircuitState.CLOSED and self._window is not None:
+            # Start the recovered circuit with a clean window
+            self._window.reset()
+        return True
+
+    def _notify(self, new_state: CircuitState):
+        # Callbacks run outside the lock so slow alerting cannot block other callers
+        if self.on_state_change:
+            self.on_state_change(self.service_name, new_state)
+
+    def _before_call(self) -> bool:
+        """Admit or reject a call. Returns True when the call is a HALF_OPEN probe."""
+        if self._shared is not None and clock.monotonic() - self._last_sync >= self._sync_interval:
+            with self._lock:
+                self._sync()
+        if self.state is CircuitState.CLOSED:
+            return False
+
+        changed = False
+        with self._lock:
+            if self.state is CircuitState.OPEN:
+                if clock.monotonic() - self._opened_at > self.recovery_timeout:
+                    changed = self._set_state(CircuitState.HALF_OPEN)
+                else:
+                    self._rejected_calls.inc()
+                    raise CircuitBreakerOpenError(
+                        f"Circuit Breaker for {self.service_name} is OPEN", service_name=self.service_name
+                    )
+
+            if self.state is CircuitState.HALF_OPEN:
+                if (
+                    self._half_open_permits <= 0 and self._shared is not None
+                    and clock.monotonic() - self._half_open_at > self.recovery_timeout
+                ):
+                    # The worker that owned the probes went quiet (or died); take them over
+                    if self._publish(CircuitState.HALF_OPEN):
+                        self._enter_state(CircuitState.HALF_OPEN, clock.monotonic())
+                if self._half_open_permits <= 0:
+                    self._rejected_calls.inc()
+                    raise CircuitBreakerOpenError(
+                        f"Circuit Breaker for {self.service_name} is HALF_OPEN and its probe calls are in use",
+                        service_name=self.service_name
+                    )
+                self._half_open_permits -= 1
+                is_probe = True
             else:
-                raise CircuitBreakerOpenError(f"Circuit Breaker for {self.service_name} is OPEN")
+                is_probe = False
+
+        if changed:
+            self._notify(CircuitState.HALF_OPEN)
+        return is_probe
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        is_probe = self._before_call()
+        start = clock.monotonic() if self._window is not None else 0.0
 
         try:
             result = func(*args, **kwargs)
-            self._on_success()
-            return result
-        except PermanentError:
+        except (PermanentError, RateLimitExceededError):
             # Permanent errors don't trip the circuit breaker as they are usually client-side/logic issues
             # though some might argue they should if they indicate a major misconfiguration.
             # For this assignment, let's keep it to TransientErrors tripping the circuit.
+            # A 429 means the provider is healthy but throttling us, so it does not count either.
+            self._on_ignored(is_probe)
             raise
         except Exception as e:
-            self._on_failure()
+            self._on_failure(is_probe, start)
             raise e
+        except BaseException:
+            # Cancelled (e.g. a losing hedge) or interrupted: the probe slot must not leak
+            self._on_ignored(is_probe)
+            raise
+        self._on_success(is_probe, start)
+        return result
 
-    def _on_success(self):
-        if self.state == CircuitState.HALF_OPEN:
-            self._set_state(CircuitState.CLOSED)
-        self.failure_count = 0
+    async def call_async(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Awaitable variant of call() for coroutine functions."""
+        is_probe = self._before_call()
+        start = clock.monotonic() if self._window is not None else 0.0
+
+        try:
+            result = await func(*args, **kwargs)
+        except (PermanentError, RateLimitExceededError):
+            # Same policy as call(): only non-permanent, non-throttling errors trip the circuit
+            self._on_ignored(is_probe)
+            raise
+        except Exception as e:
+            self._on_failure(is_probe, start)
+            raise e
+        except BaseException:
+            # Cancelled (e.g. a losing hedge) or interrupted: the probe slot must not leak
+            self._on_ignored(is_probe)
+            raise
+        self._on_success(is_probe, start)
+        return result
+
+    def _on_success(self, is_probe: bool = False, start: float = 0.0):
+        # Fast path: nothing to reset in a healthy CLOSED circuit
+        if (
+            self._window is None and not is_probe and self.failure_count == 0
+            and self._shared_failures == 0 and self.state is CircuitState.CLOSED
+        ):
+            return
+
+        new_state = None
+        with self._lock:
+            if self._shared is not None and self._window is None and (self.failure_count or self._shared_failures):
+                self._shared_op("reset_failures")
+                self._shared_failures = 0
+            self.failure_count = 0
+            if is_probe and self.state is CircuitState.HALF_OPEN:
+                self._half_open_successes += 1
+                if self._half_open_successes >= self.half_open_max_calls:
+                    new_state = CircuitState.CLOSED
+            elif self._window is not None and self.state is CircuitState.CLOSED:
+                now = clock.monotonic()
+                self._window.record(False, now - start > self.slow_call_duration, now)
+                if self._window_tripped(now):
+                    new_state = CircuitState.OPEN
+            changed = new_state is not None and self._set_state(new_state)
+
+        if changed:
+            self._notify(new_state)
+
+    def _on_failure(self, is_probe: bool = False, start: float = 0.0):
+        changed = False
+        with self._lock:
+            self.failure_count += 1
+            now = clock.monotonic()
+            self.last_failure_at = clock.time()
+
+            if self._window is not None:
+                if self.state is CircuitState.CLOSED:
+                    self._window.record(True, now - start > self.slow_call_duration, now)
+                tripped = self._window_tripped(now)
+            elif self._shared is not None:
+                self._shared_failures = self._shared_op("add_failure", default=self.failure_count)
+                tripped = self._shared_failures >= self.failure_threshold
+            else:
+                tripped = self.failure_count >= self.failure_threshold
+
+            if self.state is CircuitState.HALF_OPEN or tripped:
+                changed = self._set_state(CircuitState.OPEN)
+            if self.state is CircuitState.OPEN:
+                # Late failures from calls already in flight extend the OPEN period
+                self._opened_at = now
+
+        if changed:
+            self._notify(CircuitState.OPEN)
+
+    def is_call_permitted(self) -> bool:
+        """Whether a call made now would be admitted. Lock-free, so only a hint for routing."""
+        if self.state is CircuitState.CLOSED:
+            return True
+        if self.state is CircuitState.OPEN:
+            return clock.monotonic() - self._opened_at > self.recovery_timeout
+        return self._half_open_permits > 0
+
+    def force_open(self):
+        """Open the circuit pre-emptively, e.g. when a health check fails."""
+        with self._lock:
+            changed = self._set_state(CircuitState.OPEN)
+        if changed:
+            self._notify(CircuitState.OPEN)
+
+    def try_recover(self, probe: Callable[[], Any]) -> bool:
+        """
+        Recover without waiting for recovery_timeout or risking real calls.
+
+        Moves an OPEN circuit to HALF_OPEN and spends its probe slots on the
+        synthetic `probe` (which must raise on failure). Returns True once the
+        circuit is CLOSED.
+        """
+        if self.state is CircuitState.CLOSED:
+            return True
+
+        with self._lock:
+            changed = self._set_state(CircuitState.HALF_OPEN)
+        if changed:
+            self._notify(CircuitState.HALF_OPEN)
+
+        for _ in range(self.half_open_max_calls):
+            try:
+                self.call(probe)
+            except Exception:
+                # Failed probe re-opened the circuit, or live calls hold the probe slots
+                break
+            if self.state is CircuitState.CLOSED:
+                break
+        return self.state is CircuitState.CLOSED
+
+    def _window_tripped(self, now: float) -> bool:
+        snapshot = self._window.snapshot(now)
+        if snapshot.total_calls < self.minimum_calls:
+            return False
+        return (
+            snapshot.failure_rate >= self.failure_rate_threshold
+            or snapshot.slow_call_rate >= self.slow_call_rate_threshold
+        )
 
-    def _on_failure(self):
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        
-        if self.state == CircuitState.HALF_OPEN or self.failure_count >= self.failure_threshold:
-            self._set_state(CircuitState.OPEN)
+    def _on_ignored(self, is_probe: bool):
+        # A probe that ended in a PermanentError or was cancelled proved nothing; hand its slot back
+        if is_probe:
+            with self._lock:
+                if self.state is CircuitState.HALF_OPEN:
+                    self._half_open_permits += 1
 
     def get_status(self):
-        return {
+        status = {
             "state": self.state.value,
             "failure_count": self.failure_count,
-            "last_failure_time": self.last_failure_time
+            "last_failure_time": self.last_failure_at
         }
+        if self._shared is not None:
+            status.update({"shared_version": self._shared_version, "shared_failures": self._shared_failures})
+        if self._window is not None:
+            with self._lock:
+                snapshot = self._window.snapshot(clock.monotonic())
+            status.update({
+                "window_type": self.window_type,
+                "window_calls": snapshot.total_calls,
+                "failure_rate": round(snapshot.failure_rate, 2),
+                "slow_call_rate": round(snapshot.slow_call_rate, 2)
+            })
+        return status
@@ -0,0 +1,44 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from src.core import clock
+
+class Deadline:
+    def __init__(self, timeout: float):
+        """A point in monotonic time by which a whole call must finish."""
+        self.timeout = timeout
+        self.expires_at = clock.monotonic() + timeout
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - clock.monotonic())
+
+    def expired(self) -> bool:
+        return clock.monotonic() >= self.expires_at
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline of the call running in this context, if any."""
+    return _current_deadline.get()
+
+@contextmanager
+def deadline_scope(timeout: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """
+    Bound everything run inside the block by `timeout` seconds.
+
+    The deadline travels through a context variable, so BaseService.execute
+    and the retry loop pick it up without extra arguments. A nested scope can
+    only tighten an outer deadline, never extend it.
+    """
+    outer = _current_deadline.get()
+    if timeout is None:
+        yield outer
+        return
+    deadline = Deadline(timeout)
+    if outer is not None and outer.expires_at < deadline.expires_at:
+        deadline = outer
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
@@ -0,0 +1,51 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+FALLBACK_STRATEGIES = ("stale_cache", "static", "secondary")
+
+class FallbackPolicy:
+    def __init__(
+        self,
+        strategies: Optional[List[str]] = None,
+        static_response: Optional[Any] = None,
+        static_path: Optional[str] = None
+    ):
+        """
+        What a service serves instead of failing while its circuit is OPEN.
+
+        Strategies are tried in order until one produces a response:
+            stale_cache: the last good cached response for the same input,
+                even if its TTL has passed.
+            static: a fixed response, e.g. a pre-rendered generic audio clip.
+            secondary: the same call on a secondary provider (set by the owner).
+
+        Args:
+            strategies: Ordered strategy names.
+            static_response: Response used by the static strategy.
+            static_path: File whose bytes are used as the static response;
+                read once here so serving it never touches the disk.
+        """
+        self.strategies = list(strategies or ["stale_cache"])
+        for strategy in self.strategies:
+            if strategy not in FALLBACK_STRATEGIES:
+                raise ValueError(f"Unknown fallback strategy: {strategy}")
+        if static_path:
+            with open(static_path, "rb") as f:
+                static_response = f.read()
+        self.static_response = static_response
+        self.served: Dict[str, int] = {strategy: 0 for strategy in self.strategies}
+
+    def resolve_local(self, strategy: str, cache: Any, key: Optional[str]) -> Tuple[bool, Any]:
+        """Try a strategy that needs no network: stale_cache or static."""
+        if strategy == "stale_cache":
+            if cache is None or key is None:
+                return False, None
+            return cache.get_stale(key)
+        if strategy == "static":
+            return self.static_response is not None, self.static_response
+        return False, None
+
+    def record(self, strategy: str):
+        self.served[strategy] = self.served.get(strategy, 0) + 1
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.served)
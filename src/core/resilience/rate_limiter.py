@@ -0,0 +1,143 @@
+import asyncio
+import threading
+from typing import Any, Dict, Optional
+from src.core import clock
+from src.core.exceptions import RateLimitExceededError
+from src.monitoring.metrics import metrics
+
+THROTTLED = metrics.counter(
+    "rate_limited_total", "Calls held back by the client-side rate limiter (outcome: delayed, rejected)", ("service", "outcome")
+)
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        """
+        Thread-safe token bucket.
+
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum tokens held (the burst size).
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = clock.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, cost: float = 1.0) -> bool:
+        """Take cost tokens if available. Never blocks."""
+        with self._lock:
+            self._refill(clock.monotonic())
+            if self._tokens >= cost:
+                self._tokens -= cost
+                return True
+            return False
+
+    def time_until_available(self, cost: float = 1.0) -> float:
+        """Seconds until cost tokens will be available (0 if they are now)."""
+        with self._lock:
+            self._refill(clock.monotonic())
+            missing = cost - self._tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else float("inf")
+
+class ServiceRateLimiter:
+    def __init__(
+        self,
+        service_name: str,
+        requests_per_second: Optional[float] = None,
+        burst: Optional[float] = None,
+        chars_per_second: Optional[float] = None,
+        char_burst: Optional[float] = None,
+        max_wait: float = 2.0
+    ):
+        """
+        Client-side request and character rate limits for one provider.
+
+        Keeping below the vendor's limits turns a burst into short waits
+        instead of 429 failures. A caller that would have to wait longer
+        than max_wait gets RateLimitExceededError with a retry_after hint.
+
+        Args:
+            service_name: Service name, for errors and metrics.
+            requests_per_second: Sustained request rate (None = unlimited).
+            burst: Requests allowed back to back (default: one second's worth).
+            chars_per_second: Sustained character rate, e.g. for TTS (None = unlimited).
+            char_burst: Characters allowed back to back (default: one second's worth).
+            max_wait: Longest a caller is held back before being rejected.
+        """
+        self.service_name = service_name
+        self.max_wait = max_wait
+        self.requests = TokenBucket(requests_per_second, burst or max(1.0, requests_per_second)) if requests_per_second else None
+        self.chars = TokenBucket(chars_per_second, char_burst or chars_per_second) if chars_per_second else None
+        self._lock = threading.Lock()
+        self.delayed = 0
+        self.rejected = 0
+
+    def _reserve(self, chars: int) -> float:
+        """Take the tokens if all are available now and return 0, else return the wait."""
+        # A text longer than the whole character burst waits for a full bucket
+        char_cost = min(chars, self.chars.capacity) if self.chars else 0
+        with self._lock:
+            wait = 0.0
+            if self.requests is not None:
+                wait = self.requests.time_until_available(1)
+            if self.chars is not None and char_cost:
+                wait = max(wait, self.chars.time_until_available(char_cost))
+            if wait <= 0:
+                if self.requests is not None:
+                    self.requests.try_acquire(1)
+                if self.chars is not None and char_cost:
+                    self.chars.try_acquire(char_cost)
+        return wait
+
+    def _reject(self, wait: float):
+        self.rejected += 1
+        THROTTLED.labels(self.service_name, "rejected").inc()
+        raise RateLimitExceededError(
+            f"Client-side rate limit for {self.service_name} reached; next slot in {wait:.2f}s",
+            service_name=self.service_name,
+            retry_after=wait
+        )
+
+    def acquire(self, chars: int = 0, max_wait: Optional[float] = None):
+        """Block until one request (and `chars` characters) may be sent, or raise."""
+        budget = self.max_wait if max_wait is None else max_wait
+        deadline = clock.monotonic() + budget
+        waited = False
+        while True:
+            wait = self._reserve(chars)
+            if wait <= 0:
+                break
+            if clock.monotonic() + wait > deadline:
+                self._reject(wait)
+            waited = True
+            clock.sleep(wait)
+        if waited:
+            self.delayed += 1
+            THROTTLED.labels(self.service_name, "delayed").inc()
+
+    async def acquire_async(self, chars: int = 0, max_wait: Optional[float] = None):
+        """Async variant of acquire(); waiting yields the event loop."""
+        budget = self.max_wait if max_wait is None else max_wait
+        deadline = clock.monotonic() + budget
+        waited = False
+        while True:
+            wait = self._reserve(chars)
+            if wait <= 0:
+                break
+            if clock.monotonic() + wait > deadline:
+                self._reject(wait)
+            waited = True
+            await asyncio.sleep(wait)
+        if waited:
+            self.delayed += 1
+            THROTTLED.labels(self.service_name, "delayed").inc()
+
+    def get_status(self) -> Dict[str, Any]:
+        return {"delayed": self.delayed, "rejected": self.rejected}
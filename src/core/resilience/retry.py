@@ -1,22 +1,38 @@
-import time
 import random
+import asyncio
 import logging
-from typing import Callable, Type, Tuple, Any
-from src.core.exceptions import TransientError
+from typing import Awaitable, Callable, Type, Tuple, Any, Optional
+from src.core import clock
+from src.core.exceptions import TransientError, DeadlineExceededError
+from src.core.resilience.deadline import Deadline
+from src.core.resilience.retry_budget import RetryBudget
+from src.monitoring.metrics import metrics
+from src.monitoring.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
+RETRIES = metrics.counter("retries_total", "Retries scheduled after a failed attempt", ("service",))
+GIVE_UPS = metrics.counter(
+    "retry_give_ups_total", "Calls that stopped retrying (reason: max_retries, budget, deadline)", ("service", "reason")
+)
+
+JITTER_MODES = ("proportional", "decorrelated")
+
 def retry_with_backoff(
     func: Callable,
     max_retries: int = 3,
     initial_delay: float = 1.0,
     backoff_factor: float = 2.0,
     retryable_exceptions: Tuple[Type[Exception], ...] = (TransientError,),
-    service_name: str = "Unknown"
+    service_name: str = "Unknown",
+    max_delay: Optional[float] = None,
+    jitter: str = "proportional",
+    deadline: Optional[Deadline] = None,
+    retry_budget: Optional[RetryBudget] = None
 ) -> Any:
     """
     Retry a function with exponential backoff.
-    
+
     Args:
         func: The function to execute.
         max_retries: Maximum number of retry attempts.
@@ -24,33 +40,140 @@ def retry_with_backoff(
         backoff_factor: Multiplier for the delay after each failure.
         retryable_exceptions: Exceptions that trigger a retry.
         service_name: Name of the service for logging.
+        max_delay: Upper bound for a single backoff sleep.
+        jitter: "proportional" (delay plus up to 10%) or "decorrelated"
+            (random between initial_delay and 3x the previous sleep).
+            An error carrying a `retry_after` hint (e.g. a 429) waits exactly
+            that long instead.
+        deadline: Overall deadline; sleeps are capped at the time left and no
+            attempt starts once it has passed.
+        retry_budget: Shared budget every retry must draw from.
     """
-    delay = initial_delay
+    backoff = _Backoff(initial_delay, backoff_factor, max_delay, jitter)
     last_exception = None
 
     for attempt in range(max_retries + 1):
+        _check_deadline(deadline, service_name, last_exception)
         try:
             return func()
         except retryable_exceptions as e:
             last_exception = e
-            if attempt == max_retries:
-                logger.error(f"Service {service_name} failed after {max_retries} retries. Final error: {str(e)}")
-                raise e
-            
-            # Add some jitter to avoid thundering herd if multiple instances retry at same time
-            jitter = random.uniform(0, 0.1 * delay)
-            sleep_time = delay + jitter
-            
-            logger.warning(
-                f"Attempt {attempt + 1} for {service_name} failed: {str(e)}. "
-                f"Retrying in {sleep_time:.2f} seconds..."
-            )
-            
-            time.sleep(sleep_time)
-            delay *= backoff_factor
+            sleep_time = _plan_retry(attempt, max_retries, e, backoff, deadline, retry_budget, service_name)
+            with tracer.span("backoff", service=service_name, attempt=attempt, seconds=round(sleep_time, 4)):
+                clock.sleep(sleep_time)
+        except Exception as e:
+            # Permanent errors or non-retryable exceptions skip retries
+            logger.error(f"Non-retryable error in {service_name}: {str(e)}")
+            raise e
+
+    raise last_exception
+
+async def async_retry_with_backoff(
+    func: Callable[[], Awaitable[Any]],
+    max_retries: int = 3,
+    initial_delay: float = 1.0,
+    backoff_factor: float = 2.0,
+    retryable_exceptions: Tuple[Type[Exception], ...] = (TransientError,),
+    service_name: str = "Unknown",
+    max_delay: Optional[float] = None,
+    jitter: str = "proportional",
+    deadline: Optional[Deadline] = None,
+    retry_budget: Optional[RetryBudget] = None
+) -> Any:
+    """
+    Async variant of retry_with_backoff.
+
+    Backoff waits use asyncio.sleep so a retrying call yields the event loop
+    instead of holding a thread. Arguments match retry_with_backoff, except
+    that func must return an awaitable.
+    """
+    backoff = _Backoff(initial_delay, backoff_factor, max_delay, jitter)
+    last_exception = None
+
+    for attempt in range(max_retries + 1):
+        _check_deadline(deadline, service_name, last_exception)
+        try:
+            return await func()
+        except retryable_exceptions as e:
+            last_exception = e
+            sleep_time = _plan_retry(attempt, max_retries, e, backoff, deadline, retry_budget, service_name)
+            with tracer.span("backoff", service=service_name, attempt=attempt, seconds=round(sleep_time, 4)):
+                await asyncio.sleep(sleep_time)
         except Exception as e:
             # Permanent errors or non-retryable exceptions skip retries
             logger.error(f"Non-retryable error in {service_name}: {str(e)}")
             raise e
 
     raise last_exception
+
+class _Backoff:
+    """Produces successive sleep times for one retry loop."""
+    def __init__(self, initial_delay: float, backoff_factor: float, max_delay: Optional[float], jitter: str):
+        if jitter not in JITTER_MODES:
+            raise ValueError(f"Unknown jitter mode: {jitter}")
+        self.initial_delay = initial_delay
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self._delay = initial_delay
+        self._previous_sleep = initial_delay
+
+    def next_sleep(self) -> float:
+        if self.jitter == "decorrelated":
+            sleep_time = random.uniform(self.initial_delay, self._previous_sleep * 3)
+        else:
+            # Add some jitter to avoid thundering herd if multiple instances retry at same time
+            sleep_time = self._delay + random.uniform(0, 0.1 * self._delay)
+            self._delay *= self.backoff_factor
+        if self.max_delay is not None:
+            sleep_time = min(sleep_time, self.max_delay)
+        self._previous_sleep = sleep_time
+        return sleep_time
+
+def _check_deadline(deadline: Optional[Deadline], service_name: str, last_exception: Optional[Exception]):
+    if deadline is not None and deadline.expired():
+        GIVE_UPS.labels(service_name, "deadline").inc()
+        reason = f" Last error: {last_exception}" if last_exception else ""
+        logger.error(f"Deadline of {deadline.timeout:.2f}s exceeded for {service_name}.{reason}")
+        raise DeadlineExceededError(
+            f"Call deadline of {deadline.timeout:.2f}s exceeded for {service_name}.{reason}",
+            service_name=service_name
+        )
+
+def _plan_retry(
+    attempt: int,
+    max_retries: int,
+    error: Exception,
+    backoff: _Backoff,
+    deadline: Optional[Deadline],
+    retry_budget: Optional[RetryBudget],
+    service_name: str
+) -> float:
+    """Decide whether another attempt may follow `error`; returns the sleep before it or raises."""
+    if attempt == max_retries:
+        GIVE_UPS.labels(service_name, "max_retries").inc()
+        logger.error(f"Service {service_name} failed after {max_retries} retries. Final error: {str(error)}")
+        raise error
+    if retry_budget is not None and not retry_budget.try_spend():
+        GIVE_UPS.labels(service_name, "budget").inc()
+        logger.error(f"Retry budget exhausted for {service_name}; not retrying: {str(error)}")
+        raise error
+
+    # A throttling error's retry-after hint replaces the backoff schedule
+    retry_after = getattr(error, "retry_after", None)
+    sleep_time = backoff.next_sleep() if retry_after is None else max(0.0, retry_after)
+    if deadline is not None:
+        if retry_after is not None and retry_after > deadline.remaining():
+            GIVE_UPS.labels(service_name, "deadline").inc()
+            logger.error(f"{service_name} asked to retry after {retry_after:.2f}s, past the call deadline: {str(error)}")
+            raise error
+        sleep_time = min(sleep_time, deadline.remaining())
+    RETRIES.labels(service_name).inc()
+    _log_retry(service_name, attempt, error, sleep_time)
+    return sleep_time
+
+def _log_retry(service_name: str, attempt: int, error: Exception, sleep_time: float):
+    logger.warning(
+        f"Attempt {attempt + 1} for {service_name} failed: {str(error)}. "
+        f"Retrying in {sleep_time:.2f} seconds..."
+    )
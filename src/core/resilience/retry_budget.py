@@ -0,0 +1,42 @@
+import threading
+from src.core.resilience.rate_limiter import TokenBucket
+
+class RetryBudget:
+    def __init__(self, ratio: float = 0.2, min_retries_per_second: float = 1.0, max_tokens: float = 100.0):
+        """
+        Cap retries at a fraction of traffic.
+
+        Every request deposits `ratio` tokens and every retry spends one, so
+        retries can never exceed roughly ratio x requests. A small floor of
+        min_retries_per_second keeps retries possible at low traffic.
+
+        Args:
+            ratio: Retries allowed per request.
+            min_retries_per_second: Retries always allowed regardless of traffic.
+            max_tokens: Most retries that can be saved up during quiet periods.
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = 0.0
+        self._floor = TokenBucket(min_retries_per_second, max(1.0, min_retries_per_second))
+        self._lock = threading.Lock()
+        self.exhausted = 0
+
+    def record_request(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget. Returns False when retries must stop."""
+        with self._lock:
+            # Tolerance for float sums: ten deposits of 0.2 add up to 1.9999999999999998
+            if self._tokens >= 1.0 - 1e-9:
+                self._tokens = max(0.0, self._tokens - 1.0)
+                return True
+        if self._floor.try_acquire():
+            return True
+        self.exhausted += 1
+        return False
+
+    def get_status(self):
+        return {"tokens": round(self._tokens, 2), "exhausted": self.exhausted}
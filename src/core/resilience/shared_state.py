@@ -0,0 +1,567 @@
+from abc import ABC, abstractmethod
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from src.core import clock
+from src.core.resilience.sliding_window import WindowSnapshot
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+try:
+    import redis
+except ImportError:  # Optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+class FakeWatchError(Exception):
+    """A watched key changed before a FakeRedis transaction ran (redis.WatchError)."""
+
+WATCH_ERRORS = (FakeWatchError,) if redis is None else (FakeWatchError, redis.WatchError)
+
+STATE_CODES = {"CLOSED": 0, "HALF_OPEN": 1, "OPEN": 2}
+STATE_NAMES = {code: name for name, code in STATE_CODES.items()}
+
+@dataclass
+class SharedBreakerState:
+    """Circuit state as seen by every worker. opened_at is wall-clock time."""
+    state: str = "CLOSED"
+    opened_at: float = 0.0
+    version: int = 0
+    failures: int = 0
+
+class BreakerStateBackend(ABC):
+    """
+    Storage for circuit breaker state shared by several workers.
+
+    State changes are compare-and-set on a version number, so when several
+    workers see the same outage only one of them performs (and alerts on)
+    each transition. The rest follow it.
+    """
+
+    @abstractmethod
+    def get(self, name: str) -> SharedBreakerState:
+        pass
+
+    @abstractmethod
+    def transition(self, name: str, expected_version: int, state: str, opened_at: float) -> Tuple[bool, SharedBreakerState]:
+        """Move to state if nobody else moved first. Returns (won, current state)."""
+
+    @abstractmethod
+    def add_failure(self, name: str) -> int:
+        """Count one failure; returns the consecutive failures across all workers."""
+
+    @abstractmethod
+    def reset_failures(self, name: str):
+        pass
+
+    @abstractmethod
+    def record_outcome(self, name: str, failed: bool, slow: bool, now: float, window: int):
+        """Add a call to the per-second buckets of a shared time window."""
+
+    @abstractmethod
+    def window_snapshot(self, name: str, now: float, window: int) -> WindowSnapshot:
+        pass
+
+    @abstractmethod
+    def reset_window(self, name: str):
+        pass
+
+class LocalStateBackend(BreakerStateBackend):
+    def __init__(self):
+        """In-process backend: shares state between breakers of the same process (and in tests)."""
+        self._states: Dict[str, SharedBreakerState] = {}
+        self._buckets: Dict[str, Dict[int, List[int]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> SharedBreakerState:
+        with self._lock:
+            state = self._states.get(name, SharedBreakerState())
+            return SharedBreakerState(state.state, state.opened_at, state.version, state.failures)
+
+    def transition(self, name: str, expected_version: int, state: str, opened_at: float) -> Tuple[bool, SharedBreakerState]:
+        with self._lock:
+            current = self._states.setdefault(name, SharedBreakerState())
+            won = current.version == expected_version
+            if won:
+                current.state, current.opened_at, current.version = state, opened_at, expected_version + 1
+                if state != "OPEN":
+                    current.failures = 0
+            return won, SharedBreakerState(current.state, current.opened_at, current.version, current.failures)
+
+    def add_failure(self, name: str) -> int:
+        with self._lock:
+            current = self._states.setdefault(name, SharedBreakerState())
+            current.failures += 1
+            return current.failures
+
+    def reset_failures(self, name: str):
+        with self._lock:
+            self._states.setdefault(name, SharedBreakerState()).failures = 0
+
+    def record_outcome(self, name: str, failed: bool, slow: bool, now: float, window: int):
+        epoch = int(now)
+        with self._lock:
+            buckets = self._buckets.setdefault(name, {})
+            bucket = buckets.setdefault(epoch, [0, 0, 0])
+            bucket[0] += 1
+            bucket[1] += int(failed)
+            bucket[2] += int(slow)
+            for old in [e for e in buckets if e <= epoch - window]:
+                del buckets[old]
+
+    def window_snapshot(self, name: str, now: float, window: int) -> WindowSnapshot:
+        epoch = int(now)
+        snapshot = WindowSnapshot()
+        with self._lock:
+            for bucket_epoch, (calls, failed, slow) in self._buckets.get(name, {}).items():
+                if epoch - window < bucket_epoch <= epoch:
+                    snapshot.total_calls += calls
+                    snapshot.failed_calls += failed
+                    snapshot.slow_calls += slow
+        return snapshot
+
+    def reset_window(self, name: str):
+        with self._lock:
+            self._buckets.pop(name, None)
+
+# Slot layout of the mmap backend: name, version, state, opened_at, failures, then the window buckets
+_SLOT_HEADER = struct.Struct("<64sqqdq")
+_BUCKET = struct.Struct("<qqqq")
+
+class MmapStateBackend(BreakerStateBackend):
+    def __init__(self, path: str, slots: int = 64, max_window: int = 120):
+        """
+        Backend in a memory-mapped file, shared by every process on the host.
+
+        Each service gets a fixed-size slot (found by hashing its name), so
+        reads and writes are a few struct operations. An flock on the file
+        serializes them between processes. Needs a POSIX system.
+
+        Args:
+            path: File backing the shared memory; created if missing.
+            slots: Services that can be tracked.
+            max_window: Largest time window, in seconds, that can be shared.
+        """
+        if fcntl is None:
+            raise RuntimeError("MmapStateBackend needs fcntl (POSIX); use the redis backend instead")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.slots = slots
+        self.max_window = max_window
+        self._slot_size = _SLOT_HEADER.size + max_window * _BUCKET.size
+        size = slots * self._slot_size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        # flock does not exclude threads of the same process, so they also share a lock
+        self._thread_lock = threading.Lock()
+
+    def _locked(self):
+        backend = self
+
+        class _Guard:
+            def __enter__(self):
+                backend._thread_lock.acquire()
+                fcntl.flock(backend._fd, fcntl.LOCK_EX)
+
+            def __exit__(self, *exc):
+                fcntl.flock(backend._fd, fcntl.LOCK_UN)
+                backend._thread_lock.release()
+
+        return _Guard()
+
+    def _slot(self, name: str) -> int:
+        """Offset of the slot for name, claiming an empty one if needed; lock must be held."""
+        key = name.encode("utf-8")[:64]
+        start = zlib.crc32(key) % self.slots
+        for probe in range(self.slots):
+            offset = ((start + probe) % self.slots) * self._slot_size
+            stored = self._map[offset:offset + 64].rstrip(b"\x00")
+            if stored == key:
+                return offset
+            if not stored:
+                self._map[offset:offset + 64] = key.ljust(64, b"\x00")
+                return offset
+        raise RuntimeError(f"No free breaker slot for {name}; raise MmapStateBackend slots")
+
+    def _read(self, offset: int) -> SharedBreakerState:
+        _, version, state, opened_at, failures = _SLOT_HEADER.unpack_from(self._map, offset)
+        return SharedBreakerState(STATE_NAMES.get(state, "CLOSED"), opened_at, version, failures)
+
+    def _write(self, offset: int, name: str, current: SharedBreakerState):
+        _SLOT_HEADER.pack_into(
+            self._map, offset, name.encode("utf-8")[:64], current.version,
+            STATE_CODES[current.state], current.opened_at, current.failures
+        )
+
+    def get(self, name: str) -> SharedBreakerState:
+        with self._locked():
+            return self._read(self._slot(name))
+
+    def transition(self, name: str, expected_version: int, state: str, opened_at: float) -> Tuple[bool, SharedBreakerState]:
+        with self._locked():
+            offset = self._slot(name)
+            current = self._read(offset)
+            if current.version != expected_version:
+                return False, current
+            current = SharedBreakerState(state, opened_at, expected_version + 1, current.failures if state == "OPEN" else 0)
+            self._write(offset, name, current)
+            return True, current
+
+    def add_failure(self, name: str) -> int:
+        with self._locked():
+            offset = self._slot(name)
+            current = self._read(offset)
+            current.failures += 1
+            self._write(offset, name, current)
+            return current.failures
+
+    def reset_failures(self, name: str):
+        with self._locked():
+            offset = self._slot(name)
+            current = self._read(offset)
+            current.failures = 0
+            self._write(offset, name, current)
+
+    def _check_window(self, window: int):
+        if window > self.max_window:
+            raise ValueError(f"Window of {window}s exceeds MmapStateBackend max_window ({self.max_window}s)")
+
+    def record_outcome(self, name: str, failed: bool, slow: bool, now: float, window: int):
+        self._check_window(window)
+        epoch = int(now)
+        with self._locked():
+            bucket_offset = self._slot(name) + _SLOT_HEADER.size + (epoch % self.max_window) * _BUCKET.size
+            bucket_epoch, calls, failures, slow_calls = _BUCKET.unpack_from(self._map, bucket_offset)
+            if bucket_epoch != epoch:
+                # The bucket still holds an older lap of the ring
+                calls = failures = slow_calls = 0
+            _BUCKET.pack_into(self._map, bucket_offset, epoch, calls + 1, failures + int(failed), slow_calls + int(slow))
+
+    def window_snapshot(self, name: str, now: float, window: int) -> WindowSnapshot:
+        self._check_window(window)
+        epoch = int(now)
+        snapshot = WindowSnapshot()
+        with self._locked():
+            base = self._slot(name) + _SLOT_HEADER.size
+            for index in range(self.max_window):
+                bucket_epoch, calls, failures, slow_calls = _BUCKET.unpack_from(self._map, base + index * _BUCKET.size)
+                if epoch - window < bucket_epoch <= epoch:
+                    snapshot.total_calls += calls
+                    snapshot.failed_calls += failures
+                    snapshot.slow_calls += slow_calls
+        return snapshot
+
+    def reset_window(self, name: str):
+        with self._locked():
+            base = self._slot(name) + _SLOT_HEADER.size
+            self._map[base:base + self.max_window * _BUCKET.size] = b"\x00" * (self.max_window * _BUCKET.size)
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+class RedisStateBackend(BreakerStateBackend):
+    def __init__(self, client: Any, prefix: str = "circuit:"):
+        """
+        Backend on a Redis-compatible client, shared by workers on every node.
+
+        Only plain commands and WATCH/MULTI/EXEC transactions are used, so
+        `redis.Redis` and FakeRedis both work. A transition watches the state
+        hash, checks its version and writes the new state in one transaction,
+        which makes it a compare-and-set without Lua scripts: a worker dying
+        mid-transition leaves either the old state or the new one.
+
+        Args:
+            client: redis.Redis (or FakeRedis) instance.
+            prefix: Key prefix for every key this backend writes.
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, name: str, *parts: Any) -> str:
+        return ":".join([f"{self.prefix}{name}", *map(str, parts)])
+
+    def get(self, name: str) -> SharedBreakerState:
+        fields = {_text(k): _text(v) for k, v in (self.client.hgetall(self._key(name)) or {}).items()}
+        failures = self.client.get(self._key(name, "failures"))
+        return SharedBreakerState(
+            state=fields.get("state", "CLOSED"),
+            opened_at=float(fields.get("opened_at", 0.0)),
+            version=int(fields.get("version", 0)),
+            failures=int(failures or 0)
+        )
+
+    def transition(self, name: str, expected_version: int, state: str, opened_at: float) -> Tuple[bool, SharedBreakerState]:
+        version = expected_version + 1
+        key = self._key(name)
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                if int(pipe.hget(key, "version") or 0) != expected_version:
+                    pipe.unwatch()
+                    return False, self.get(name)
+                pipe.multi()
+                pipe.hset(key, mapping={"state": state, "opened_at": opened_at, "version": version})
+                if state != "OPEN":
+                    pipe.set(self._key(name, "failures"), 0)
+                pipe.execute()
+            except WATCH_ERRORS:
+                # Another worker changed the state between our check and EXEC
+                return False, self.get(name)
+        return True, SharedBreakerState(state, opened_at, version, 0 if state != "OPEN" else self.get(name).failures)
+
+    def add_failure(self, name: str) -> int:
+        return int(self.client.incr(self._key(name, "failures")))
+
+    def reset_failures(self, name: str):
+        self.client.set(self._key(name, "failures"), 0)
+
+    def _window_key(self, name: str, generation: Any, bucket: int, field: str) -> str:
+        return self._key(name, "w", int(generation or 0), bucket, field)
+
+    def record_outcome(self, name: str, failed: bool, slow: bool, now: float, window: int):
+        epoch = int(now)
+        generation = self.client.get(self._key(name, "generation"))
+        pipe = self.client.pipeline()
+        for field, amount in (("calls", 1), ("failed", int(failed)), ("slow", int(slow))):
+            if amount:
+                key = self._window_key(name, generation, epoch, field)
+                pipe.incrby(key, amount)
+                pipe.expire(key, window + 1)
+        pipe.execute()
+
+    def window_snapshot(self, name: str, now: float, window: int) -> WindowSnapshot:
+        epoch = int(now)
+        generation = self.client.get(self._key(name, "generation"))
+        keys = [
+            self._window_key(name, generation, bucket, field)
+            for bucket in range(epoch - window + 1, epoch + 1)
+            for field in ("calls", "failed", "slow")
+        ]
+        values = [int(value or 0) for value in self.client.mget(keys)]
+        return WindowSnapshot(sum(values[0::3]), sum(values[1::3]), sum(values[2::3]))
+
+    def reset_window(self, name: str):
+        # Buckets are keyed by generation; the old ones simply expire
+        self.client.incr(self._key(name, "generation"))
+
+class FakeRedis:
+    def __init__(self):
+        """
+        In-memory stand-in for the subset of redis.Redis used here, for tests
+        and single-host runs. Values are returned as str, like a client with
+        decode_responses=True.
+        """
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        # Bumped on every change of a key, for WATCH
+        self._revisions: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def _alive(self, key: str) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= clock.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            self._touch(key)
+        return key in self._data
+
+    def _touch(self, key: str):
+        self._revisions[key] = self._revisions.get(key, 0) + 1
+
+    def _revision(self, key: str) -> int:
+        self._alive(key)
+        return self._revisions.get(key, 0)
+
+    def get(self, name: str) -> Optional[str]:
+        with self._lock:
+            return str(self._data[name]) if self._alive(name) else None
+
+    def set(self, name: str, value: Any, ex: Optional[float] = None, nx: bool = False) -> Optional[bool]:
+        with self._lock:
+            if nx and self._alive(name):
+                return None
+            self._data[name] = str(value)
+            self._touch(name)
+            if ex is not None:
+                self._expires[name] = clock.monotonic() + ex
+            else:
+                self._expires.pop(name, None)
+            return True
+
+    def incrby(self, name: str, amount: int = 1) -> int:
+        with self._lock:
+            value = int(self._data[name]) + amount if self._alive(name) else amount
+            self._data[name] = str(value)
+            self._touch(name)
+            return value
+
+    def incr(self, name: str, amount: int = 1) -> int:
+        return self.incrby(name, amount)
+
+    def expire(self, name: str, time: float) -> bool:
+        with self._lock:
+            if not self._alive(name):
+                return False
+            self._expires[name] = clock.monotonic() + time
+            self._touch(name)
+            return True
+
+    def mget(self, keys: List[str]) -> List[Optional[str]]:
+        with self._lock:
+            return [self.get(key) for key in keys]
+
+    def hset(self, name: str, key: Optional[str] = None, value: Any = None, mapping: Optional[Dict[str, Any]] = None) -> int:
+        with self._lock:
+            if not self._alive(name):
+                self._data[name] = {}
+            fields = self._data[name]
+            updates = dict(mapping or {})
+            if key is not None:
+                updates[key] = value
+            fields.update({k: str(v) for k, v in updates.items()})
+            self._touch(name)
+            return len(updates)
+
+    def hget(self, name: str, key: str) -> Optional[str]:
+        with self._lock:
+            return self._data[name].get(key) if self._alive(name) else None
+
+    def hgetall(self, name: str) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._data[name]) if self._alive(name) else {}
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            removed = 0
+            for name in names:
+                if self._alive(name):
+                    del self._data[name]
+                    self._expires.pop(name, None)
+                    self._touch(name)
+                    removed += 1
+            return removed
+
+    def pipeline(self) -> "_FakePipeline":
+        return _FakePipeline(self)
+
+class _FakePipeline:
+    """
+    Queues commands and runs them on execute(), like a redis pipeline. After
+    watch(), commands run immediately until multi(); execute() then raises
+    FakeWatchError if a watched key changed in the meantime.
+    """
+    def __init__(self, client: FakeRedis):
+        self._client = client
+        self._commands: List[Tuple[str, tuple, dict]] = []
+        self._watched: Dict[str, int] = {}
+        self._immediate = False
+
+    def __enter__(self) -> "_FakePipeline":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.reset()
+
+    def watch(self, *names: str):
+        with self._client._lock:
+            self._watched.update({name: self._client._revision(name) for name in names})
+        self._immediate = True
+
+    def unwatch(self):
+        self._watched = {}
+        self._immediate = False
+
+    def multi(self):
+        self._immediate = False
+
+    def reset(self):
+        self._commands = []
+        self.unwatch()
+
+    def __getattr__(self, command: str):
+        if self._immediate:
+            return getattr(self._client, command)
+
+        def queue(*args, **kwargs):
+            self._commands.append((command, args, kwargs))
+            return self
+        return queue
+
+    def execute(self) -> List[Any]:
+        with self._client._lock:
+            if any(self._client._revision(name) != revision for name, revision in self._watched.items()):
+                self.reset()
+                raise FakeWatchError("Watched key changed")
+            results = [getattr(self._client, command)(*args, **kwargs) for command, args, kwargs in self._commands]
+        self.reset()
+        return results
+
+class SharedTimeWindow:
+    def __init__(self, backend: BreakerStateBackend, name: str, size: int = 60):
+        """
+        TimeBasedSlidingWindow counterpart whose buckets live in a shared backend.
+
+        Buckets are keyed by wall-clock second, since monotonic clocks differ
+        between processes, so the `now` arguments are ignored.
+        """
+        self.backend = backend
+        self.name = name
+        self.size = max(1, size)
+
+    def record(self, failed: bool, slow: bool, now: float):
+        try:
+            self.backend.record_outcome(self.name, failed, slow, clock.time(), self.size)
+        except Exception as e:
+            logger.warning(f"Shared window for {self.name} unavailable: {e}")
+
+    def snapshot(self, now: float) -> WindowSnapshot:
+        try:
+            return self.backend.window_snapshot(self.name, clock.time(), self.size)
+        except Exception as e:
+            # An empty window never trips the circuit; failures are still seen by the other workers
+            logger.warning(f"Shared window for {self.name} unavailable: {e}")
+            return WindowSnapshot()
+
+    def reset(self):
+        try:
+            self.backend.reset_window(self.name)
+        except Exception as e:
+            logger.warning(f"Shared window for {self.name} unavailable: {e}")
+
+def create_state_backend(config: Optional[Dict[str, Any]]) -> Optional[BreakerStateBackend]:
+    """
+    Build the backend described by the `shared_state` config section:
+    {"type": "local" | "mmap" | "redis" | "fake_redis", ...options}.
+    """
+    if not config or not config.get("enabled", True):
+        return None
+    options = {k: v for k, v in config.items() if k not in ("type", "enabled", "sync_interval")}
+    backend_type = config.get("type", "local")
+    if backend_type == "local":
+        return LocalStateBackend()
+    if backend_type == "mmap":
+        return MmapStateBackend(**options)
+    if backend_type == "fake_redis":
+        return RedisStateBackend(FakeRedis(), **options)
+    if backend_type == "redis":
+        if redis is None:
+            raise RuntimeError("The redis shared_state backend needs the redis package (pip install redis)")
+        url = options.pop("url", "redis://localhost:6379/0")
+        return RedisStateBackend(redis.Redis.from_url(url), **options)
+    raise ValueError(f"Unknown shared_state type: {backend_type}")
@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class WindowSnapshot:
+    """Aggregated call outcomes currently inside a sliding window."""
+    total_calls: int = 0
+    failed_calls: int = 0
+    slow_calls: int = 0
+
+    @property
+    def failure_rate(self) -> float:
+        return 100.0 * self.failed_calls / self.total_calls if self.total_calls else 0.0
+
+    @property
+    def slow_call_rate(self) -> float:
+        return 100.0 * self.slow_calls / self.total_calls if self.total_calls else 0.0
+
+# Outcome codes stored in the count-based ring buffer
+_EMPTY = -1
+_FAILED = 1
+_SLOW = 2
+
+class CountBasedSlidingWindow:
+    def __init__(self, size: int = 100):
+        """
+        Aggregate the outcomes of the last `size` calls.
+
+        Outcomes live in a fixed ring buffer and the totals are updated
+        incrementally, so recording is O(1) and memory never grows.
+        """
+        self.size = max(1, size)
+        self._ring = [_EMPTY] * self.size
+        self._index = 0
+        self._totals = WindowSnapshot()
+
+    def record(self, failed: bool, slow: bool, now: float):
+        outcome = (_FAILED if failed else 0) | (_SLOW if slow else 0)
+        evicted = self._ring[self._index]
+        if evicted != _EMPTY:
+            self._totals.total_calls -= 1
+            self._totals.failed_calls -= evicted & _FAILED
+            self._totals.slow_calls -= (evicted & _SLOW) >> 1
+
+        self._ring[self._index] = outcome
+        self._index = (self._index + 1) % self.size
+        self._totals.total_calls += 1
+        self._totals.failed_calls += outcome & _FAILED
+        self._totals.slow_calls += (outcome & _SLOW) >> 1
+
+    def snapshot(self, now: float) -> WindowSnapshot:
+        return WindowSnapshot(self._totals.total_calls, self._totals.failed_calls, self._totals.slow_calls)
+
+    def reset(self):
+        self._ring = [_EMPTY] * self.size
+        self._index = 0
+        self._totals = WindowSnapshot()
+
+class TimeBasedSlidingWindow:
+    def __init__(self, size: int = 60):
+        """
+        Aggregate the outcomes of calls made in the last `size` seconds.
+
+        One bucket per second is kept in a fixed ring; buckets are cleared as
+        the clock moves past them, so memory is O(size) regardless of the
+        call rate.
+        """
+        self.size = max(1, size)
+        self._calls = [0] * self.size
+        self._failures = [0] * self.size
+        self._slow = [0] * self.size
+        self._last_epoch: Optional[int] = None
+        self._totals = WindowSnapshot()
+
+    def _advance(self, now: float) -> int:
+        epoch = int(now)
+        if self._last_epoch is None:
+            self._last_epoch = epoch
+        elif epoch > self._last_epoch:
+            # Clear every bucket the clock skipped over, at most one full lap
+            for skipped in range(max(self._last_epoch + 1, epoch - self.size + 1), epoch + 1):
+                self._evict(skipped % self.size)
+            self._last_epoch = epoch
+        return self._last_epoch % self.size
+
+    def _evict(self, index: int):
+        self._totals.total_calls -= self._calls[index]
+        self._totals.failed_calls -= self._failures[index]
+        self._totals.slow_calls -= self._slow[index]
+        self._calls[index] = self._failures[index] = self._slow[index] = 0
+
+    def record(self, failed: bool, slow: bool, now: float):
+        index = self._advance(now)
+        self._calls[index] += 1
+        self._totals.total_calls += 1
+        if failed:
+            self._failures[index] += 1
+            self._totals.failed_calls += 1
+        if slow:
+            self._slow[index] += 1
+            self._totals.slow_calls += 1
+
+    def snapshot(self, now: float) -> WindowSnapshot:
+        self._advance(now)
+        return WindowSnapshot(self._totals.total_calls, self._totals.failed_calls, self._totals.slow_calls)
+
+    def reset(self):
+        self._calls = [0] * self.size
+        self._failures = [0] * self.size
+        self._slow = [0] * self.size
+        self._last_epoch = None
+        self._totals = WindowSnapshot()
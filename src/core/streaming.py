@@ -0,0 +1,113 @@
+import contextvars
+import queue
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+# A sentence ends at ., ! or ? (optionally followed by closing quotes/brackets) and whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?])([\"')\]]*)\s+")
+
+class SentenceChunker:
+    def __init__(self, min_chars: int = 20, max_chars: int = 250):
+        """
+        Turn a stream of LLM tokens into sentence-sized TTS chunks.
+
+        Args:
+            min_chars: Shorter sentences are merged with the next one, so TTS
+                is not called for fragments like "Hi.".
+            max_chars: A sentence growing past this is cut at the last space,
+                so a run-on sentence does not hold back the first audio.
+        """
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def feed(self, token: str) -> List[str]:
+        """Add a token; returns the chunks it completed (often none)."""
+        self._buffer += token
+        chunks = []
+        while True:
+            chunk = self._next_chunk()
+            if chunk is None:
+                return chunks
+            chunks.append(chunk)
+
+    def _next_chunk(self) -> Optional[str]:
+        for match in _SENTENCE_END.finditer(self._buffer):
+            if match.start() >= self.min_chars:
+                # The closing quotes or brackets belong to the sentence
+                chunk = self._buffer[:match.end(1)].strip()
+                self._buffer = self._buffer[match.end():]
+                return chunk
+        if len(self._buffer) > self.max_chars:
+            cut = self._buffer.rfind(" ", 0, self.max_chars)
+            if cut <= 0:
+                cut = self.max_chars
+            chunk = self._buffer[:cut].strip()
+            self._buffer = self._buffer[cut:].lstrip()
+            return chunk
+        return None
+
+    def flush(self) -> Optional[str]:
+        """Return whatever is left once the token stream has ended."""
+        chunk = self._buffer.strip()
+        self._buffer = ""
+        return chunk or None
+
+def chunk_sentences(tokens: Iterable[str], min_chars: int = 20, max_chars: int = 250) -> Iterator[str]:
+    """Yield sentence chunks from a token stream as soon as each one is complete."""
+    chunker = SentenceChunker(min_chars, max_chars)
+    for token in tokens:
+        yield from chunker.feed(token)
+    tail = chunker.flush()
+    if tail:
+        yield tail
+
+_DONE = object()
+
+def stream_speech(
+    chunks: Iterable[str],
+    synthesize: Callable[[str], Any],
+    max_parallel: int = 2
+) -> Iterator[Any]:
+    """
+    Synthesize text chunks in the background and yield the audio in order.
+
+    The chunk stream (usually LLM tokens run through chunk_sentences) is read
+    on its own thread, so token generation keeps going while earlier
+    sentences are being synthesized. Up to max_parallel chunks are
+    synthesized at once. Each chunk is a separate synthesize() call, so
+    retries and the circuit breaker apply per chunk. The first failed chunk
+    raises from the iterator.
+    """
+    pending: "queue.Queue" = queue.Queue()
+    executor = ThreadPoolExecutor(max_workers=max(1, max_parallel), thread_name_prefix="tts-stream")
+    stop = threading.Event()
+    # Workers must see the caller's context, e.g. the call deadline
+    context = contextvars.copy_context()
+
+    def produce():
+        try:
+            for chunk in chunks:
+                if stop.is_set():
+                    break
+                pending.put(executor.submit(context.copy().run, synthesize, chunk))
+        except BaseException as e:
+            failed: Future = Future()
+            failed.set_exception(e)
+            pending.put(failed)
+        finally:
+            pending.put(_DONE)
+
+    producer = threading.Thread(target=context.copy().run, args=(produce,), name="tts-stream-reader", daemon=True)
+    producer.start()
+    try:
+        while True:
+            future = pending.get()
+            if future is _DONE:
+                return
+            yield future.result()
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
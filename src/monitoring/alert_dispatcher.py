@@ -0,0 +1,181 @@
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+from src.core.resilience.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError
+from src.core.resilience.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class _AlertWindow:
+    """Dedup state for one (title, service) key."""
+    opened_at: float
+    severity: str
+    message: str
+    suppressed: int = 0
+
+class AlertDispatcher:
+    def __init__(
+        self,
+        channels: Dict[str, Callable[[str, str], None]],
+        dedup_window: float = 60.0,
+        rate_limit: float = 1.0,
+        burst: int = 10,
+        queue_size: int = 1000,
+        channel_breaker: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Deliver alerts on background threads, one worker queue per channel.
+
+        The first alert for a (title, service) key goes out immediately;
+        repeats within dedup_window seconds are only counted and then sent as
+        one summary ("Call Blocked ×1,243 in last 60s") when the window closes.
+        Each channel has its own token-bucket rate limit and circuit breaker,
+        so a dead channel is skipped instead of slowing the others.
+
+        Args:
+            channels: Channel name -> sender(title, message).
+            dedup_window: Seconds during which repeats of an alert are coalesced.
+            rate_limit: Alerts per second allowed per channel.
+            burst: Alerts a channel may send back to back.
+            queue_size: Pending alerts per channel before new ones are dropped.
+            channel_breaker: CircuitBreaker options for each channel.
+        """
+        self.channels = channels
+        self.dedup_window = dedup_window
+        self._windows: Dict[Tuple[str, Optional[str]], _AlertWindow] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+        breaker_config = {"failure_threshold": 3, "recovery_timeout": 60.0}
+        breaker_config.update(channel_breaker or {})
+        self._queues = {name: queue.Queue(maxsize=queue_size) for name in channels}
+        self._limits = {name: TokenBucket(rate_limit, burst) for name in channels}
+        self._breakers = {
+            name: CircuitBreaker(service_name=f"alerts:{name}", **breaker_config)
+            for name in channels
+        }
+        self._threads = []
+
+        # Counters
+        self.received = 0
+        self.coalesced = 0
+        self.sent = {name: 0 for name in channels}
+        self.dropped = {name: 0 for name in channels}
+        self.failed = {name: 0 for name in channels}
+
+    def start(self):
+        # Locked so concurrent first dispatches start one set of workers
+        with self._lock:
+            if self._threads:
+                return
+            self._stop_event.clear()
+            for name in self.channels:
+                thread = threading.Thread(target=self._run_channel, args=(name,), name=f"alerts-{name}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            flusher = threading.Thread(target=self._run_flusher, name="alerts-coalescer", daemon=True)
+            flusher.start()
+            self._threads.append(flusher)
+
+    def dispatch(self, title: str, message: str, severity: str = "CRITICAL", service_name: Optional[str] = None):
+        """Queue an alert for delivery. Cheap and non-blocking for the caller."""
+        if not self._threads:
+            self.start()
+
+        key = (title, service_name)
+        now = time.monotonic()
+        with self._lock:
+            self.received += 1
+            window = self._windows.get(key)
+            if window is not None and now - window.opened_at < self.dedup_window:
+                window.suppressed += 1
+                window.message = message
+                self.coalesced += 1
+                return
+            self._windows[key] = _AlertWindow(opened_at=now, severity=severity, message=message)
+
+        self._fan_out(title, message, severity)
+
+    def _fan_out(self, title: str, message: str, severity: str):
+        logger.error(f"ALERT [{severity}]: {title} - {message}")
+        for name, channel_queue in self._queues.items():
+            try:
+                channel_queue.put_nowait((title, message))
+            except queue.Full:
+                self.dropped[name] += 1
+
+    def _run_flusher(self):
+        while not self._stop_event.wait(min(1.0, self.dedup_window)):
+            self._flush_windows()
+        self._flush_windows(force=True)
+
+    def _flush_windows(self, force: bool = False):
+        now = time.monotonic()
+        summaries = []
+        with self._lock:
+            for key, window in list(self._windows.items()):
+                if force or now - window.opened_at >= self.dedup_window:
+                    del self._windows[key]
+                    if window.suppressed:
+                        summaries.append((key, window))
+
+        for (title, service_name), window in summaries:
+            summary_title = f"{title} ×{window.suppressed:,} in last {self.dedup_window:.0f}s"
+            scope = f" [{service_name}]" if service_name else ""
+            self._fan_out(summary_title, f"Latest{scope}: {window.message}", window.severity)
+
+    def _run_channel(self, name: str):
+        channel_queue = self._queues[name]
+        while True:
+            try:
+                title, message = channel_queue.get(timeout=0.5)
+            except queue.Empty:
+                if self._stop_event.is_set():
+                    return
+                continue
+
+            wait = self._limits[name].time_until_available()
+            if wait > 0:
+                time.sleep(wait)
+            self._limits[name].try_acquire()
+
+            try:
+                self._breakers[name].call(self.channels[name], title, message)
+                self.sent[name] += 1
+            except CircuitBreakerOpenError:
+                self.dropped[name] += 1
+            except Exception as e:
+                self.failed[name] += 1
+                logger.warning(f"Alert channel {name} failed: {e}")
+            finally:
+                channel_queue.task_done()
+
+    def flush(self, timeout: float = 5.0):
+        """Deliver pending coalesced summaries and wait for the channel queues to drain."""
+        self._flush_windows(force=True)
+        deadline = time.monotonic() + timeout
+        for channel_queue in self._queues.values():
+            while channel_queue.unfinished_tasks and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+    def stop(self, timeout: float = 5.0):
+        self.flush(timeout)
+        self._stop_event.set()
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "received": self.received,
+            "coalesced": self.coalesced,
+            "sent": dict(self.sent),
+            "dropped": dict(self.dropped),
+            "failed": dict(self.failed),
+            "channel_circuits": {name: cb.state.value for name, cb in self._breakers.items()}
+        }
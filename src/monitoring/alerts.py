@@ -1,18 +1,40 @@
 import logging
 from typing import Dict, Any, Optional
+from src.monitoring.alert_dispatcher import AlertDispatcher
+from src.monitoring.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
 class AlertSystem:
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
+        self.dispatcher: Optional[AlertDispatcher] = None
+        self.configure(self.config)
 
-    def send_alert(self, title: str, message: str, severity: str = "CRITICAL"):
-        logger.error(f"ALERT [{severity}]: {title} - {message}")
-        
-        self._send_email(title, message)
-        self._send_telegram(title, message)
-        self._send_webhook(title, message)
+    def configure(self, config: Dict[str, Any]):
+        """(Re)create the background dispatcher from the `alerts` section of config.json."""
+        if self.dispatcher is not None:
+            self.dispatcher.stop()
+        self.config = config
+        self.dispatcher = AlertDispatcher(
+            channels={
+                "email": self._send_email,
+                "telegram": self._send_telegram,
+                "webhook": self._send_webhook
+            },
+            **config
+        )
+
+    def send_alert(self, title: str, message: str, severity: str = "CRITICAL", service_name: Optional[str] = None):
+        # Delivery, deduplication and rate limiting happen on the dispatcher's threads
+        with tracer.span("alert", title=title, severity=severity):
+            self.dispatcher.dispatch(title, message, severity=severity, service_name=service_name)
+
+    def flush(self, timeout: float = 5.0):
+        self.dispatcher.flush(timeout)
+
+    def shutdown(self):
+        self.dispatcher.stop()
 
     def _send_email(self, title, message):
         # Mock Email Alert
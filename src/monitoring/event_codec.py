@@ -0,0 +1,271 @@
+import datetime
+import gzip
+import json
+import os
+import struct
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+# Written once at the start of every binary log file or segment
+MAGIC = b"AEVT\x01"
+
+# Record kinds
+_STRING = 1
+_EVENT = 2
+
+# Value tags
+_INT, _FLOAT, _CODE, _TEXT, _TRUE, _FALSE, _NONE, _JSON = b"ifsStFNJ"
+
+_LENGTH = struct.Struct("<I")
+_STRING_HEADER = struct.Struct("<BH")
+_EVENT_HEADER = struct.Struct("<BqHHH")
+_KEY = struct.Struct("<HB")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_U16 = struct.Struct("<H")
+
+# Strings longer than this (error messages, ids) are stored inline instead of interned
+MAX_INTERNED_LENGTH = 32
+# Short values stop being interned past this many strings, keeping codes free for names
+MAX_INTERNED_VALUES = 60000
+
+def to_epoch_micros(timestamp: Any) -> int:
+    """ISO-8601 string (as written by StructuredLogger) or epoch seconds, as integer epoch microseconds."""
+    if isinstance(timestamp, str):
+        timestamp = datetime.datetime.fromisoformat(timestamp).timestamp()
+    return round(timestamp * 1_000_000)
+
+def from_epoch_micros(micros: int) -> str:
+    """Inverse of to_epoch_micros, as a local-time ISO-8601 string."""
+    seconds, rest = divmod(micros, 1_000_000)
+    return (datetime.datetime.fromtimestamp(seconds) + datetime.timedelta(microseconds=rest)).isoformat()
+
+class EventEncoder:
+    def __init__(self, codes: Optional[Dict[str, int]] = None):
+        """
+        Encode structured log events as length-prefixed binary records.
+
+        Service names, event types, field names and short string values are
+        interned: the first use writes a string record assigning a code, and
+        events refer to it by that 2-byte code. Timestamps become integer
+        epoch microseconds. Every file carries its own string table, so
+        segments can be read on their own.
+
+        Args:
+            codes: String table of a file being appended to (see scan_file).
+        """
+        self.codes: Dict[str, int] = dict(codes or {})
+
+    def _intern(self, text: str, out: List[bytes]) -> int:
+        code = self.codes.get(text)
+        if code is None:
+            code = len(self.codes)
+            self.codes[text] = code
+            payload = _STRING_HEADER.pack(_STRING, code) + text.encode("utf-8")
+            out.append(_LENGTH.pack(len(payload)) + payload)
+        return code
+
+    def _internable(self, text: str) -> bool:
+        return len(text) <= MAX_INTERNED_LENGTH and (text in self.codes or len(self.codes) < MAX_INTERNED_VALUES)
+
+    def encode(self, entry: Dict[str, Any]) -> bytes:
+        out: List[bytes] = []
+        service = self._intern(str(entry.get("service_name")), out)
+        event_type = self._intern(str(entry.get("event_type")), out)
+        fields = [(k, v) for k, v in entry.items() if k not in ("timestamp", "service_name", "event_type")]
+        parts = [_EVENT_HEADER.pack(_EVENT, to_epoch_micros(entry["timestamp"]), service, event_type, len(fields))]
+        for key, value in fields:
+            key_code = self._intern(key, out) if self._internable(key) else None
+            if key_code is None:
+                # Field names are few in practice; fold an unusual one into a JSON value
+                key_code, value = self._intern("_extra", out), {key: value}
+            if value is None:
+                parts.append(_KEY.pack(key_code, _NONE))
+            elif isinstance(value, bool):
+                parts.append(_KEY.pack(key_code, _TRUE if value else _FALSE))
+            elif isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+                parts.append(_KEY.pack(key_code, _INT) + _I64.pack(value))
+            elif isinstance(value, float):
+                parts.append(_KEY.pack(key_code, _FLOAT) + _F64.pack(value))
+            elif isinstance(value, str) and self._internable(value):
+                parts.append(_KEY.pack(key_code, _CODE) + _U16.pack(self._intern(value, out)))
+            elif isinstance(value, str):
+                data = value.encode("utf-8")
+                parts.append(_KEY.pack(key_code, _TEXT) + _LENGTH.pack(len(data)) + data)
+            else:
+                data = json.dumps(value, default=str).encode("utf-8")
+                parts.append(_KEY.pack(key_code, _JSON) + _LENGTH.pack(len(data)) + data)
+        payload = b"".join(parts)
+        out.append(_LENGTH.pack(len(payload)) + payload)
+        return b"".join(out)
+
+    def encode_batch(self, entries: List[Dict[str, Any]]) -> bytes:
+        return b"".join(self.encode(entry) for entry in entries)
+
+class EventDecoder:
+    def __init__(self):
+        """Decode records written by EventEncoder, keeping the file's string table as it goes."""
+        self.strings: List[str] = []
+
+    def decode(self, payload: bytes) -> Optional[Tuple[int, str, str, Dict[str, Any]]]:
+        """
+        Decode one record body. Returns (epoch_micros, service_name,
+        event_type, fields) for an event, or None for a string record.
+        """
+        if payload[0] == _STRING:
+            _, code = _STRING_HEADER.unpack_from(payload)
+            text = payload[_STRING_HEADER.size:].decode("utf-8")
+            if code == len(self.strings):
+                self.strings.append(text)
+            else:
+                self.strings.extend([""] * (code + 1 - len(self.strings)))
+                self.strings[code] = text
+            return None
+
+        strings = self.strings
+        _, micros, service, event_type, count = _EVENT_HEADER.unpack_from(payload)
+        position = _EVENT_HEADER.size
+        fields: Dict[str, Any] = {}
+        for _ in range(count):
+            key_code, tag = _KEY.unpack_from(payload, position)
+            position += _KEY.size
+            if tag == _INT:
+                value = _I64.unpack_from(payload, position)[0]
+                position += 8
+            elif tag == _FLOAT:
+                value = _F64.unpack_from(payload, position)[0]
+                position += 8
+            elif tag == _CODE:
+                value = strings[_U16.unpack_from(payload, position)[0]]
+                position += 2
+            elif tag == _TEXT or tag == _JSON:
+                length = _LENGTH.unpack_from(payload, position)[0]
+                position += 4
+                data = payload[position:position + length]
+                position += length
+                value = data.decode("utf-8") if tag == _TEXT else json.loads(data)
+            else:
+                value = True if tag == _TRUE else False if tag == _FALSE else None
+            key = strings[key_code]
+            if key == "_extra" and isinstance(value, dict):
+                fields.update(value)
+            else:
+                fields[key] = value
+        return micros, strings[service], strings[event_type], fields
+
+def _read_header(f: BinaryIO) -> bool:
+    """Check the file header. False for a file too short to have one yet."""
+    header = f.read(len(MAGIC))
+    if len(header) < len(MAGIC):
+        return False
+    if header != MAGIC:
+        raise ValueError("Not a binary event log (bad magic)")
+    return True
+
+def _read_records(f: BinaryIO, decoder: EventDecoder, position: int) -> Iterator[Tuple[int, Optional[tuple]]]:
+    """Yield (end offset, decoded record) for every complete record from position on."""
+    while True:
+        prefix = f.read(4)
+        if len(prefix) < 4:
+            return
+        length = _LENGTH.unpack(prefix)[0]
+        payload = f.read(length)
+        if len(payload) < length:
+            # A record cut off by a crash mid-write
+            return
+        position += 4 + length
+        yield position, decoder.decode(payload)
+
+def open_segment(path: str) -> BinaryIO:
+    """Open an active file or a rotated segment (.gz/.zst) for reading."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("Reading .zst segments needs the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+def is_binary_log(path: str) -> bool:
+    try:
+        with open_segment(path) as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except (FileNotFoundError, OSError):
+        return False
+
+def iter_raw_events(path: str) -> Iterator[Tuple[int, str, str, Dict[str, Any]]]:
+    """(epoch_micros, service_name, event_type, fields) for each event, skipping timestamp formatting."""
+    with open_segment(path) as f:
+        if not _read_header(f):
+            return
+        for _, record in _read_records(f, EventDecoder(), len(MAGIC)):
+            if record is not None:
+                yield record
+
+def iter_events(path: str) -> Iterator[Dict[str, Any]]:
+    """Events of a binary log, in the same shape as the JSONL records."""
+    for micros, service, event_type, fields in iter_raw_events(path):
+        yield {"timestamp": from_epoch_micros(micros), "service_name": service, "event_type": event_type, **fields}
+
+def scan_file(path: str) -> Tuple[Dict[str, int], int]:
+    """
+    String table and end offset of the last complete record of an active
+    binary log, so a writer can truncate a torn record and resume appending.
+    Returns ({}, 0) for a missing or empty file.
+    """
+    decoder = EventDecoder()
+    end = 0
+    try:
+        with open(path, "rb") as f:
+            if not _read_header(f):
+                return {}, 0
+            end = len(MAGIC)
+            for end, _ in _read_records(f, decoder, end):
+                pass
+    except FileNotFoundError:
+        return {}, 0
+    return {text: code for code, text in enumerate(decoder.strings)}, end
+
+class EventTailer:
+    def __init__(self, path: str):
+        """
+        Incrementally read events appended to a binary log, like LogTailer
+        does for JSONL. A rotated or truncated file is read from the start.
+        """
+        self.path = path
+        self.offset = 0
+        self._decoder = EventDecoder()
+        self._inode: Optional[int] = None
+
+    def read_new(self) -> List[Dict[str, Any]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        if (self._inode is not None and stat.st_ino != self._inode) or stat.st_size < self.offset:
+            self.offset = 0
+            self._decoder = EventDecoder()
+        self._inode = stat.st_ino
+        if stat.st_size == self.offset:
+            return []
+
+        events = []
+        with open(self.path, "rb") as f:
+            if self.offset == 0:
+                if not _read_header(f):
+                    return []
+                self.offset = len(MAGIC)
+            f.seek(self.offset)
+            for end, record in _read_records(f, self._decoder, self.offset):
+                self.offset = end
+                if record is not None:
+                    micros, service, event_type, fields = record
+                    events.append({
+                        "timestamp": from_epoch_micros(micros), "service_name": service,
+                        "event_type": event_type, **fields
+                    })
+        return events
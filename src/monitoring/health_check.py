@@ -1,25 +1,100 @@
 import threading
-import time
 import logging
-from typing import Dict, List, Callable, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Callable, Optional
+from src.core import clock
+from src.core.resilience.circuit_breaker import CircuitBreaker, CircuitState
 
 logger = logging.getLogger(__name__)
 
+@dataclass
+class _ProbeState:
+    """Scheduling and result bookkeeping for one registered health check."""
+    func: Callable[[], bool]
+    interval: float
+    timeout: float
+    current_interval: float
+    next_run: float = 0.0
+    consecutive_failures: int = 0
+    last_latency: Optional[float] = None
+    last_checked: Optional[float] = None
+    timed_out: bool = False
+    future: Optional[Future] = None
+    started_at: float = 0.0
+    circuit_breaker: Optional[CircuitBreaker] = None
+
+class HealthProbeError(Exception):
+    """Raised by a synthetic probe when the health check reports unhealthy."""
+    pass
+
 class HealthCheckManager:
-    def __init__(self, check_interval: float = 10.0):
+    def __init__(
+        self,
+        check_interval: float = 10.0,
+        timeout: float = 5.0,
+        backoff_factor: float = 2.0,
+        max_interval: float = 60.0,
+        max_workers: int = 8,
+        open_after_failures: int = 1
+    ):
+        """
+        Run registered health checks concurrently on a small thread pool.
+
+        Args:
+            check_interval: Default seconds between probes of a healthy service.
+            timeout: Default seconds before a probe counts as failed.
+            backoff_factor: Multiplier applied to a service's interval after each
+                failed probe; the interval resets once the service recovers.
+            max_interval: Upper bound for the backed-off interval.
+            max_workers: Probes that may run at the same time.
+            open_after_failures: Consecutive failed probes after which a linked
+                circuit breaker is opened pre-emptively.
+        """
         self.check_interval = check_interval
+        self.timeout = timeout
+        self.backoff_factor = backoff_factor
+        self.max_interval = max_interval
+        self.max_workers = max_workers
+        self.open_after_failures = max(1, open_after_failures)
         self.services: Dict[str, Callable[[], bool]] = {}
         self.health_status: Dict[str, bool] = {}
+        self._probes: Dict[str, _ProbeState] = {}
+        # Re-entrant: a probe that finishes instantly runs its done-callback inside _submit
+        self._lock = threading.RLock()
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
 
-    def register_service(self, name: str, health_func: Callable[[], bool]):
+    def register_service(
+        self,
+        name: str,
+        health_func: Callable[[], bool],
+        interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        Register a health check. When a circuit_breaker is given, probe results
+        drive it: failed probes open it pre-emptively and a healthy probe
+        recovers it through synthetic calls instead of live traffic.
+        """
+        interval = interval or self.check_interval
         self.services[name] = health_func
         self.health_status[name] = True
+        self._probes[name] = _ProbeState(
+            func=health_func,
+            interval=interval,
+            timeout=timeout or self.timeout,
+            current_interval=interval,
+            circuit_breaker=circuit_breaker
+        )
         logger.info(f"Registered health check for {name}")
 
     def start(self):
         if self._thread is None:
+            self._stop_event.clear()
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="health-probe")
             self._thread = threading.Thread(target=self._run_checks, daemon=True)
             self._thread.start()
             logger.info("Health check monitoring started.")
@@ -28,21 +103,154 @@ class HealthCheckManager:
         self._stop_event.set()
         if self._thread:
             self._thread.join()
+            self._thread = None
+        if self._executor:
+            # A hung probe must not block shutdown
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
     def _run_checks(self):
         while not self._stop_event.is_set():
-            for name, check_func in self.services.items():
-                try:
-                    is_healthy = check_func()
-                    if is_healthy != self.health_status[name]:
-                        state = "HEALTHY" if is_healthy else "UNHEALTHY"
-                        logger.warning(f"Health status changed for {name}: {state}")
-                        self.health_status[name] = is_healthy
-                except Exception as e:
-                    logger.error(f"Health check failed for {name}: {e}")
-                    self.health_status[name] = False
-            
-            time.sleep(self.check_interval)
+            now = clock.monotonic()
+            with self._lock:
+                for name, probe in self._probes.items():
+                    if probe.future is not None:
+                        self._check_timeout(name, probe, now)
+                    elif now >= probe.next_run:
+                        self._submit(name, probe, now)
+                wake_at = min(
+                    [p.started_at + p.timeout if p.future else p.next_run for p in self._probes.values()],
+                    default=now + self.check_interval
+                )
+
+            self._stop_event.wait(max(0.01, min(wake_at - clock.monotonic(), self.check_interval)))
+
+    def run_due_checks(self):
+        """
+        Run every probe that is due, inline on the calling thread.
+
+        For simulations on a VirtualClock, where the background thread's
+        real-time waits would not line up with simulated time.
+        """
+        now = clock.monotonic()
+        with self._lock:
+            due = [(name, probe) for name, probe in self._probes.items() if probe.future is None and now >= probe.next_run]
+            for _, probe in due:
+                probe.started_at = now
+                probe.timed_out = False
+                probe.future = Future()
+        for name, probe in due:
+            future = probe.future
+            try:
+                future.set_result(probe.func())
+            except Exception as e:
+                future.set_exception(e)
+            self._on_probe_done(name, future)
+
+    def _submit(self, name: str, probe: _ProbeState, now: float):
+        probe.started_at = now
+        probe.timed_out = False
+        probe.future = self._executor.submit(probe.func)
+        probe.future.add_done_callback(lambda future, name=name: self._on_probe_done(name, future))
+
+    def _check_timeout(self, name: str, probe: _ProbeState, now: float):
+        if probe.timed_out or now - probe.started_at < probe.timeout:
+            return
+        # The probe thread is still stuck; it stays in flight (so it is not
+        # resubmitted) but the service is reported as failing right away.
+        probe.timed_out = True
+        logger.error(f"Health check for {name} timed out after {probe.timeout:.1f}s")
+        self._record_result(name, probe, False, probe.timeout)
+        if probe.circuit_breaker is not None and probe.consecutive_failures >= self.open_after_failures:
+            probe.circuit_breaker.force_open()
+
+    def _on_probe_done(self, name: str, future: Future):
+        latency = clock.monotonic() - self._probes[name].started_at
+        try:
+            is_healthy = bool(future.result())
+        except Exception as e:
+            logger.error(f"Health check failed for {name}: {e}")
+            is_healthy = False
+
+        with self._lock:
+            probe = self._probes[name]
+            probe.future = None
+            if probe.timed_out:
+                # Result already recorded as a timeout; only keep the real latency
+                probe.last_latency = latency
+                return
+            self._record_result(name, probe, is_healthy, latency)
+
+        if probe.circuit_breaker is None:
+            return
+        # Recovery makes further probe calls, and this callback may be running
+        # inside _submit with the lock held: hand it to the probe pool
+        executor = self._executor
+        if executor is None:
+            self._drive_circuit_breaker(name, probe, is_healthy)
+            return
+        try:
+            executor.submit(self._drive_circuit_breaker, name, probe, is_healthy)
+        except RuntimeError:
+            # Monitoring was stopped while this probe was in flight
+            pass
+
+    def _drive_circuit_breaker(self, name: str, probe: _ProbeState, is_healthy: bool):
+        breaker = probe.circuit_breaker
+        if breaker is None:
+            return
+        if not is_healthy:
+            if probe.consecutive_failures >= self.open_after_failures and breaker.state is CircuitState.CLOSED:
+                logger.warning(f"Health check failing for {name}; opening circuit pre-emptively")
+                breaker.force_open()
+        elif breaker.state is not CircuitState.CLOSED:
+            logger.info(f"Health check passing for {name}; probing circuit recovery")
+
+            def synthetic_probe():
+                if not probe.func():
+                    raise HealthProbeError(f"Synthetic probe for {name} reported unhealthy")
+
+            breaker.try_recover(synthetic_probe)
+
+    def _record_result(self, name: str, probe: _ProbeState, is_healthy: bool, latency: float):
+        """Apply one probe outcome; must be called with the lock held."""
+        probe.last_latency = latency
+        probe.last_checked = clock.time()
+
+        if is_healthy:
+            probe.consecutive_failures = 0
+            probe.current_interval = probe.interval
+        else:
+            probe.consecutive_failures += 1
+            if probe.consecutive_failures > 1:
+                probe.current_interval = min(probe.current_interval * self.backoff_factor, self.max_interval)
+        probe.next_run = probe.started_at + probe.current_interval
+
+        if is_healthy != self.health_status[name]:
+            state = "HEALTHY" if is_healthy else "UNHEALTHY"
+            logger.warning(f"Health status changed for {name}: {state}")
+            self.health_status[name] = is_healthy
 
     def is_service_healthy(self, name: str) -> bool:
         return self.health_status.get(name, False)
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-service probe details. `stale` means no probe has finished for
+        longer than expected, which is different from the service being unhealthy.
+        """
+        now = clock.time()
+        status = {}
+        with self._lock:
+            for name, probe in self._probes.items():
+                expected = probe.current_interval + probe.timeout
+                status[name] = {
+                    "healthy": self.health_status[name],
+                    "latency": probe.last_latency,
+                    "last_checked": probe.last_checked,
+                    "consecutive_failures": probe.consecutive_failures,
+                    "interval": probe.current_interval,
+                    "timed_out": probe.timed_out,
+                    "stale": probe.last_checked is None or now - probe.last_checked > 2 * expected
+                }
+        return status
@@ -0,0 +1,156 @@
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from src.monitoring.event_codec import EventTailer, is_binary_log
+from src.monitoring.log_columns import EventColumns, iter_log_events, log_paths
+from src.monitoring.log_reader import LogTailer
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+MICROS_PER_MINUTE = 60_000_000
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("Columnar log analysis needs numpy (pip install numpy)")
+
+def _codes(columns: EventColumns, column: str, *values: str) -> Any:
+    return np.array([columns.code(column, value) for value in values], dtype=np.int32)
+
+def _per_service(columns: EventColumns, mask: Any) -> Any:
+    """Events per service code matching mask; events without a service_name (code -1) are left out."""
+    return np.bincount(
+        columns.service_name[mask & (columns.service_name >= 0)],
+        minlength=len(columns.vocabularies["service_name"])
+    )
+
+def error_rate_by_service(columns: EventColumns) -> Dict[str, Dict[str, float]]:
+    """Finished requests, failures and failure percentage per service."""
+    _require_numpy()
+    succeeded = _per_service(columns, columns.event_type == columns.code("event_type", "REQUEST_SUCCESS"))
+    failed = _per_service(columns, columns.event_type == columns.code("event_type", "REQUEST_FAILURE"))
+    total = succeeded + failed
+    rate = np.divide(100.0 * failed, total, out=np.zeros(len(total)), where=total > 0)
+    return {
+        service: {"requests": int(total[code]), "failures": int(failed[code]), "error_rate": float(rate[code])}
+        for code, service in enumerate(columns.vocabularies["service_name"])
+        if total[code]
+    }
+
+def retries_per_minute(columns: EventColumns, service_name: Optional[str] = None) -> Tuple[Any, Any]:
+    """
+    Retries per wall-clock minute, from the attempts recorded on finished
+    requests. Returns (minute start in epoch seconds, retries), covering
+    every minute between the first and last retry.
+    """
+    _require_numpy()
+    mask = np.isin(columns.event_type, _codes(columns, "event_type", "REQUEST_SUCCESS", "REQUEST_FAILURE"))
+    if service_name is not None:
+        mask &= columns.service_name == columns.code("service_name", service_name)
+    retries = columns.fields["attempts"][mask] - 1
+    minutes = columns.timestamp[mask] // MICROS_PER_MINUTE
+    has_retries = retries > 0
+    retries, minutes = retries[has_retries], minutes[has_retries]
+    if not len(minutes):
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+    first = minutes.min()
+    counts = np.bincount(minutes - first, weights=retries).astype(np.int64)
+    return (first + np.arange(len(counts))) * 60, counts
+
+def circuit_open_durations(columns: EventColumns) -> Dict[str, Any]:
+    """
+    Seconds each circuit stayed OPEN, per service, as seen by the circuit
+    state logged with its events. A period runs from the first event logged
+    while OPEN to the first later event logged in another state; one still
+    open at the end of the log ends at the last event.
+    """
+    _require_numpy()
+    open_code = columns.code("circuit_state", "OPEN")
+    states = columns.fields["circuit_state"]
+    durations = {}
+    for code, service in enumerate(columns.vocabularies["service_name"]):
+        mask = columns.service_name == code
+        timestamps = columns.timestamp[mask]
+        if not len(timestamps):
+            continue
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        is_open = (states[mask][order] == open_code).astype(np.int8)
+        edges = np.diff(is_open, prepend=0, append=0)
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        end_times = timestamps[np.minimum(ends, len(timestamps) - 1)]
+        durations[service] = (end_times - timestamps[starts]) / 1_000_000
+    return durations
+
+def _error_rates(counts: Dict[str, List[int]]) -> Dict[str, Dict[str, float]]:
+    return {
+        service: {"requests": total, "failures": failed, "error_rate": 100.0 * failed / total}
+        for service, (total, failed) in counts.items()
+        if total
+    }
+
+def _tally(counts: Dict[str, List[int]], service_name: Optional[str], event_type: Optional[str]):
+    if service_name is None or event_type not in ("REQUEST_SUCCESS", "REQUEST_FAILURE"):
+        return
+    totals = counts.setdefault(service_name, [0, 0])
+    totals[0] += 1
+    totals[1] += event_type == "REQUEST_FAILURE"
+
+class ErrorRateTracker:
+    def __init__(self, log_file: str):
+        """
+        error_rate_by_service() kept up to date without re-reading the logs.
+
+        Each archived segment is counted once, when it first appears in the
+        rotation manifest. The active file is tailed from a byte offset, so
+        update() only decodes what was appended since the last call. When
+        the active file rotates, its running counts are dropped, because
+        those events are counted again from the new segment.
+
+        Args:
+            log_file: Active JSONL or binary log (e.g. app_logger.sink.path).
+        """
+        self.log_file = log_file
+        self._segment_counts: Dict[str, Dict[str, List[int]]] = {}
+        self._active_counts: Dict[str, List[int]] = {}
+        self._tailer: Any = None
+
+    def _read_active(self):
+        try:
+            size = os.path.getsize(self.log_file)
+        except FileNotFoundError:
+            return
+        if self._tailer is None:
+            if not size:
+                # Too early to tell a binary log from JSONL
+                return
+            self._tailer = EventTailer(self.log_file) if is_binary_log(self.log_file) else LogTailer(self.log_file)
+        previous_inode, previous_offset = self._tailer._inode, self._tailer.offset
+        events = self._tailer.read_new()
+        if (previous_inode is not None and self._tailer._inode != previous_inode) or size < previous_offset:
+            # Rotated: what was counted so far now lives in a segment
+            self._active_counts = {}
+        for event in events:
+            _tally(self._active_counts, event.get("service_name"), event.get("event_type"))
+
+    def update(self) -> Dict[str, Dict[str, float]]:
+        """Read new segments and appended events; returns requests, failures and error rate per service."""
+        # Segments first: a rotation in between is then seen as missing events for one refresh, never doubled ones
+        segments = [path for path in log_paths(self.log_file) if path != self.log_file]
+        self._segment_counts = {path: self._segment_counts.get(path) for path in segments}
+        for path, counts in self._segment_counts.items():
+            if counts is None:
+                counts = self._segment_counts[path] = {}
+                for _, service_name, event_type, _ in iter_log_events(path):
+                    _tally(counts, service_name, event_type)
+        self._read_active()
+
+        totals: Dict[str, List[int]] = {}
+        for counts in [*self._segment_counts.values(), self._active_counts]:
+            for service_name, (total, failed) in counts.items():
+                service_totals = totals.setdefault(service_name, [0, 0])
+                service_totals[0] += total
+                service_totals[1] += failed
+        return _error_rates(totals)
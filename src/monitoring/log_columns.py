@@ -0,0 +1,280 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.monitoring.event_codec import is_binary_log, iter_raw_events, open_segment, to_epoch_micros
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # Optional dependency
+    pyarrow = None
+
+# Columns extracted besides timestamp, service_name and event_type: name -> "float" or "category"
+DEFAULT_FIELDS = {
+    "duration": "float",
+    "attempts": "float",
+    "circuit_state": "category",
+    "error_type": "category",
+}
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("Columnar log analysis needs numpy (pip install numpy)")
+
+@dataclass
+class EventColumns:
+    """
+    Structured log events as NumPy arrays, one per column.
+
+    timestamp holds epoch microseconds. service_name, event_type and
+    "category" fields hold int32 codes into the matching vocabulary list
+    (-1 = missing); "float" fields hold float64 with NaN for missing values.
+    """
+    timestamp: Any
+    service_name: Any
+    event_type: Any
+    fields: Dict[str, Any] = field(default_factory=dict)
+    vocabularies: Dict[str, List[str]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def code(self, column: str, value: str) -> int:
+        """Code of value in a categorical column, or -1 if it never occurs."""
+        vocabulary = self.vocabularies.get(column, [])
+        return vocabulary.index(value) if value in vocabulary else -1
+
+    def column(self, name: str) -> Any:
+        if name in ("timestamp", "service_name", "event_type"):
+            return getattr(self, name)
+        return self.fields[name]
+
+class _ColumnBuilder:
+    """Accumulates one chunk of events; vocabularies persist across chunks so codes stay stable."""
+    def __init__(self, fields: Dict[str, str]):
+        self.fields = fields
+        self.vocabularies: Dict[str, Dict[str, int]] = {
+            name: {} for name in ["service_name", "event_type", *[f for f, kind in fields.items() if kind == "category"]]
+        }
+        self._reset()
+
+    def _reset(self):
+        self.timestamps: List[int] = []
+        self.values: Dict[str, List[Any]] = {name: [] for name in ["service_name", "event_type", *self.fields]}
+
+    def _code(self, column: str, value: Any) -> int:
+        if value is None:
+            return -1
+        vocabulary = self.vocabularies[column]
+        code = vocabulary.get(value)
+        if code is None:
+            code = vocabulary[value] = len(vocabulary)
+        return code
+
+    def add(self, micros: int, service: str, event_type: str, data: Dict[str, Any]):
+        self.timestamps.append(micros)
+        self.values["service_name"].append(self._code("service_name", service))
+        self.values["event_type"].append(self._code("event_type", event_type))
+        for name, kind in self.fields.items():
+            value = data.get(name)
+            if kind == "category":
+                self.values[name].append(self._code(name, None if value is None else str(value)))
+            else:
+                self.values[name].append(value if isinstance(value, (int, float)) and not isinstance(value, bool) else float("nan"))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def build(self) -> EventColumns:
+        columns = EventColumns(
+            timestamp=np.array(self.timestamps, dtype=np.int64),
+            service_name=np.array(self.values["service_name"], dtype=np.int32),
+            event_type=np.array(self.values["event_type"], dtype=np.int32),
+            fields={
+                name: np.array(self.values[name], dtype=np.int32 if kind == "category" else np.float64)
+                for name, kind in self.fields.items()
+            },
+            vocabularies={name: list(vocabulary) for name, vocabulary in self.vocabularies.items()}
+        )
+        self._reset()
+        return columns
+
+def _iter_jsonl(path: str) -> Iterator[Tuple[int, str, str, Dict[str, Any]]]:
+    with open_segment(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                micros = to_epoch_micros(record["timestamp"])
+            except (ValueError, KeyError, TypeError):
+                # A line cut off mid-write or by rotation
+                continue
+            yield micros, record.get("service_name"), record.get("event_type"), record
+
+def iter_log_events(path: str) -> Iterator[Tuple[int, str, str, Dict[str, Any]]]:
+    """(epoch_micros, service_name, event_type, fields) from a binary or JSONL log or segment."""
+    return iter_raw_events(path) if is_binary_log(path) else _iter_jsonl(path)
+
+def iter_column_chunks(
+    paths: Iterable[str],
+    fields: Optional[Dict[str, str]] = None,
+    chunk_size: int = 65536
+) -> Iterator[EventColumns]:
+    """
+    Stream log files (oldest first, e.g. the rotation manifest's segments
+    followed by the active file) into EventColumns of up to chunk_size
+    events, so memory stays bounded however large the logs are.
+    """
+    _require_numpy()
+    builder = _ColumnBuilder(DEFAULT_FIELDS if fields is None else fields)
+    for path in paths:
+        for micros, service, event_type, data in iter_log_events(path):
+            builder.add(micros, service, event_type, data)
+            if len(builder) >= chunk_size:
+                yield builder.build()
+    if len(builder):
+        yield builder.build()
+
+def concat_columns(chunks: List[EventColumns], fields: Optional[Dict[str, str]] = None) -> EventColumns:
+    """
+    Join chunks from one iter_column_chunks run (their vocabularies only ever
+    grow). Without chunks, the result has empty arrays and vocabularies for
+    every column of fields, so analyses of an empty log still work.
+    """
+    _require_numpy()
+    if not chunks:
+        return _ColumnBuilder(DEFAULT_FIELDS if fields is None else fields).build()
+    return EventColumns(
+        timestamp=np.concatenate([chunk.timestamp for chunk in chunks]),
+        service_name=np.concatenate([chunk.service_name for chunk in chunks]),
+        event_type=np.concatenate([chunk.event_type for chunk in chunks]),
+        fields={name: np.concatenate([chunk.fields[name] for chunk in chunks]) for name in chunks[-1].fields},
+        vocabularies=chunks[-1].vocabularies
+    )
+
+def read_columns(paths: Iterable[str], fields: Optional[Dict[str, str]] = None) -> EventColumns:
+    """All events of the given logs as one EventColumns."""
+    return concat_columns(list(iter_column_chunks(paths, fields)), fields)
+
+def log_paths(log_file: str) -> List[str]:
+    """Archived segments of a log (from its rotation manifest) followed by the active file."""
+    paths = []
+    try:
+        with open(f"{log_file}.manifest.json", "r") as f:
+            segments = json.load(f).get("segments", [])
+    except (FileNotFoundError, ValueError):
+        segments = []
+    directory = os.path.dirname(log_file)
+    for segment in segments:
+        path = os.path.join(directory, segment["file"])
+        if os.path.exists(path):
+            paths.append(path)
+    if os.path.exists(log_file):
+        paths.append(log_file)
+    return paths
+
+def _to_arrow(columns: EventColumns) -> Any:
+    arrays = {"timestamp": pyarrow.array(columns.timestamp, type=pyarrow.timestamp("us", tz="UTC"))}
+    for name in ("service_name", "event_type", *columns.fields):
+        values = columns.column(name)
+        if name in columns.vocabularies:
+            indices = pyarrow.array(values, mask=values < 0)
+            arrays[name] = pyarrow.DictionaryArray.from_arrays(indices, pyarrow.array(columns.vocabularies[name], pyarrow.string()))
+        else:
+            arrays[name] = pyarrow.array(values, from_pandas=True)
+    return pyarrow.record_batch(list(arrays.values()), names=list(arrays))
+
+def convert_logs(
+    paths: Iterable[str],
+    output: str,
+    fields: Optional[Dict[str, str]] = None,
+    chunk_size: int = 65536
+) -> int:
+    """
+    Convert logs to a columnar file chosen by output's extension: ".parquet"
+    or ".arrow" (needs pyarrow, written one chunk at a time), or ".npz"
+    (NumPy, built in memory). Returns the number of events written.
+    """
+    chunks = iter_column_chunks(paths, fields, chunk_size)
+    extension = os.path.splitext(output)[1]
+    if extension == ".npz":
+        columns = concat_columns(list(chunks), fields)
+        arrays = {"timestamp": columns.timestamp, "service_name": columns.service_name, "event_type": columns.event_type}
+        arrays.update({f"field_{name}": values for name, values in columns.fields.items()})
+        arrays.update({f"vocabulary_{name}": np.array(words, dtype=str) for name, words in columns.vocabularies.items()})
+        np.savez_compressed(output, **arrays)
+        return len(columns)
+    if extension not in (".parquet", ".arrow"):
+        raise ValueError(f"Unsupported columnar format: {extension}")
+    if pyarrow is None:
+        raise RuntimeError("Parquet/Arrow export needs pyarrow (pip install pyarrow)")
+
+    writer = None
+    count = 0
+    try:
+        for chunk in chunks:
+            batch = _to_arrow(chunk)
+            if writer is None:
+                if extension == ".parquet":
+                    writer = pyarrow.parquet.ParquetWriter(output, batch.schema)
+                else:
+                    # Vocabularies only grow, so later chunks add dictionary deltas
+                    options = pyarrow.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+                    writer = pyarrow.ipc.new_file(output, batch.schema, options=options)
+            if extension == ".parquet":
+                writer.write_table(pyarrow.Table.from_batches([batch]))
+            else:
+                writer.write_batch(batch)
+            count += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+def load_columns(path: str) -> EventColumns:
+    """Read a file written by convert_logs back into EventColumns."""
+    _require_numpy()
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return EventColumns(
+                timestamp=data["timestamp"],
+                service_name=data["service_name"],
+                event_type=data["event_type"],
+                fields={key[len("field_"):]: data[key] for key in data.files if key.startswith("field_")},
+                vocabularies={key[len("vocabulary_"):]: data[key].tolist() for key in data.files if key.startswith("vocabulary_")}
+            )
+    if pyarrow is None:
+        raise RuntimeError("Parquet/Arrow import needs pyarrow (pip install pyarrow)")
+    if path.endswith(".parquet"):
+        table = pyarrow.parquet.read_table(path)
+    else:
+        with pyarrow.ipc.open_file(path) as reader:
+            table = reader.read_all()
+    # Chunks may carry different dictionaries; give each column one vocabulary
+    table = table.unify_dictionaries()
+
+    arrays: Dict[str, Any] = {}
+    vocabularies: Dict[str, List[str]] = {}
+    for name in table.column_names:
+        column = table[name].combine_chunks()
+        if name == "timestamp":
+            values = column.cast(pyarrow.int64()).to_numpy()
+        elif pyarrow.types.is_dictionary(column.type):
+            values = column.indices.fill_null(-1).to_numpy().astype(np.int32)
+            vocabularies[name] = column.dictionary.to_pylist()
+        else:
+            values = column.to_numpy(zero_copy_only=False)
+        arrays[name] = values
+    return EventColumns(
+        timestamp=arrays.pop("timestamp"),
+        service_name=arrays.pop("service_name"),
+        event_type=arrays.pop("event_type"),
+        fields=arrays,
+        vocabularies=vocabularies
+    )
@@ -0,0 +1,201 @@
+import json
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+def read_last_lines(path: str, n: int, chunk_size: int = 8192) -> List[bytes]:
+    """Return the last n complete lines of a file by seeking backward from the end."""
+    if n <= 0 or not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        buffer = b""
+        # One extra newline: the file normally ends with one
+        while position > 0 and buffer.count(b"\n") <= n:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            buffer = f.read(read_size) + buffer
+    lines = [line for line in buffer.split(b"\n") if line.strip()]
+    return lines[-n:]
+
+def _parse(line: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(line)
+    except ValueError:
+        # A line cut off mid-write or by rotation
+        return None
+
+def read_last(path: str, n: int) -> List[Dict[str, Any]]:
+    """Return the last n structured log records, oldest first."""
+    records = (_parse(line) for line in read_last_lines(path, n))
+    return [record for record in records if record is not None]
+
+class LogTailer:
+    def __init__(self, path: str, offset: int = 0):
+        """
+        Incrementally read records appended to a JSONL file.
+
+        The byte offset after the last complete line is kept in `offset`
+        (and can be stored by the caller), so each read only touches new
+        data. A rotated or truncated file is detected and read from the start.
+        """
+        self.path = path
+        self.offset = offset
+        self._inode: Optional[int] = None
+
+    def _check_rotation(self, stat: os.stat_result):
+        if (self._inode is not None and stat.st_ino != self._inode) or stat.st_size < self.offset:
+            self.offset = 0
+        self._inode = stat.st_ino
+
+    def read_new_lines(self, max_bytes: Optional[int] = None) -> List[Tuple[int, bytes]]:
+        """Return (offset, line) pairs for complete lines written since the last call."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        self._check_rotation(stat)
+        if stat.st_size == self.offset:
+            return []
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(max_bytes) if max_bytes else f.read()
+            # A record longer than max_bytes: read on to its newline so the offset can move past it
+            more = data if max_bytes else b""
+            while more and b"\n" not in more:
+                more = f.read(max_bytes)
+                data += more
+
+        # Leave a partially written last line for the next call
+        end = data.rfind(b"\n") + 1
+        lines = []
+        position = self.offset
+        for line in data[:end].split(b"\n")[:-1]:
+            if line.strip():
+                lines.append((position, line))
+            position += len(line) + 1
+        self.offset += end
+        return lines
+
+    def read_new(self, max_bytes: Optional[int] = None) -> List[Dict[str, Any]]:
+        records = (_parse(line) for _, line in self.read_new_lines(max_bytes))
+        return [record for record in records if record is not None]
+
+class LogIndex:
+    # Bytes read per step while catching up, to bound memory on the first build
+    READ_CHUNK = 4 * 1024 * 1024
+
+    def __init__(self, path: str, max_per_key: int = 1000):
+        """
+        Sidecar index (`<path>.idx`) of byte offsets per (service_name, event_type).
+
+        Only the newest max_per_key offsets are kept per key, so the index
+        stays small however large the log grows. It is updated incrementally
+        from the last indexed offset.
+        """
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self.max_per_key = max_per_key
+        self._tailer = LogTailer(path)
+        self._offsets: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def _key(service_name: Any, event_type: Any) -> str:
+        return f"{service_name}|{event_type}"
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r") as f:
+                saved = json.load(f)
+            stat = os.stat(self.path)
+        except (FileNotFoundError, ValueError):
+            return
+        # Discard an index built for a file that has since been rotated away
+        if saved.get("inode") != stat.st_ino or saved.get("offset", 0) > stat.st_size:
+            return
+        self._tailer.offset = saved["offset"]
+        self._tailer._inode = stat.st_ino
+        self._offsets = {key: deque(offsets, maxlen=self.max_per_key) for key, offsets in saved["keys"].items()}
+
+    def _save(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "inode": self._tailer._inode,
+                "offset": self._tailer.offset,
+                "keys": {key: list(offsets) for key, offsets in self._offsets.items()}
+            }, f)
+        os.replace(tmp_path, self.index_path)
+
+    def update(self) -> int:
+        """Index lines appended since the last update. Returns how many were added."""
+        added = 0
+        with self._lock:
+            while True:
+                previous_inode = self._tailer._inode
+                lines = self._tailer.read_new_lines(self.READ_CHUNK)
+                if not lines:
+                    break
+                if (previous_inode is not None and self._tailer._inode != previous_inode) or lines[0][0] == 0:
+                    # Rotated or truncated: offsets into the old file are meaningless
+                    self._offsets = {}
+                for offset, line in lines:
+                    record = _parse(line)
+                    if record is None:
+                        continue
+                    key = self._key(record.get("service_name"), record.get("event_type"))
+                    offsets = self._offsets.get(key)
+                    if offsets is None:
+                        offsets = self._offsets[key] = deque(maxlen=self.max_per_key)
+                    offsets.append(offset)
+                added += len(lines)
+            if added:
+                self._save()
+        return added
+
+    def offsets(self, service_name: Optional[str] = None, event_type: Optional[str] = None) -> List[int]:
+        with self._lock:
+            matching = []
+            for key, offsets in self._offsets.items():
+                service, event = key.split("|", 1)
+                if service_name is not None and service != service_name:
+                    continue
+                if event_type is not None and event != event_type:
+                    continue
+                matching.extend(offsets)
+        return sorted(matching)
+
+class LogReader:
+    def __init__(self, path: str = "app_logs.json", max_per_key: int = 1000):
+        """Read the structured log from the tail, without scanning the whole file."""
+        self.path = path
+        self.index = LogIndex(path, max_per_key=max_per_key)
+
+    def last(self, n: int, service_name: Optional[str] = None, event_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The last n records, optionally filtered by service_name and/or event_type."""
+        if service_name is None and event_type is None:
+            return read_last(self.path, n)
+
+        self.index.update()
+        offsets = self.index.offsets(service_name, event_type)[-n:]
+        records = []
+        try:
+            with open(self.path, "rb") as f:
+                for offset in offsets:
+                    f.seek(offset)
+                    record = _parse(f.readline())
+                    if record is not None:
+                        records.append(record)
+        except FileNotFoundError:
+            return []
+        return records
+
+    def tailer(self, offset: int = 0) -> LogTailer:
+        """A tailer that resumes from a stored byte offset."""
+        return LogTailer(self.path, offset)
@@ -0,0 +1,242 @@
+import atexit
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+from src.monitoring.event_codec import MAGIC, EventEncoder, scan_file
+from src.monitoring.rotation import LogRotator
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "sample")
+LOG_FORMATS = ("jsonl", "binary")
+
+class BatchingLogSink:
+    def __init__(
+        self,
+        path: str,
+        max_queue: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        overflow_policy: str = "block",
+        sample_rate: float = 0.1,
+        rotation: Optional[Dict[str, Any]] = None,
+        on_batch: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        format: str = "jsonl"
+    ):
+        """
+        Background JSONL writer fed by a bounded in-memory queue.
+
+        Callers only append to the queue; a writer thread serializes and
+        writes whole batches through one persistent file handle once
+        batch_size records are waiting or flush_interval seconds have passed.
+
+        Args:
+            path: File the records are appended to.
+            max_queue: Records held in memory before the overflow policy applies.
+            batch_size: Records that trigger an immediate flush.
+            flush_interval: Longest time a record waits before being written.
+            overflow_policy: "block" waits for room, "drop_oldest" discards the
+                oldest queued record, "sample" keeps only sample_rate of new
+                records (each one displacing the oldest) while the queue is full.
+            sample_rate: Fraction of records kept under the "sample" policy.
+            rotation: Optional LogRotator options (max_bytes, rotate_interval,
+                compression, retention) for rotating and archiving the file.
+            on_batch: Optional callback run on the writer thread with each batch.
+            format: "jsonl" (one JSON object per line) or "binary" (compact
+                length-prefixed records, see src/monitoring/event_codec.py).
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow_policy: {overflow_policy}")
+        if format not in LOG_FORMATS:
+            raise ValueError(f"Unknown log format: {format}")
+        self.path = path
+        self.max_queue = max(1, max_queue)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.sample_rate = sample_rate
+        self.on_batch = on_batch
+        self.format = format
+        self._encoder: Optional[EventEncoder] = None
+        self.rotator = LogRotator(path, **rotation) if rotation else None
+
+        self._queue: deque = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._drained = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._flush_requested = False
+        self._closing = False
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+
+        # Counters
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.write_errors = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def submit(self, entry: Dict[str, Any]):
+        """Queue one record for writing; never does file I/O on the caller's thread."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._start()
+
+            if len(self._queue) >= self.max_queue:
+                if self.overflow_policy == "block":
+                    while len(self._queue) >= self.max_queue and not self._closing:
+                        self._not_full.wait()
+                elif self.overflow_policy == "drop_oldest":
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    self.dropped += 1
+                    if random.random() >= self.sample_rate:
+                        return
+                    self._queue.popleft()
+
+            self._queue.append((time.monotonic(), entry))
+            self.enqueued += 1
+            if len(self._queue) >= self.batch_size:
+                self._not_empty.notify()
+
+    def _start(self):
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name="log-sink-writer", daemon=True)
+        self._thread.start()
+        # Registered only while the writer runs, so closed sinks can be collected
+        atexit.register(self.close)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._queue) < self.batch_size and not (self._closing or self._flush_requested):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._not_empty.wait(remaining)
+
+                if not self._queue:
+                    self._flush_requested = False
+                    if self._closing:
+                        return
+                    continue
+
+                count = min(len(self._queue), self.batch_size)
+                batch = [self._queue.popleft() for _ in range(count)]
+                self._in_flight = count
+                self._not_full.notify_all()
+
+            self._write_batch(batch)
+
+            with self._lock:
+                self._in_flight = 0
+                if not self._queue:
+                    self._flush_requested = False
+                    self._drained.notify_all()
+
+    def _write_batch(self, batch: List[tuple]):
+        entries = [entry for _, entry in batch]
+        try:
+            if self._file is None:
+                self._file = self._open()
+            if self._encoder is not None:
+                self._file.write(self._encoder.encode_batch(entries))
+            else:
+                self._file.write("".join(json.dumps(entry) + "\n" for entry in entries))
+            self._file.flush()
+            self.written += len(entries)
+            self.batches += 1
+            if self.rotator and self.rotator.should_rotate(self._file.tell()):
+                self._file.close()
+                self._file = None
+                self.rotator.rotate()
+        except Exception as e:
+            self.write_errors += 1
+            print(f"Failed to write to log file: {e}")
+
+        self.last_lag = time.monotonic() - batch[0][0]
+        self.max_lag = max(self.max_lag, self.last_lag)
+
+        if self.on_batch:
+            try:
+                self.on_batch(entries)
+            except Exception as e:
+                print(f"Log sink batch callback failed: {e}")
+
+    def _open(self):
+        if self.format == "jsonl":
+            return open(self.path, "a")
+        # Resume the file's string table, dropping a record torn by a crash
+        codes, end = scan_file(self.path)
+        f = open(self.path, "ab")
+        if end == 0:
+            f.truncate(0)
+            f.write(MAGIC)
+        elif f.tell() > end:
+            f.truncate(end)
+        self._encoder = EventEncoder(codes)
+        return f
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Wait until every queued record has been written. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            if self._thread is None:
+                return True
+            while self._queue or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._flush_requested = True
+                self._not_empty.notify()
+                self._drained.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Flush pending records, stop the writer and release the file handle.
+
+        The sink restarts on the next submit(), so a closed sink can be reused.
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._closing = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        thread.join(timeout)
+        if thread.is_alive():
+            # Still writing: closing the file now would fail its write. The
+            # next close() joins it again.
+            logger.warning(f"Log sink writer for {self.path} did not stop within {timeout}s; leaving the file open")
+            return
+        atexit.unregister(self.close)
+        with self._lock:
+            self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.rotator:
+            self.rotator.wait_for_archival()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._queue),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "write_errors": self.write_errors,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag
+        }
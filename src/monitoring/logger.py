@@ -1,22 +1,79 @@
 import logging
-import json
 import datetime
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from src.monitoring.log_sink import BatchingLogSink
+from src.monitoring.rotation import RotatingTextHandler
+from src.monitoring.sheets_exporter import SheetsExporter, create_sheets_exporter
+from src.monitoring.tracing import current_trace_id, tracer
 
 class StructuredLogger:
-    def __init__(self, log_file: str = "app_logs.json"):
+    def __init__(self, log_file: str = "app_logs.json", text_log_file: str = "app.log", sink_config: Optional[Dict[str, Any]] = None):
         self.log_file = log_file
+        self.text_log_file = text_log_file
+        self._text_handler: Optional[logging.FileHandler] = None
         self._setup_logger()
+        self.sink: Optional[BatchingLogSink] = None
+        # Google Sheets export stage, fed once per written batch
+        self.sheets: Optional[SheetsExporter] = create_sheets_exporter({"transport": "mock"})
+        self.configure_sink(sink_config)
+
+    @property
+    def binary_log_file(self) -> str:
+        return f"{os.path.splitext(self.log_file)[0]}.evt"
+
+    def configure(self, logging_config: Dict[str, Any]):
+        """Apply the `logging` section of config.json (sink and rotation settings)."""
+        rotation = logging_config.get('rotation')
+        if 'sheets' in logging_config:
+            self.configure_sheets(logging_config['sheets'])
+        self.configure_sink(logging_config.get('sink'), rotation)
+        self.configure_text_rotation(rotation)
+
+    def configure_sheets(self, sheets_config: Optional[Dict[str, Any]]):
+        """(Re)create the Sheets exporter from the `logging.sheets` section; disabled sections turn it off."""
+        if self.sheets is not None:
+            self.sheets.close()
+        self.sheets = create_sheets_exporter(sheets_config)
+
+    def configure_sink(self, sink_config: Optional[Dict[str, Any]] = None, rotation: Optional[Dict[str, Any]] = None):
+        """(Re)create the background writer with the given BatchingLogSink options."""
+        if self.sink is not None:
+            self.sink.close()
+        sink_config = dict(sink_config or {})
+        # Binary logs get their own file, so JSONL readers never meet binary records
+        path = self.log_file if sink_config.get('format', 'jsonl') == 'jsonl' else self.binary_log_file
+        self.sink = BatchingLogSink(
+            path,
+            rotation=rotation,
+            on_batch=self._export_batch,
+            **sink_config
+        )
+
+    def configure_text_rotation(self, rotation: Optional[Dict[str, Any]]):
+        """Swap the plain app.log handler for a rotating, archiving one."""
+        if not rotation or self._text_handler is None:
+            return
+        root = logging.getLogger()
+        new_handler = RotatingTextHandler(self.text_log_file, rotation)
+        new_handler.setFormatter(self._text_handler.formatter)
+        root.addHandler(new_handler)
+        root.removeHandler(self._text_handler)
+        self._text_handler.close()
+        self._text_handler = new_handler
 
     def _setup_logger(self):
         # Configure standard logging to console and file
+        root = logging.getLogger()
+        if root.handlers:
+            return
+        self._text_handler = logging.FileHandler(self.text_log_file, mode='a')
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
             handlers=[
                 logging.StreamHandler(),
-                logging.FileHandler("app.log", mode='a')
+                self._text_handler
             ]
         )
 
@@ -27,24 +84,37 @@ class StructuredLogger:
             "event_type": event_type,
             **data
         }
+        trace_id = current_trace_id()
+        if trace_id is not None:
+            # Joins log lines to the call's spans; set for unsampled calls too
+            log_entry["trace_id"] = trace_id
         
-        # Log to structured local file
-        self._write_to_file(log_entry)
-        
-        # Log to Google Sheets (Mock)
-        self._mock_google_sheets_log(log_entry)
+        # Log to structured local file. Written batches are handed to the
+        # Sheets exporter, which pushes them on its own thread.
+        with tracer.span("log_event", event_type=event_type):
+            self._write_to_file(log_entry)
 
     def _write_to_file(self, entry: Dict[str, Any]):
-        try:
-            with open(self.log_file, "a") as f:
-                f.write(json.dumps(entry) + "\n")
-        except Exception as e:
-            print(f"Failed to write to log file: {e}")
-
-    def _mock_google_sheets_log(self, entry: Dict[str, Any]):
-        # In a real scenario, this would use google-api-python-client
-        # We'll just print it for now to simulate the action
-        print(f"[MOCK GOOGLE SHEETS] Logging: {entry.get('timestamp')} | {entry.get('service_name')} | {entry.get('event_type')}")
+        self.sink.submit(entry)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        return self.sink.flush(timeout)
+
+    def shutdown(self):
+        """Write out everything still queued, close the log file and push (or spill) pending sheet rows."""
+        self.sink.close()
+        if self.sheets is not None:
+            self.sheets.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.sink.get_stats()
+        if self.sheets is not None:
+            stats["sheets"] = self.sheets.get_stats()
+        return stats
+
+    def _export_batch(self, entries: List[Dict[str, Any]]):
+        if self.sheets is not None:
+            self.sheets.submit(entries)
 
 # Global instance
 app_logger = StructuredLogger()
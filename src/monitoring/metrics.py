@@ -0,0 +1,254 @@
+from abc import ABC, abstractmethod
+import bisect
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+LabelValues = Tuple[str, ...]
+
+def log_linear_buckets(minimum: float = 0.001, maximum: float = 100.0, steps_per_decade: int = 9) -> List[float]:
+    """
+    Bucket upper bounds that are linear within each power of ten:
+    1ms, 2ms, ... 9ms, 10ms, 20ms, ... so relative error stays bounded
+    from milliseconds to minutes with a few dozen buckets.
+    """
+    bounds = []
+    exponent = math.floor(math.log10(minimum))
+    while 10.0 ** exponent <= maximum:
+        decade = 10.0 ** exponent
+        for step in range(steps_per_decade):
+            bound = round(decade * (1 + 9 * step / steps_per_decade), 12)
+            if minimum <= bound <= maximum:
+                bounds.append(bound)
+        exponent += 1
+    return bounds
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...]):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._children: Dict[LabelValues, Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: Any):
+        """The child for one set of label values, in labelnames order."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """A fresh value holder for one set of label values."""
+
+    def children(self) -> List[Tuple[LabelValues, Any]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def _label_text(self, values: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, values))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+class _Value:
+    """Single number guarded by a lock; used by counters and gauges."""
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: List[float]):
+        self.bounds = bounds
+        # One slot per bound plus +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by interpolating inside the bucket it falls in."""
+        with self._lock:
+            counts = list(self.counts)
+            total = self.count
+        if total == 0:
+            return None
+        rank = q * total
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and seen + bucket_count >= rank:
+                upper = self.bounds[index] if index < len(self.bounds) else self.bounds[-1]
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.bounds[-1]
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...], buckets: Optional[List[float]] = None):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = buckets or log_linear_buckets()
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+class MetricsRegistry:
+    def __init__(self):
+        """In-process metrics. Recording is a dict lookup plus a short lock."""
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help_text: str, labelnames: Tuple[str, ...], **kwargs) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, help_text, tuple(labelnames), **kwargs)
+        if not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} is already registered as a {metric.type_name}")
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(
+        self, name: str, help_text: str, labelnames: Tuple[str, ...] = (), buckets: Optional[List[float]] = None
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for values, child in metric.children():
+                if isinstance(metric, Histogram):
+                    with child._lock:
+                        counts, total, count = list(child.counts), child.sum, child.count
+                    cumulative = 0
+                    for bound, bucket_count in zip(metric.buckets + [math.inf], counts):
+                        cumulative += bucket_count
+                        le = "+Inf" if bound == math.inf else repr(bound)
+                        lines.append(f"{metric.name}_bucket{metric._label_text(values, ('le', le))} {cumulative}")
+                    lines.append(f"{metric.name}_sum{metric._label_text(values)} {total}")
+                    lines.append(f"{metric.name}_count{metric._label_text(values)} {count}")
+                else:
+                    lines.append(f"{metric.name}{metric._label_text(values)} {child.value}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Plain-data view for the dashboard: one row per label set. Histogram
+        rows carry count, mean and p50/p95/p99 estimates.
+        """
+        result = {}
+        for metric in list(self._metrics.values()):
+            rows = []
+            for values, child in metric.children():
+                row: Dict[str, Any] = dict(zip(metric.labelnames, values))
+                if isinstance(metric, Histogram):
+                    row.update({
+                        "count": child.count,
+                        "mean": child.sum / child.count if child.count else None,
+                        "p50": child.quantile(0.50),
+                        "p95": child.quantile(0.95),
+                        "p99": child.quantile(0.99)
+                    })
+                else:
+                    row["value"] = child.value
+                rows.append(row)
+            result[metric.name] = rows
+        return result
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood app.log
+        pass
+
+class MetricsServer:
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9100):
+        """Serve registry.render_prometheus() at http://host:port/metrics on a daemon thread."""
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread = None
+
+# Global instance
+metrics = MetricsRegistry()
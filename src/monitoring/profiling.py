@@ -0,0 +1,142 @@
+import cProfile
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILER_MODES = ("sampling", "cprofile")
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005):
+        """
+        Sample the stacks of every thread each `interval` seconds.
+
+        Stacks are counted in the "folded" format (one line per distinct
+        stack, frames separated by ";", then the sample count), which
+        flamegraph.pl, speedscope and similar tools read directly. Overhead
+        is one stack walk per thread per sample, regardless of call volume.
+        """
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop_event.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def write(self, path: str):
+        with open(path, "w") as f:
+            f.write("".join(f"{stack} {count}\n" for stack, count in self.samples.most_common()))
+
+class Profiler:
+    def __init__(self, mode: str = "sampling", interval: float = 0.005, output_dir: str = "profiles", toggle_signal: Optional[str] = None):
+        """
+        Profiling that can be switched on and off while the agent runs.
+
+        Args:
+            mode: "sampling" (all threads, folded stacks) or "cprofile"
+                (deterministic, but only the thread that calls start()).
+            interval: Seconds between samples in sampling mode.
+            output_dir: Directory profiles are written to on stop().
+            toggle_signal: Signal name (e.g. "SIGUSR1") that toggles profiling;
+                installed by install_signal_handler().
+        """
+        if mode not in PROFILER_MODES:
+            raise ValueError(f"Unknown profiler mode: {mode}")
+        self.mode = mode
+        self.interval = interval
+        self.output_dir = output_dir
+        self.toggle_signal = toggle_signal
+        self._lock = threading.Lock()
+        self._active: Any = None
+        self._active_mode: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._active is not None
+
+    def start(self, mode: Optional[str] = None):
+        mode = mode or self.mode
+        if mode not in PROFILER_MODES:
+            raise ValueError(f"Unknown profiler mode: {mode}")
+        with self._lock:
+            if self._active is not None:
+                return
+            if mode == "cprofile":
+                self._active = cProfile.Profile()
+                self._active.enable()
+            else:
+                self._active = SamplingProfiler(self.interval)
+                self._active.start()
+            self._active_mode = mode
+        logger.info(f"Profiler started ({mode})")
+
+    def stop(self) -> Optional[str]:
+        """Stop profiling and write the profile; returns its path (None if nothing was running)."""
+        with self._lock:
+            active, mode = self._active, self._active_mode
+            self._active = self._active_mode = None
+        if active is None:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        if mode == "cprofile":
+            active.disable()
+            path = os.path.join(self.output_dir, f"profile-{stamp}.prof")
+            # Readable with pstats or snakeviz
+            active.dump_stats(path)
+        else:
+            active.stop()
+            path = os.path.join(self.output_dir, f"profile-{stamp}.folded")
+            active.write(path)
+        logger.info(f"Profiler stopped; profile written to {path}")
+        return path
+
+    def toggle(self) -> Optional[str]:
+        if self.running:
+            return self.stop()
+        self.start()
+        return None
+
+    def install_signal_handler(self):
+        """Toggle profiling on toggle_signal (POSIX, main thread only)."""
+        if not self.toggle_signal:
+            return
+        import signal
+        try:
+            signal.signal(getattr(signal, self.toggle_signal), lambda signum, frame: self.toggle())
+        except (AttributeError, ValueError) as e:
+            logger.warning(f"Cannot install profiler toggle on {self.toggle_signal}: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        return {"running": self.running, "mode": self._active_mode or self.mode}
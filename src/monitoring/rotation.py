@@ -0,0 +1,195 @@
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+COMPRESSIONS = (None, "gzip", "zstd")
+
+class LogRotator:
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = 50 * 1024 * 1024,
+        rotate_interval: Optional[float] = None,
+        compression: Optional[str] = "gzip",
+        retention: int = 10
+    ):
+        """
+        Rotate a log file by size or age and archive the closed segments.
+
+        Closed segments are compressed on a background thread and recorded in
+        a manifest (`<path>.manifest.json`) with the time range they cover, so
+        readers can pick segments by time without opening them.
+
+        Args:
+            path: Active log file.
+            max_bytes: Rotate once the active file reaches this size (None = never).
+            rotate_interval: Rotate once the active file is this many seconds old (None = never).
+            compression: "gzip", "zstd" (needs the zstandard package) or None.
+            retention: Number of archived segments to keep; older ones are deleted.
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            logging.getLogger(__name__).warning("zstandard is not installed; falling back to gzip")
+            compression = "gzip"
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.compression = compression
+        self.retention = max(1, retention)
+        self.manifest_path = f"{path}.manifest.json"
+
+        self._lock = threading.Lock()
+        self._compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-compress")
+        self._pending = []
+        self._sequence = 0
+        self.segment_start = self._initial_segment_start()
+
+    def _initial_segment_start(self) -> float:
+        # The real start of a pre-existing file is unknown; its mtime is the closest hint
+        if os.path.exists(self.path):
+            return os.path.getmtime(self.path)
+        return time.time()
+
+    def should_rotate(self, current_size: int) -> bool:
+        if self.max_bytes and current_size >= self.max_bytes:
+            return True
+        if self.rotate_interval and time.time() - self.segment_start >= self.rotate_interval:
+            return current_size > 0
+        return False
+
+    def rotate(self) -> Optional[str]:
+        """
+        Move the active file aside as a new segment. The caller must have
+        closed its handle first. Returns the segment path, or None if there
+        was nothing to rotate.
+        """
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            self.segment_start = time.time()
+            return None
+
+        end = time.time()
+        base, ext = os.path.splitext(self.path)
+        stamp = datetime.fromtimestamp(end).strftime("%Y%m%dT%H%M%S")
+        while True:
+            self._sequence += 1
+            segment_path = f"{base}.{stamp}-{self._sequence}{ext}"
+            if not any(os.path.exists(segment_path + suffix) for suffix in ("", ".gz", ".zst")):
+                break
+        os.replace(self.path, segment_path)
+
+        segment = {
+            "file": os.path.basename(segment_path),
+            "start": self.segment_start,
+            "end": end,
+            "bytes": os.path.getsize(segment_path),
+            "compression": None
+        }
+        self.segment_start = end
+        with self._lock:
+            segments = self._read_manifest()
+            segments.append(segment)
+            self._write_manifest(segments)
+
+        if self.compression:
+            self._pending = [f for f in self._pending if not f.done()]
+            self._pending.append(self._compressor.submit(self._compress, segment_path))
+        else:
+            self._apply_retention()
+        return segment_path
+
+    def _compress(self, segment_path: str):
+        suffix = ".gz" if self.compression == "gzip" else ".zst"
+        target = segment_path + suffix
+        try:
+            with open(segment_path, "rb") as src:
+                if self.compression == "gzip":
+                    with gzip.open(target, "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                else:
+                    with open(target, "wb") as dst:
+                        zstandard.ZstdCompressor().copy_stream(src, dst)
+            os.remove(segment_path)
+        except Exception as e:
+            print(f"Failed to compress log segment {segment_path}: {e}")
+            return
+
+        name = os.path.basename(segment_path)
+        with self._lock:
+            segments = self._read_manifest()
+            for segment in segments:
+                if segment["file"] == name:
+                    segment["file"] = os.path.basename(target)
+                    segment["compression"] = self.compression
+                    segment["compressed_bytes"] = os.path.getsize(target)
+            self._write_manifest(segments)
+        self._apply_retention()
+
+    def _apply_retention(self):
+        with self._lock:
+            segments = self._read_manifest()
+            expired, kept = segments[:-self.retention], segments[-self.retention:]
+            if not expired:
+                return
+            directory = os.path.dirname(self.path)
+            for segment in expired:
+                try:
+                    os.remove(os.path.join(directory, segment["file"]))
+                except FileNotFoundError:
+                    pass
+            self._write_manifest(kept)
+
+    def _read_manifest(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f).get("segments", [])
+        except (FileNotFoundError, ValueError):
+            return []
+
+    def _write_manifest(self, segments: List[Dict[str, Any]]):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"active": os.path.basename(self.path), "segments": segments}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def segments(self, start: Optional[float] = None, end: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Archived segments overlapping [start, end] (epoch seconds), oldest first."""
+        with self._lock:
+            segments = self._read_manifest()
+        return [
+            segment for segment in segments
+            if (start is None or segment["end"] >= start) and (end is None or segment["start"] <= end)
+        ]
+
+    def wait_for_archival(self):
+        """Block until queued compressions have finished (used on shutdown)."""
+        wait(list(self._pending))
+
+class RotatingTextHandler(logging.FileHandler):
+    def __init__(self, filename: str, rotation_config: Dict[str, Any], mode: str = "a"):
+        """FileHandler that rotates and archives its file through a LogRotator."""
+        super().__init__(filename, mode=mode, delay=True)
+        self.rotator = LogRotator(self.baseFilename, **rotation_config)
+
+    def emit(self, record: logging.LogRecord):
+        super().emit(record)
+        try:
+            if self.stream is not None and self.rotator.should_rotate(self.stream.tell()):
+                self.stream.close()
+                self.stream = None
+                self.rotator.rotate()
+        except Exception:
+            self.handleError(record)
@@ -0,0 +1,365 @@
+from abc import ABC, abstractmethod
+import atexit
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+from src.core.exceptions import (
+    AuthenticationError, InvalidPayloadError, NetworkError, PermanentError, RateLimitExceededError,
+    ResourceNotFoundError, ServiceTimeoutError, ServiceUnavailableError, TransientError
+)
+from src.core.resilience.circuit_breaker import CircuitBreaker
+from src.core.resilience.retry import retry_with_backoff
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "GoogleSheets"
+
+# Log fields exported as sheet columns, in order
+DEFAULT_COLUMNS = ("timestamp", "service_name", "event_type", "circuit_state", "duration", "error_type", "error")
+
+class SheetsTransport(ABC):
+    """Sends rows to a sheet. Raises TransientError or PermanentError subclasses on failure."""
+    @abstractmethod
+    def append_rows(self, rows: List[List[Any]]):
+        pass
+
+class MockSheetsTransport(SheetsTransport):
+    def append_rows(self, rows: List[List[Any]]):
+        # In a real scenario, this would use google-api-python-client
+        # We'll just print it for now to simulate the action
+        print(f"[MOCK GOOGLE SHEETS] Appending {len(rows)} row(s); last: {' | '.join(str(v) for v in rows[-1][:3])}")
+
+class HttpSheetsTransport(SheetsTransport):
+    def __init__(
+        self,
+        spreadsheet_id: str,
+        range: str = "Logs!A1",
+        token: Optional[str] = None,
+        base_url: str = "https://sheets.googleapis.com",
+        timeout: float = 10.0
+    ):
+        """
+        Append rows through the Sheets API `values:append` endpoint.
+
+        Point base_url at a SheetsStubServer to test without Google.
+
+        Args:
+            spreadsheet_id: Target spreadsheet.
+            range: A1 range of the table rows are appended to.
+            token: OAuth bearer token.
+            base_url: API root.
+            timeout: Seconds per HTTP request.
+        """
+        self.url = (
+            f"{base_url.rstrip('/')}/v4/spreadsheets/{urllib.parse.quote(spreadsheet_id)}"
+            f"/values/{urllib.parse.quote(range)}:append?valueInputOption=RAW&insertDataOption=INSERT_ROWS"
+        )
+        self.token = token
+        self.timeout = timeout
+
+    def append_rows(self, rows: List[List[Any]]):
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        request = urllib.request.Request(
+            self.url, data=json.dumps({"values": rows}).encode("utf-8"), headers=headers, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except urllib.error.HTTPError as e:
+            raise _http_error(e) from e
+        except (socket.timeout, TimeoutError) as e:
+            raise ServiceTimeoutError(f"Sheets append timed out: {e}", service_name=SERVICE_NAME) from e
+        except (urllib.error.URLError, ConnectionError) as e:
+            raise NetworkError(f"Sheets unreachable: {e}", service_name=SERVICE_NAME) from e
+
+def _http_error(error: urllib.error.HTTPError) -> Exception:
+    message = f"Sheets append failed with HTTP {error.code}"
+    if error.code == 429:
+        retry_after = error.headers.get("Retry-After")
+        return RateLimitExceededError(
+            message, service_name=SERVICE_NAME,
+            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None
+        )
+    if error.code >= 500:
+        return ServiceUnavailableError(message, service_name=SERVICE_NAME)
+    if error.code in (401, 403):
+        return AuthenticationError(message, service_name=SERVICE_NAME)
+    if error.code == 404:
+        return ResourceNotFoundError(message, service_name=SERVICE_NAME)
+    return InvalidPayloadError(message, service_name=SERVICE_NAME)
+
+TRANSPORTS = {
+    "mock": MockSheetsTransport,
+    "http": HttpSheetsTransport,
+}
+
+class SheetsExporter:
+    def __init__(
+        self,
+        transport: SheetsTransport,
+        batch_size: int = 500,
+        flush_interval: float = 5.0,
+        max_buffer: int = 10000,
+        spill_path: Optional[str] = "spill/sheets.jsonl",
+        columns: Sequence[str] = DEFAULT_COLUMNS,
+        retry: Optional[Dict[str, Any]] = None,
+        circuit_breaker: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Export structured log events to a sheet as batched appends.
+
+        submit() only buffers rows in memory; a background thread appends up
+        to batch_size rows every flush_interval seconds (sooner once a full
+        batch is waiting). Each append runs through retry_with_backoff and a
+        CircuitBreaker. Rows that still cannot be delivered, or that overflow
+        max_buffer, are spilled to spill_path and replayed after the next
+        successful append. Delivery is at least once: a crash during a replay
+        can send some rows twice. Rows the sheet rejects outright (a
+        PermanentError) are kept in `<spill_path>.rejected`.
+
+        Args:
+            transport: Where rows go, e.g. HttpSheetsTransport.
+            batch_size: Rows per append request.
+            flush_interval: Longest time a row waits in memory, in seconds.
+            max_buffer: Rows held in memory before new ones spill to disk.
+            spill_path: JSONL file for undelivered rows (None = drop them).
+            columns: Event fields exported, one column each.
+            retry: retry_with_backoff options for each append.
+            circuit_breaker: CircuitBreaker options for the sheet.
+        """
+        self.transport = transport
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_buffer = max(self.batch_size, max_buffer)
+        self.spill_path = spill_path
+        self.columns = tuple(columns)
+        self.retry_config = {"max_retries": 3, "initial_delay": 1.0, "backoff_factor": 2.0, "max_delay": 30.0}
+        self.retry_config.update(retry or {})
+        breaker_config = {"failure_threshold": 3, "recovery_timeout": 60.0}
+        breaker_config.update(circuit_breaker or {})
+        self.circuit_breaker = CircuitBreaker(service_name=SERVICE_NAME, **breaker_config)
+
+        self._buffer: deque = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._busy = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._spill_lock = threading.Lock()
+
+        # Counters
+        self.submitted = 0
+        self.sent = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.rejected = 0
+
+        atexit.register(self.close)
+
+    def to_row(self, entry: Dict[str, Any]) -> List[Any]:
+        return [_cell(entry.get(column)) for column in self.columns]
+
+    def submit(self, entries: List[Dict[str, Any]]):
+        """Buffer events for export. Never touches the network on the caller's thread."""
+        rows = [self.to_row(entry) for entry in entries]
+        overflow = []
+        with self._lock:
+            if self._thread is None:
+                self._start()
+            self.submitted += len(rows)
+            room = self.max_buffer - len(self._buffer)
+            self._buffer.extend(rows[:max(0, room)])
+            overflow = rows[max(0, room):]
+            if len(self._buffer) >= self.batch_size:
+                self._wake.notify()
+        if overflow:
+            self._spill(overflow)
+
+    def _start(self):
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="sheets-exporter", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._buffer) < self.batch_size and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wake.wait(remaining)
+                stopping = self._stopping
+                rows = [self._buffer.popleft() for _ in range(min(len(self._buffer), self.batch_size))]
+                self._busy = True
+
+            if rows:
+                self._deliver(rows)
+            if rows or not stopping:
+                self._replay_spill()
+
+            with self._lock:
+                self._busy = False
+                if not self._buffer:
+                    self._idle.notify_all()
+                if stopping and not self._buffer:
+                    return
+
+    def _push(self, rows: List[List[Any]]):
+        retry_with_backoff(
+            func=lambda: self.circuit_breaker.call(self.transport.append_rows, rows),
+            service_name=SERVICE_NAME,
+            retryable_exceptions=(TransientError,),
+            **self.retry_config
+        )
+
+    def _deliver(self, rows: List[List[Any]]) -> bool:
+        """Append one batch, spilling it on failure. Returns True if the sheet took it."""
+        try:
+            self._push(rows)
+        except PermanentError as e:
+            logger.error(f"Sheets rejected {len(rows)} row(s): {e}")
+            self.failed_batches += 1
+            self.rejected += len(rows)
+            self._write_rows(f"{self.spill_path}.rejected", rows)
+            return False
+        except Exception as e:
+            # Transient errors after the last retry, an open circuit, or a broken transport
+            logger.warning(f"Sheets export failed, spilling {len(rows)} row(s) to disk: {e}")
+            self.failed_batches += 1
+            self._spill(rows)
+            return False
+        self.sent += len(rows)
+        self.batches += 1
+        return True
+
+    def _spill(self, rows: List[List[Any]]):
+        self.spilled += len(rows)
+        self._write_rows(self.spill_path, rows)
+
+    def _write_rows(self, path: Optional[str], rows: List[List[Any]]):
+        if not path:
+            return
+        directory = os.path.dirname(path)
+        with self._spill_lock:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "a") as f:
+                f.write("".join(json.dumps(row) + "\n" for row in rows))
+
+    def _replay_spill(self):
+        """Send spilled rows once the sheet is reachable; runs on the exporter thread only."""
+        if not self.spill_path or not self.circuit_breaker.is_call_permitted():
+            return
+        replay_path = f"{self.spill_path}.replay"
+        with self._spill_lock:
+            # A replay file left by a crash is finished first
+            if not os.path.exists(replay_path):
+                if not os.path.exists(self.spill_path):
+                    return
+                os.replace(self.spill_path, replay_path)
+        with open(replay_path, "r") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        for offset in range(0, len(rows), self.batch_size):
+            batch = rows[offset:offset + self.batch_size]
+            if not self._deliver(batch):
+                # _deliver spilled this batch; keep the rest for the next replay too
+                self._spill(rows[offset + self.batch_size:])
+                break
+            self.replayed += len(batch)
+        os.remove(replay_path)
+
+    def spilled_rows(self) -> int:
+        """Rows currently waiting on disk."""
+        count = 0
+        for path in (self.spill_path, f"{self.spill_path}.replay"):
+            if path and os.path.exists(path):
+                with open(path, "r") as f:
+                    count += sum(1 for line in f if line.strip())
+        return count
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait until the buffered rows have been sent or spilled. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            if self._thread is None:
+                return True
+            while self._buffer or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._wake.notify()
+                self._idle.wait(remaining if remaining is not None else 0.1)
+        return True
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """Send (or spill) everything buffered and stop the exporter thread."""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+            self._wake.notify_all()
+        thread.join(timeout)
+        with self._lock:
+            self._thread = None
+            leftover = list(self._buffer)
+            self._buffer.clear()
+        if leftover:
+            # The thread did not finish in time; keep the rows on disk
+            self._spill(leftover)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "buffered": len(self._buffer),
+            "submitted": self.submitted,
+            "sent": self.sent,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "rejected": self.rejected,
+            "circuit_state": self.circuit_breaker.state.value
+        }
+
+def _cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return json.dumps(value, default=str)
+
+def create_sheets_exporter(config: Optional[Dict[str, Any]]) -> Optional[SheetsExporter]:
+    """
+    Build the exporter described by the `logging.sheets` config section:
+    {"enabled": true, "transport": "mock" | "http", plus HttpSheetsTransport
+    options under "http" and SheetsExporter options}.
+    """
+    config = dict(config or {})
+    if not config.pop("enabled", True):
+        return None
+    transport_type = config.pop("transport", "mock")
+    transport_options = dict(config.pop("http", {}))
+    if transport_type not in TRANSPORTS:
+        raise ValueError(f"Unknown sheets transport: {transport_type}")
+    if transport_type == "http":
+        # Keep the credential out of config.json
+        token_env = transport_options.pop("token_env", "GOOGLE_SHEETS_TOKEN")
+        transport_options.setdefault("token", os.environ.get(token_env))
+        transport = HttpSheetsTransport(**transport_options)
+    else:
+        transport = MockSheetsTransport()
+    return SheetsExporter(transport, **config)
@@ -0,0 +1,97 @@
+import json
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, List, Optional
+
+class _SheetsHandler(BaseHTTPRequestHandler):
+    stub: "SheetsStubServer"
+
+    def do_POST(self):
+        path = self.path.split("?")[0]
+        if "/values/" not in path or not path.endswith(":append"):
+            self.send_error(404)
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status = self.stub._next_status()
+        if status != 200:
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        try:
+            rows = json.loads(body)["values"]
+        except (ValueError, KeyError):
+            self.send_error(400)
+            return
+        self.stub._append(rows)
+        reply = json.dumps({"updates": {"updatedRows": len(rows)}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, format, *args):
+        pass
+
+class SheetsStubServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Local stand-in for the Sheets `values:append` API, for tests and demos.
+
+        Appended rows are kept in `rows`. Queue failures with fail_next()
+        (e.g. 503s or a 429) or take the whole "sheet" down with set_down().
+        Use `base_url` as HttpSheetsTransport's base_url.
+
+        Args:
+            host: Interface to listen on.
+            port: Port to listen on (0 = any free port).
+        """
+        handler = type("SheetsHandler", (_SheetsHandler,), {"stub": self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._failures: Deque[int] = deque()
+        self._down_status: Optional[int] = None
+        self.rows: List[List[Any]] = []
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, count: int = 1, status: int = 503):
+        """Answer the next count appends with status instead of storing them."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def set_down(self, down: bool = True, status: int = 503):
+        """Answer every append with status until set_down(False)."""
+        with self._lock:
+            self._down_status = status if down else None
+
+    def _next_status(self) -> int:
+        with self._lock:
+            self.requests += 1
+            if self._failures:
+                return self._failures.popleft()
+            return self._down_status or 200
+
+    def _append(self, rows: List[List[Any]]):
+        with self._lock:
+            self.rows.extend(rows)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="sheets-stub", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread = None
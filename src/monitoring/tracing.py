@@ -0,0 +1,186 @@
+import itertools
+import json
+import os
+import random
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from src.core import clock
+
+_span_ids = itertools.count(1)
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "sampled", "start", "end", "thread_id", "attributes")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[int], sampled: bool, attributes: Dict[str, Any]):
+        """One timed step of a call. Only sampled spans are exported."""
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = next(_span_ids)
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.attributes = attributes
+        self.thread_id = threading.get_ident()
+        self.start = clock.perf_counter()
+        self.end: Optional[float] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.start
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+def current_trace_id() -> Optional[str]:
+    """Trace ID of the call running in this context (sampled or not), if any."""
+    span = _current_span.get()
+    return None if span is None else span.trace_id
+
+class _SpanScope:
+    __slots__ = ("tracer", "span", "token")
+
+    def __init__(self, tracer: "Tracer", span: Span):
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        span = self.span
+        span.end = clock.perf_counter()
+        _current_span.reset(self.token)
+        if exc_type is not None:
+            span.attributes["error"] = exc_type.__name__
+        if span.sampled:
+            self.tracer._finish(span)
+        return False
+
+class _NullScope:
+    """Returned for spans outside a sampled trace; entering and leaving it costs almost nothing."""
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+_NULL_SCOPE = _NullScope()
+
+class ChromeTraceExporter:
+    def __init__(self, path: str, flush_every: int = 256):
+        """
+        Append finished spans to a file in the Chrome trace-event format, one
+        complete ("X") event per span. Open it in Perfetto (ui.perfetto.dev)
+        or chrome://tracing. The JSON array is left unterminated so the file
+        can keep growing; both viewers accept that.
+
+        Args:
+            path: Trace file.
+            flush_every: Spans buffered before they are written.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.exported = 0
+
+    def export(self, span: Span):
+        event = {
+            "name": span.name,
+            "cat": span.attributes.get("service", "call"),
+            "ph": "X",
+            "ts": round(span.start * 1_000_000, 3),
+            "dur": round(span.duration * 1_000_000, 3),
+            "pid": self._pid,
+            "tid": span.thread_id,
+            "args": {"trace_id": span.trace_id, "span_id": span.span_id, "parent_id": span.parent_id, **span.attributes}
+        }
+        with self._lock:
+            self._buffer.append(event)
+            if len(self._buffer) < self.flush_every:
+                return
+            events, self._buffer = self._buffer, []
+            self._write(events)
+
+    def _write(self, events: List[Dict[str, Any]]):
+        """Append events; lock must be held so writes from different threads do not interleave."""
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, "a") as f:
+            if new_file:
+                f.write("[\n")
+            f.write("".join(json.dumps(event, default=str) + ",\n" for event in events))
+        self.exported += len(events)
+
+    def flush(self):
+        with self._lock:
+            events, self._buffer = self._buffer, []
+            if events:
+                self._write(events)
+
+class Tracer:
+    def __init__(self, sample_rate: float = 0.0, exporter: Optional[ChromeTraceExporter] = None):
+        """
+        Per-call trace spans carried in a context variable.
+
+        start_trace() opens the root span of a contact call and always gives
+        it a trace ID, which StructuredLogger writes into every log line.
+        Only sample_rate of the traces are recorded: inside an unsampled
+        trace, span() returns a shared no-op scope, so tracing at full
+        traffic costs one context-variable lookup per instrumented step.
+
+        Args:
+            sample_rate: Fraction of traces recorded and exported.
+            exporter: Where finished spans go; None records nothing.
+        """
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    def configure(self, config: Dict[str, Any]):
+        """Apply the `tracing` section of config.json."""
+        if self.exporter is not None:
+            self.exporter.flush()
+        config = dict(config)
+        if not config.pop("enabled", False):
+            self.sample_rate, self.exporter = 0.0, None
+            return
+        self.sample_rate = config.pop("sample_rate", 0.01)
+        self.exporter = ChromeTraceExporter(**config)
+
+    def start_trace(self, name: str, **attributes) -> Any:
+        """Root span of a call; inside an existing trace it becomes a child span."""
+        parent = _current_span.get()
+        if parent is not None:
+            return self.span(name, **attributes) if parent.sampled else _NULL_SCOPE
+        sampled = self.exporter is not None and random.random() < self.sample_rate
+        return _SpanScope(self, Span(name, f"{random.getrandbits(64):016x}", None, sampled, attributes))
+
+    def span(self, name: str, **attributes) -> Any:
+        """Child span of the current span, recorded only when the trace is sampled."""
+        parent = _current_span.get()
+        if parent is None or not parent.sampled:
+            return _NULL_SCOPE
+        return _SpanScope(self, Span(name, parent.trace_id, parent.span_id, True, attributes))
+
+    def _finish(self, span: Span):
+        exporter = self.exporter
+        if exporter is not None:
+            exporter.export(span)
+
+    def flush(self):
+        if self.exporter is not None:
+            self.exporter.flush()
+
+# Global instance
+tracer = Tracer()
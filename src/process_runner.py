@@ -0,0 +1,84 @@
+import copy
+import logging
+import multiprocessing
+import os
+from dataclasses import replace
+from typing import Any, Dict, List, Optional
+from src.app import AICallAgent
+from src.core.call_queue import CallResult
+from src.core.durable_queue import DurableCallQueue
+
+logger = logging.getLogger(__name__)
+
+def _worker_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    config = copy.deepcopy(config)
+    # Every worker would try to bind the same metrics port
+    config.setdefault('metrics', {})['enabled'] = False
+    durable = config.get('call_queue', {}).get('durable')
+    if durable:
+        # An open commit group holds SQLite's write lock and would stall the other workers
+        durable['commit_batch'] = 1
+    return config
+
+def _run_worker(config: Dict[str, Any], contacts: Optional[List[str]], campaign: str) -> List[CallResult]:
+    """Entry point of one worker process: its own agent, sharing breaker state through the config's backend."""
+    agent = AICallAgent(config)
+    agent.start()
+    try:
+        if contacts is None:
+            results = agent.process_durable_queue(campaign)
+        else:
+            results = agent.process_call_queue(contacts)
+    finally:
+        agent.stop()
+    # Exceptions may not pickle; error_type and error carry what the parent needs
+    return [replace(result, exception=None) for result in results]
+
+class MultiProcessRunner:
+    def __init__(self, config: Dict[str, Any], processes: Optional[int] = None):
+        """
+        Process a call queue with one AICallAgent per CPU core.
+
+        Set `shared_state` in the config (an "mmap" file on one host, or
+        "redis" across hosts) so the workers trip and recover their circuit
+        breakers together. With `call_queue.durable` enabled the workers
+        drain the shared SQLite queue; otherwise the contacts are split
+        round-robin between them. Workers run without the metrics endpoint.
+
+        Args:
+            config: Agent configuration, as loaded from config.json.
+            processes: Worker processes; defaults to the number of CPU cores.
+        """
+        self.config = config
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.durable = config.get('call_queue', {}).get('durable', {}).get('enabled', False)
+        # "spawn" gives every worker fresh locks and threads on all platforms
+        self._context = multiprocessing.get_context("spawn")
+
+    def run(self, contacts: List[str], campaign: str = "default") -> List[CallResult]:
+        """
+        Call every contact. Results are in contact order, except with the
+        durable queue, where they also include contacts left from earlier runs.
+        """
+        worker_config = _worker_config(self.config)
+        if self.durable:
+            options = {k: v for k, v in worker_config['call_queue']['durable'].items()
+                       if k not in ('enabled', 'retry_delay', 'outage_requeue_delay')}
+            queue = DurableCallQueue(**options)
+            queue.enqueue(contacts, campaign=campaign)
+            queue.close()
+            chunks: List[Optional[List[str]]] = [None] * self.processes
+        elif not contacts:
+            return []
+        else:
+            workers = min(self.processes, len(contacts))
+            chunks = [contacts[i::workers] for i in range(workers)]
+
+        logger.info(f"Processing {len(contacts)} contacts in {len(chunks)} worker process(es)...")
+        with self._context.Pool(len(chunks)) as pool:
+            outputs = pool.starmap(_run_worker, [(worker_config, chunk, campaign) for chunk in chunks])
+
+        if self.durable:
+            return [result for output in outputs for result in output]
+        # Undo the round-robin split
+        return [outputs[index % len(chunks)][index // len(chunks)] for index in range(len(contacts))]
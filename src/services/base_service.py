@@ -1,28 +1,291 @@
 from abc import ABC, abstractmethod
+import inspect
 import logging
-from typing import Any
-from src.core.resilience.circuit_breaker import CircuitBreaker
-from src.core.resilience.retry import retry_with_backoff
+from typing import Any, Dict, List, Optional, Tuple
+from src.core import clock
+from src.core.resilience.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError
+from src.core.resilience.fallback import FallbackPolicy
+from src.core.resilience.bulkhead import Bulkhead
+from src.core.resilience.rate_limiter import ServiceRateLimiter
+from src.core.exceptions import TransientError
+from src.core.resilience.retry import retry_with_backoff, async_retry_with_backoff
+from src.core.resilience.retry_budget import RetryBudget
+from src.core.resilience.deadline import current_deadline
+from src.core.cache import ResponseCache, make_cache_key
+from src.core.batching import MicroBatcher
 from src.monitoring.logger import app_logger
+from src.monitoring.metrics import metrics
+from src.monitoring.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+REQUEST_LATENCY = metrics.histogram(
+    "service_request_duration_seconds", "Service call latency including retries", ("service", "outcome")
+)
+ATTEMPT_LATENCY = metrics.histogram(
+    "service_attempt_duration_seconds", "Latency of each individual attempt", ("service", "attempt")
+)
+IN_FLIGHT = metrics.gauge("service_requests_in_flight", "Service calls currently running", ("service",))
+
+class _FailedBatch(TransientError):
+    """A batch call that returned, but with too many failed items; carries the per-item results."""
+    def __init__(self, results: List[Any], failed: int, service_name: str):
+        super().__init__(f"{failed} of {len(results)} batch items failed", service_name)
+        self.results = results
 
 class BaseService(ABC):
-    def __init__(self, name: str, retry_config: dict, cb_config: dict):
+    # Calls whose results must never be cached, e.g. ones returning a stream
+    uncached_functions: tuple = ()
+
+    def __init__(
+        self,
+        name: str,
+        retry_config: dict,
+        cb_config: dict,
+        cache_config: Optional[dict] = None,
+        fallback_config: Optional[dict] = None
+    ):
         self.name = name
-        self.retry_config = retry_config
+        # The optional "budget" entry configures a RetryBudget shared by every call to this service
+        self.retry_config = dict(retry_config)
+        budget_config = self.retry_config.pop("budget", None)
+        self.retry_budget = RetryBudget(**budget_config) if budget_config else None
         self.circuit_breaker = CircuitBreaker(
             service_name=name,
             **cb_config
         )
+        # Optional response cache; "functions" limits it to specific provider calls
+        cache_config = dict(cache_config or {})
+        enabled = cache_config.pop("enabled", True) if cache_config else False
+        self.cached_functions = cache_config.pop("functions", None)
+        self.cache = ResponseCache(**cache_config) if enabled else None
+        # What to serve instead of failing while the circuit is OPEN
+        self.fallback = FallbackPolicy(**fallback_config) if fallback_config else None
+        self.fallback_provider: Optional["BaseService"] = None
+        self.bulkhead: Optional[Bulkhead] = None
+        self.rate_limiter: Optional[ServiceRateLimiter] = None
+        self.batchers: Dict[str, MicroBatcher] = {}
+
+    def set_concurrency_limit(self, limit: Optional[int]):
+        """Cap how many requests may be in flight to this service at once (None = unlimited)."""
+        self.configure_bulkhead(limit)
+
+    def configure_bulkhead(self, max_concurrent: Optional[int], queue_timeout: Optional[float] = None, adaptive: Optional[dict] = None):
+        """
+        Isolate this service behind a Bulkhead (None removes it). Waiting for
+        a slot is also bounded by the call deadline.
+        """
+        if not max_concurrent:
+            self.bulkhead = None
+            return
+        self.bulkhead = Bulkhead(self.name, max_concurrent, queue_timeout=queue_timeout, adaptive=adaptive)
+
+    def configure_rate_limit(self, **options):
+        """Apply ServiceRateLimiter options (no options removes the limiter)."""
+        self.rate_limiter = ServiceRateLimiter(self.name, **options) if options else None
+
+    def _rate_cost(self, func_name: str, args: tuple, kwargs: dict) -> int:
+        """Characters a call counts against chars_per_second; overridden by TTS services."""
+        return 0
+
+    def _acquire_rate_limit(self, func_name: str, args: tuple, kwargs: dict):
+        max_wait = self.rate_limiter.max_wait
+        deadline = current_deadline()
+        if deadline is not None:
+            max_wait = min(max_wait, deadline.remaining())
+        self.rate_limiter.acquire(self._rate_cost(func_name, args, kwargs), max_wait=max_wait)
+
+    async def _acquire_rate_limit_async(self, func_name: str, args: tuple, kwargs: dict):
+        max_wait = self.rate_limiter.max_wait
+        deadline = current_deadline()
+        if deadline is not None:
+            max_wait = min(max_wait, deadline.remaining())
+        await self.rate_limiter.acquire_async(self._rate_cost(func_name, args, kwargs), max_wait=max_wait)
+
+    def configure_batching(
+        self,
+        func_name: str,
+        max_batch_size: int = 16,
+        max_wait: float = 0.01,
+        failure_rate_threshold: float = 0.5
+    ):
+        """
+        Send concurrent calls of func_name upstream together through its
+        batch variant `_<func_name>_batch`, which takes a list of argument
+        tuples and returns one result (or exception instance) per call.
+
+        Only synchronous calls without keyword arguments are batched.
+        The rate limit, bulkhead and circuit breaker apply once per batch;
+        retries, the retry budget and the call deadline stay per call, so a
+        retried call simply joins the next batch. A batch whose items failed
+        with transient errors at failure_rate_threshold or above counts as a
+        failed attempt for the circuit breaker and the adaptive bulkhead,
+        while each caller still gets its own result.
+        """
+        if not hasattr(self, f"_{func_name}_batch"):
+            raise ValueError(f"{self.name} has no batch variant for {func_name}")
+        self.batchers[func_name] = MicroBatcher(
+            f"{self.name}.{func_name}",
+            lambda calls: self._execute_batch(func_name, calls, failure_rate_threshold),
+            max_batch_size=max_batch_size,
+            max_wait=max_wait
+        )
+
+    def _batcher_for(self, func_name: str, kwargs: dict) -> Optional[MicroBatcher]:
+        return None if kwargs else self.batchers.get(func_name)
+
+    def _execute_batch(self, func_name: str, calls: List[tuple], failure_rate_threshold: float = 0.5) -> List[Any]:
+        """One upstream attempt for a whole micro-batch."""
+        batch_name = f"{func_name}_batch"
+        func = getattr(self, f"_{batch_name}")
+        if self.rate_limiter is not None:
+            self._acquire_rate_limit(batch_name, (calls,), {})
+        bulkhead = self.bulkhead
+        if bulkhead is not None:
+            bulkhead.acquire(self._bulkhead_timeout())
+
+        def send_batch() -> List[Any]:
+            results = func(calls)
+            failed = sum(1 for result in results if isinstance(result, TransientError))
+            if failed and failed >= failure_rate_threshold * len(results):
+                # Raised through the breaker so it counts as a failure; the items are still delivered below
+                raise _FailedBatch(results, failed, self.name)
+            return results
+
+        attempt_start = clock.perf_counter()
+        try:
+            with tracer.span("attempt", service=self.name, func=batch_name, batch_size=len(calls)):
+                results = self.circuit_breaker.call(send_batch)
+        except _FailedBatch as failed_batch:
+            self._record_attempt(1, clock.perf_counter() - attempt_start, failed_batch)
+            return failed_batch.results
+        except Exception as batch_error:
+            self._record_attempt(1, clock.perf_counter() - attempt_start, batch_error)
+            raise
+        finally:
+            if bulkhead is not None:
+                bulkhead.release()
+        self._record_attempt(1, clock.perf_counter() - attempt_start, None)
+        return results
+
+    def _bulkhead_timeout(self) -> Optional[float]:
+        timeout = self.bulkhead.queue_timeout
+        deadline = current_deadline()
+        if deadline is not None:
+            timeout = deadline.remaining() if timeout is None else min(timeout, deadline.remaining())
+        return timeout
+
+    def _record_attempt(self, attempt: int, latency: float, error: Optional[Exception]):
+        # Open-circuit rejections never reached the provider
+        if isinstance(error, CircuitBreakerOpenError):
+            return
+        ATTEMPT_LATENCY.labels(self.name, attempt).observe(latency)
+        if self.bulkhead is not None:
+            self.bulkhead.record(latency, failed=isinstance(error, TransientError))
+
+    def get_status(self) -> dict:
+        """Circuit breaker, bulkhead and rate limiter state for dashboards."""
+        return {
+            "name": self.name,
+            "circuit_breaker": self.circuit_breaker.get_status(),
+            "bulkhead": self.bulkhead.get_status() if self.bulkhead else None,
+            "rate_limiter": self.rate_limiter.get_status() if self.rate_limiter else None,
+            "batching": {func_name: batcher.get_status() for func_name, batcher in self.batchers.items()}
+        }
+
+    def set_fallback_provider(self, provider: Optional["BaseService"]):
+        """Secondary provider used by the "secondary" fallback strategy."""
+        self.fallback_provider = provider
+
+    def _is_cached(self, func_name: str) -> bool:
+        if self.cache is None or func_name in self.uncached_functions:
+            return False
+        return self.cached_functions is None or func_name in self.cached_functions
+
+    def _log_cache_hit(self):
+        app_logger.log_event(
+            self.name,
+            "CACHE_HIT",
+            {"circuit_state": self.circuit_breaker.state.value, **self.cache.get_stats()}
+        )
 
     def execute(self, func_name: str, *args, **kwargs) -> Any:
-        """Execute a service function with retry and circuit breaker logic."""
+        """Execute a service function with caching, retry, circuit breaker and fallback logic."""
+        try:
+            return self.execute_without_fallback(func_name, *args, **kwargs)
+        except CircuitBreakerOpenError as e:
+            served, value = self.serve_fallback(func_name, args, kwargs, e)
+            if served:
+                return value
+            raise
+
+    def serve_fallback(self, func_name: str, args: tuple, kwargs: dict, error: Exception) -> Tuple[bool, Any]:
+        """Try the fallback strategies for a failed call. Returns (served, value)."""
+        if self.fallback is None:
+            return False, None
+        for strategy in self.fallback.strategies:
+            if strategy == "secondary":
+                if self.fallback_provider is None:
+                    continue
+                try:
+                    value = self.fallback_provider.execute(func_name, *args, **kwargs)
+                except Exception as secondary_error:
+                    logger.warning(f"Secondary provider for {self.name} failed: {secondary_error}")
+                    continue
+            else:
+                found, value = self.fallback.resolve_local(strategy, self.cache, make_cache_key(func_name, args, kwargs))
+                if not found:
+                    continue
+            self._log_fallback(strategy, error)
+            return True, value
+        return False, None
+
+    def _log_fallback(self, strategy: str, error: Exception):
+        self.fallback.record(strategy)
+        app_logger.log_event(
+            self.name,
+            "FALLBACK_SERVED",
+            {
+                "fallback": strategy,
+                "error": str(error),
+                "circuit_state": self.circuit_breaker.state.value
+            }
+        )
+
+    def execute_without_fallback(self, func_name: str, *args, **kwargs) -> Any:
+        """execute() minus the fallback, for callers such as ProviderPool that fail over themselves."""
+        if not self._is_cached(func_name):
+            return self._execute(func_name, *args, **kwargs)
+
+        key = make_cache_key(func_name, args, kwargs)
+        cached, result = self.cache.get_or_load(
+            key, lambda: self._execute(func_name, *args, **kwargs)
+        )
+        if cached:
+            self._log_cache_hit()
+        return result
+
+    def _start_event_data(self, func_name: str) -> dict:
+        data = {"circuit_state": self.circuit_breaker.state.value}
+        if self._is_cached(func_name):
+            data.update({"cache": "MISS", **self.cache.get_stats()})
+        return data
+
+    def _execute(self, func_name: str, *args, **kwargs) -> Any:
         func = getattr(self, f"_{func_name}")
+        batcher = self._batcher_for(func_name, kwargs)
+        if self.retry_budget:
+            self.retry_budget.record_request()
+        in_flight = IN_FLIGHT.labels(self.name)
+        in_flight.inc()
+        start = clock.perf_counter()
+        attempts = 0
         
         # Log CBA state before call
         app_logger.log_event(
             self.name, 
             "REQUEST_START", 
-            {"circuit_state": self.circuit_breaker.state.value}
+            self._start_event_data(func_name)
         )
 
         try:
@@ -31,32 +294,195 @@ class BaseService(ABC):
             # If the circuit breaker opens during retries, it will fail fast for subsequent attempts.
             
             def attempt_with_cb():
-                return self.circuit_breaker.call(lambda: func(*args, **kwargs))
+                nonlocal attempts
+                attempts += 1
+                if batcher is not None:
+                    # The circuit breaker and limits are applied to the shared batch call
+                    return batcher.submit(args)
+                if self.rate_limiter is not None:
+                    # Every attempt reaches the vendor, so every attempt is rate limited
+                    self._acquire_rate_limit(func_name, args, kwargs)
+                # The bulkhead slot is held per attempt, never across a backoff sleep
+                bulkhead = self.bulkhead
+                if bulkhead is not None:
+                    bulkhead.acquire(self._bulkhead_timeout())
+                attempt_start = clock.perf_counter()
+                try:
+                    # A breaker rejection shows up as an attempt span with error=CircuitBreakerOpenError
+                    with tracer.span("attempt", service=self.name, func=func_name, attempt=attempts):
+                        result = self.circuit_breaker.call(lambda: func(*args, **kwargs))
+                except Exception as attempt_error:
+                    self._record_attempt(attempts, clock.perf_counter() - attempt_start, attempt_error)
+                    raise
+                finally:
+                    if bulkhead is not None:
+                        bulkhead.release()
+                self._record_attempt(attempts, clock.perf_counter() - attempt_start, None)
+                return result
 
             result = retry_with_backoff(
                 func=attempt_with_cb,
                 service_name=self.name,
+                deadline=current_deadline(),
+                retry_budget=self.retry_budget,
                 **self.retry_config
             )
             
+            duration = clock.perf_counter() - start
+            REQUEST_LATENCY.labels(self.name, "success").observe(duration)
             app_logger.log_event(
                 self.name, 
                 "REQUEST_SUCCESS", 
-                {"circuit_state": self.circuit_breaker.state.value}
+                {"circuit_state": self.circuit_breaker.state.value, "duration": round(duration, 4), "attempts": attempts}
             )
             return result
 
         except Exception as e:
+            duration = clock.perf_counter() - start
+            REQUEST_LATENCY.labels(self.name, "failure").observe(duration)
             app_logger.log_event(
                 self.name, 
                 "REQUEST_FAILURE", 
                 {
+                    "duration": round(duration, 4),
+                    "attempts": attempts,
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                    "circuit_state": self.circuit_breaker.state.value
+                }
+            )
+            raise e
+        finally:
+            in_flight.dec()
+
+    async def execute_async(self, func_name: str, *args, **kwargs) -> Any:
+        """
+        Async variant of execute().
+
+        The provider function may be a coroutine function or a plain function;
+        either way, backoff waits yield the event loop instead of a thread.
+        Cache hits are served as in execute(), without single-flight coalescing.
+        """
+        try:
+            return await self.execute_without_fallback_async(func_name, *args, **kwargs)
+        except CircuitBreakerOpenError as e:
+            served, value = await self.serve_fallback_async(func_name, args, kwargs, e)
+            if served:
+                return value
+            raise
+
+    async def serve_fallback_async(self, func_name: str, args: tuple, kwargs: dict, error: Exception) -> Tuple[bool, Any]:
+        """Async variant of serve_fallback()."""
+        if self.fallback is None:
+            return False, None
+        for strategy in self.fallback.strategies:
+            if strategy == "secondary":
+                if self.fallback_provider is None:
+                    continue
+                try:
+                    value = await self.fallback_provider.execute_async(func_name, *args, **kwargs)
+                except Exception as secondary_error:
+                    logger.warning(f"Secondary provider for {self.name} failed: {secondary_error}")
+                    continue
+            else:
+                found, value = self.fallback.resolve_local(strategy, self.cache, make_cache_key(func_name, args, kwargs))
+                if not found:
+                    continue
+            self._log_fallback(strategy, error)
+            return True, value
+        return False, None
+
+    async def execute_without_fallback_async(self, func_name: str, *args, **kwargs) -> Any:
+        """Async variant of execute_without_fallback()."""
+        if not self._is_cached(func_name):
+            return await self._execute_async(func_name, *args, **kwargs)
+
+        key = make_cache_key(func_name, args, kwargs)
+        cached, result = await self.cache.get_or_load_async(
+            key, lambda: self._execute_async(func_name, *args, **kwargs)
+        )
+        if cached:
+            self._log_cache_hit()
+        return result
+
+    async def _execute_async(self, func_name: str, *args, **kwargs) -> Any:
+        func = getattr(self, f"_{func_name}")
+        if self.retry_budget:
+            self.retry_budget.record_request()
+        in_flight = IN_FLIGHT.labels(self.name)
+        in_flight.inc()
+        start = clock.perf_counter()
+        attempts = 0
+
+        app_logger.log_event(
+            self.name,
+            "REQUEST_START",
+            self._start_event_data(func_name)
+        )
+
+        try:
+            async def call_func():
+                result = func(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+
+            # Same layering as execute(): the circuit breaker sits inside the retry loop
+            async def attempt_with_cb():
+                nonlocal attempts
+                attempts += 1
+                if self.rate_limiter is not None:
+                    await self._acquire_rate_limit_async(func_name, args, kwargs)
+                bulkhead = self.bulkhead
+                if bulkhead is not None:
+                    await bulkhead.acquire_async(self._bulkhead_timeout())
+                attempt_start = clock.perf_counter()
+                try:
+                    with tracer.span("attempt", service=self.name, func=func_name, attempt=attempts):
+                        result = await self.circuit_breaker.call_async(call_func)
+                except Exception as attempt_error:
+                    self._record_attempt(attempts, clock.perf_counter() - attempt_start, attempt_error)
+                    raise
+                finally:
+                    if bulkhead is not None:
+                        bulkhead.release()
+                self._record_attempt(attempts, clock.perf_counter() - attempt_start, None)
+                return result
+
+            result = await async_retry_with_backoff(
+                func=attempt_with_cb,
+                service_name=self.name,
+                deadline=current_deadline(),
+                retry_budget=self.retry_budget,
+                **self.retry_config
+            )
+
+            duration = clock.perf_counter() - start
+            REQUEST_LATENCY.labels(self.name, "success").observe(duration)
+            app_logger.log_event(
+                self.name,
+                "REQUEST_SUCCESS",
+                {"circuit_state": self.circuit_breaker.state.value, "duration": round(duration, 4), "attempts": attempts}
+            )
+            return result
+
+        except Exception as e:
+            duration = clock.perf_counter() - start
+            REQUEST_LATENCY.labels(self.name, "failure").observe(duration)
+            app_logger.log_event(
+                self.name,
+                "REQUEST_FAILURE",
+                {
+                    "duration": round(duration, 4),
+                    "attempts": attempts,
                     "error": str(e),
                     "error_type": type(e).__name__,
                     "circuit_state": self.circuit_breaker.state.value
                 }
             )
             raise e
+        finally:
+            in_flight.dec()
 
     @abstractmethod
     def health_check(self) -> bool:
@@ -1,24 +1,94 @@
+from typing import Any, List, Optional
 import random
+from src.core import clock
 from src.services.base_service import BaseService
-from src.core.exceptions import ServiceUnavailableError, PermanentError
+from src.core.exceptions import ServiceUnavailableError, PermanentError, RateLimitExceededError, InvalidPayloadError
+from src.core.resilience.rate_limiter import TokenBucket
+from src.services.fault_injection import FaultProfile
 
 class ElevenLabsService(BaseService):
-    def __init__(self, retry_config: dict, cb_config: dict):
-        super().__init__("ElevenLabs", retry_config, cb_config)
+    def __init__(
+        self,
+        retry_config: dict,
+        cb_config: dict,
+        cache_config: Optional[dict] = None,
+        fallback_config: Optional[dict] = None,
+        name: str = "ElevenLabs"
+    ):
+        super().__init__(name, retry_config, cb_config, cache_config, fallback_config)
         self.is_down = False # For simulation
+        # Simulated synthesis time: fixed per request plus per character
+        self.synthesis_latency = 0.0
+        self.char_latency = 0.0
+        # Simulated vendor-side limit; when set, calls beyond it get a 429
+        self.vendor_rate_limit: Optional[TokenBucket] = None
+        # Load-test latency and failure phases; replaces the built-in random failures
+        self.fault_profile: Optional[FaultProfile] = None
 
     def generate_speech(self, text: str):
         return self.execute("generate_speech_call", text)
 
+    async def generate_speech_async(self, text: str):
+        return await self.execute_async("generate_speech_call", text)
+
     def _generate_speech_call(self, text: str):
         if self.is_down:
             raise ServiceUnavailableError("ElevenLabs is currently down (Simulated 503)", service_name=self.name)
+
+        if self.vendor_rate_limit is not None and not self.vendor_rate_limit.try_acquire():
+            raise RateLimitExceededError(
+                "ElevenLabs rate limit exceeded (Simulated 429)",
+                service_name=self.name,
+                retry_after=self.vendor_rate_limit.time_until_available()
+            )
         
+        if self.fault_profile is not None:
+            self.fault_profile.inject(ServiceUnavailableError("ElevenLabs failure (Simulated fault)", service_name=self.name))
         # Simulate occasional random failures
-        if random.random() < 0.1:
+        elif random.random() < 0.1:
             raise ServiceUnavailableError("Random ElevenLabs failure", service_name=self.name)
-            
+
+        if self.synthesis_latency or self.char_latency:
+            clock.sleep(self.synthesis_latency + self.char_latency * len(text))
         return f"Speech audio for: {text}"
 
+    def _generate_speech_call_batch(self, calls: List[tuple]) -> List[Any]:
+        """
+        Simulated batch endpoint: one request for many texts. The fixed
+        per-request latency is paid once, and each text can fail on its own.
+        """
+        if self.is_down:
+            raise ServiceUnavailableError("ElevenLabs is currently down (Simulated 503)", service_name=self.name)
+
+        if self.vendor_rate_limit is not None and not self.vendor_rate_limit.try_acquire():
+            raise RateLimitExceededError(
+                "ElevenLabs rate limit exceeded (Simulated 429)",
+                service_name=self.name,
+                retry_after=self.vendor_rate_limit.time_until_available()
+            )
+
+        if self.fault_profile is not None:
+            self.fault_profile.inject(ServiceUnavailableError("ElevenLabs failure (Simulated fault)", service_name=self.name))
+
+        texts = [call[0] for call in calls]
+        if self.synthesis_latency or self.char_latency:
+            clock.sleep(self.synthesis_latency + self.char_latency * sum(len(text) for text in texts))
+
+        results = []
+        for text in texts:
+            if not text.strip():
+                results.append(InvalidPayloadError("Empty text in batch item (Simulated 400)", service_name=self.name))
+            elif self.fault_profile is None and random.random() < 0.1:
+                results.append(ServiceUnavailableError("Random ElevenLabs batch item failure", service_name=self.name))
+            else:
+                results.append(f"Speech audio for: {text}")
+        return results
+
+    def _rate_cost(self, func_name: str, args: tuple, kwargs: dict) -> int:
+        if func_name == "generate_speech_call_batch":
+            return sum(len(call[0]) for call in args[0])
+        text = args[0] if args else kwargs.get("text", "")
+        return len(text) if func_name == "generate_speech_call" else 0
+
     def health_check(self) -> bool:
-        return not self.is_down
+        return not self.is_down and (self.fault_profile is None or self.fault_profile.is_healthy())
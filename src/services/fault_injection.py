@@ -0,0 +1,132 @@
+import math
+import random
+from typing import Any, Dict, List, Optional, Tuple
+from src.core import clock
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+PHASE_TYPES = ("outage", "error_burst", "brownout", "flapping")
+
+class FaultPhase:
+    def __init__(
+        self,
+        type: str,
+        start: float,
+        duration: float,
+        error_rate: Optional[float] = None,
+        latency_multiplier: float = 1.0,
+        period: float = 60.0,
+        down_fraction: float = 0.5
+    ):
+        """
+        One time window of degraded behaviour.
+
+        Args:
+            type: "outage" (every call fails), "error_burst" (error_rate of
+                calls fail), "brownout" (latency x latency_multiplier and
+                error_rate of calls fail) or "flapping" (fully down for the
+                first down_fraction of every period seconds, healthy otherwise).
+            start: Seconds after the profile's start when the phase begins.
+            duration: Length of the phase in seconds.
+            error_rate: Failure probability while the phase is active.
+            latency_multiplier: Latency factor during a brownout.
+            period: Flapping cycle length in seconds.
+            down_fraction: Share of each flapping cycle spent down.
+        """
+        if type not in PHASE_TYPES:
+            raise ValueError(f"Unknown fault phase type: {type}")
+        self.type = type
+        self.start = start
+        self.duration = duration
+        defaults = {"outage": 1.0, "error_burst": 0.5, "brownout": 0.1, "flapping": 0.0}
+        self.error_rate = defaults[type] if error_rate is None else error_rate
+        self.latency_multiplier = latency_multiplier if type == "brownout" else 1.0
+        self.period = period
+        self.down_fraction = down_fraction
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+    def active(self, elapsed: float) -> bool:
+        return self.start <= elapsed < self.end
+
+    def is_down(self, elapsed: float) -> bool:
+        """Whether a health probe would fail at this moment."""
+        if not self.active(elapsed):
+            return False
+        if self.type == "outage":
+            return True
+        if self.type == "flapping":
+            return (elapsed - self.start) % self.period < self.period * self.down_fraction
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": self.type, "start": self.start, "end": self.end}
+
+class FaultProfile:
+    def __init__(
+        self,
+        latency: Optional[Dict[str, Any]] = None,
+        error_rate: float = 0.0,
+        phases: Optional[List[Dict[str, Any]]] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Latency and failures for a simulated provider, on the process clock.
+
+        Times are measured from the moment the profile is created, so with a
+        VirtualClock the same seed always produces the same timeline.
+
+        Args:
+            latency: {"distribution": one of LATENCY_DISTRIBUTIONS, plus
+                "value" (constant), "low"/"high" (uniform), "mean"
+                (exponential) or "median"/"sigma" (lognormal)}.
+            error_rate: Baseline failure probability outside any phase.
+            phases: FaultPhase options, e.g. {"type": "outage", "start": 600, "duration": 3600}.
+            seed: Seed for this profile's random numbers.
+        """
+        self.latency = dict(latency or {"distribution": "constant", "value": 0.0})
+        if self.latency.get("distribution", "constant") not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.latency.get('distribution')}")
+        self.error_rate = error_rate
+        self.phases = [FaultPhase(**phase) for phase in (phases or [])]
+        self.started_at = clock.monotonic()
+        self._rng = random.Random(seed)
+
+    def elapsed(self) -> float:
+        return clock.monotonic() - self.started_at
+
+    def _base_latency(self) -> float:
+        options = self.latency
+        distribution = options.get("distribution", "constant")
+        if distribution == "uniform":
+            return self._rng.uniform(options.get("low", 0.0), options.get("high", 0.0))
+        if distribution == "exponential":
+            mean = options.get("mean", 0.0)
+            return self._rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+        if distribution == "lognormal":
+            return self._rng.lognormvariate(math.log(options.get("median", 0.1)), options.get("sigma", 0.5))
+        return options.get("value", 0.0)
+
+    def sample(self) -> Tuple[float, bool]:
+        """Latency and failure decision for one call made now."""
+        elapsed = self.elapsed()
+        latency = self._base_latency()
+        error_rate = self.error_rate
+        for phase in self.phases:
+            if not phase.active(elapsed):
+                continue
+            latency *= phase.latency_multiplier
+            error_rate = max(error_rate, 1.0 if phase.is_down(elapsed) else phase.error_rate)
+        return latency, self._rng.random() < error_rate
+
+    def inject(self, error: Exception):
+        """Spend one call's latency on the clock, then raise error if the call fails."""
+        latency, failed = self.sample()
+        clock.sleep(latency)
+        if failed:
+            raise error
+
+    def is_healthy(self) -> bool:
+        elapsed = self.elapsed()
+        return not any(phase.is_down(elapsed) for phase in self.phases)
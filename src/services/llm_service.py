@@ -1,20 +1,102 @@
+from typing import Any, Iterator, List, Optional
 import random
+import re
+from src.core import clock
 from src.services.base_service import BaseService
-from src.core.exceptions import ServiceTimeoutError, AuthenticationError
+from src.core.exceptions import ServiceTimeoutError, AuthenticationError, InvalidPayloadError
+from src.services.fault_injection import FaultProfile
 
 class LLMService(BaseService):
-    def __init__(self, retry_config: dict, cb_config: dict):
-        super().__init__("LLMProvider", retry_config, cb_config)
+    uncached_functions = ("stream_response_call",)
+
+    def __init__(
+        self,
+        retry_config: dict,
+        cb_config: dict,
+        cache_config: Optional[dict] = None,
+        fallback_config: Optional[dict] = None,
+        name: str = "LLMProvider"
+    ):
+        super().__init__(name, retry_config, cb_config, cache_config, fallback_config)
         self.is_down = False
+        # Simulated generation speed, used to benchmark streaming offline
+        self.first_token_latency = 0.0
+        self.token_latency = 0.0
+        # Load-test latency and failure phases
+        self.fault_profile: Optional[FaultProfile] = None
 
     def get_response(self, prompt: str):
         return self.execute("get_response_call", prompt)
 
+    async def get_response_async(self, prompt: str):
+        return await self.execute_async("get_response_call", prompt)
+
+    def stream_response(self, prompt: str) -> Iterator[str]:
+        """
+        Yield the response token by token. Opening the stream goes through
+        retry and the circuit breaker; the tokens themselves are not retried.
+        """
+        tokens = self.execute("stream_response_call", prompt)
+        if isinstance(tokens, str):
+            # A fallback response arrives whole
+            return iter([tokens])
+        return tokens
+
+    def _inject_fault(self):
+        if self.fault_profile is not None:
+            self.fault_profile.inject(ServiceTimeoutError("LLM Provider timed out (Simulated fault)", service_name=self.name))
+
     def _get_response_call(self, prompt: str):
         if self.is_down:
             raise ServiceTimeoutError("LLM Provider timed out (Simulated)", service_name=self.name)
-            
-        return f"AI response to: {prompt}"
+        self._inject_fault()
+
+        text = f"AI response to: {prompt}"
+        if self.first_token_latency or self.token_latency:
+            clock.sleep(self.first_token_latency + self.token_latency * len(self._tokenize(text)))
+        return text
+
+    def _get_response_call_batch(self, calls: List[tuple]) -> List[Any]:
+        """
+        Simulated batch endpoint: prompts are generated side by side, so the
+        batch takes as long as its longest response.
+        """
+        if self.is_down:
+            raise ServiceTimeoutError("LLM Provider timed out (Simulated)", service_name=self.name)
+        self._inject_fault()
+
+        results: List[Any] = []
+        longest = 0
+        for call in calls:
+            prompt = call[0]
+            if not prompt.strip():
+                results.append(InvalidPayloadError("Empty prompt in batch item (Simulated 400)", service_name=self.name))
+                continue
+            text = f"AI response to: {prompt}"
+            longest = max(longest, len(self._tokenize(text)))
+            results.append(text)
+        if self.first_token_latency or self.token_latency:
+            clock.sleep(self.first_token_latency + self.token_latency * longest)
+        return results
+
+    def _stream_response_call(self, prompt: str) -> Iterator[str]:
+        if self.is_down:
+            raise ServiceTimeoutError("LLM Provider timed out (Simulated)", service_name=self.name)
+        self._inject_fault()
+
+        if self.first_token_latency:
+            clock.sleep(self.first_token_latency)
+        return self._generate_tokens(f"AI response to: {prompt}")
+
+    def _generate_tokens(self, text: str) -> Iterator[str]:
+        for token in self._tokenize(text):
+            if self.token_latency:
+                clock.sleep(self.token_latency)
+            yield token
+
+    @staticmethod
+    def _tokenize(text: str):
+        return re.findall(r"\S+\s*", text)
 
     def health_check(self) -> bool:
-        return not self.is_down
+        return not self.is_down and (self.fault_profile is None or self.fault_profile.is_healthy())
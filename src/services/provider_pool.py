@@ -0,0 +1,345 @@
+import asyncio
+import contextvars
+import logging
+import random
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from src.core import clock
+from src.core.exceptions import TransientError
+from src.core.resilience.circuit_breaker import CircuitBreakerOpenError
+from src.services.base_service import BaseService
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the next backend is tried; anything else (e.g. a bad payload) is raised
+FAILOVER_ERRORS = (TransientError, CircuitBreakerOpenError)
+
+@dataclass
+class _BackendStats:
+    """Routing statistics for one backend."""
+    latency: float = 0.0
+    error_rate: float = 0.0
+    samples: int = 0
+    in_flight: int = 0
+    recent: deque = field(default_factory=lambda: deque(maxlen=200))
+
+class ProviderPool:
+    def __init__(
+        self,
+        role: str,
+        backends: List[BaseService],
+        ewma_alpha: float = 0.3,
+        hedge: bool = False,
+        hedge_quantile: float = 95.0,
+        hedge_min_samples: int = 20,
+        max_hedge_workers: int = 32
+    ):
+        """
+        Several interchangeable backends for one service role (e.g. TTS).
+
+        Each request goes to the better of two randomly chosen backends
+        (power of two choices), scored by EWMA latency, EWMA error rate and
+        requests in flight. Backends whose circuit is OPEN are skipped. If the
+        chosen backend fails with a transient error, the next best one is
+        tried. When every backend has failed, the first backend's fallback
+        policy is used.
+
+        Args:
+            role: Role name used in logs, e.g. "llm".
+            backends: Services implementing the same calls; the first is the primary.
+            ewma_alpha: Weight of the newest sample in the latency/error averages.
+            hedge: Send a second request to another backend once the first has
+                run longer than its hedge_quantile latency.
+            hedge_quantile: Latency percentile that triggers a hedged request.
+            hedge_min_samples: Samples a backend needs before it is hedged.
+            max_hedge_workers: Threads available to hedged synchronous calls.
+        """
+        if not backends:
+            raise ValueError(f"Provider pool {role} needs at least one backend")
+        self.role = role
+        self.backends = list(backends)
+        self.ewma_alpha = ewma_alpha
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self._stats: Dict[str, _BackendStats] = {backend.name: _BackendStats() for backend in self.backends}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_hedge_workers, thread_name_prefix=f"hedge-{role}") if hedge else None
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    @property
+    def primary(self) -> BaseService:
+        return self.backends[0]
+
+    def _cost(self, backend: BaseService) -> float:
+        stats = self._stats[backend.name]
+        # Unmeasured backends look cheap so they get explored
+        return stats.latency * (stats.in_flight + 1) / max(0.01, 1.0 - stats.error_rate)
+
+    def _route(self) -> List[BaseService]:
+        """Backends in the order they should be tried for one request."""
+        candidates = [backend for backend in self.backends if backend.circuit_breaker.is_call_permitted()]
+        if not candidates:
+            # Everything is OPEN: the calls fail fast and lead to the fallback
+            return list(self.backends)
+        if len(candidates) > 2:
+            first, second = random.sample(candidates, 2)
+            chosen = first if self._cost(first) <= self._cost(second) else second
+        else:
+            chosen = min(candidates, key=self._cost)
+        rest = sorted((backend for backend in candidates if backend is not chosen), key=self._cost)
+        return [chosen] + rest
+
+    def _record(self, backend: BaseService, latency: float, failed: bool):
+        with self._lock:
+            stats = self._stats[backend.name]
+            if stats.samples == 0:
+                stats.latency = latency
+            else:
+                stats.latency += self.ewma_alpha * (latency - stats.latency)
+            stats.error_rate += self.ewma_alpha * ((1.0 if failed else 0.0) - stats.error_rate)
+            stats.samples += 1
+            if not failed:
+                stats.recent.append(latency)
+
+    def _hedge_delay(self, backend: BaseService) -> Optional[float]:
+        if not self.hedge:
+            return None
+        with self._lock:
+            recent = sorted(self._stats[backend.name].recent)
+        if len(recent) < self.hedge_min_samples:
+            return None
+        index = min(len(recent) - 1, int(len(recent) * self.hedge_quantile / 100))
+        return recent[index]
+
+    def _begin(self, backend: BaseService) -> float:
+        with self._lock:
+            self._stats[backend.name].in_flight += 1
+        return clock.monotonic()
+
+    def _end(self, backend: BaseService, start: float, error: Optional[BaseException]):
+        with self._lock:
+            self._stats[backend.name].in_flight -= 1
+        # Open-circuit rejections and cancelled hedges say nothing about the backend's latency
+        if error is None or (isinstance(error, Exception) and not isinstance(error, CircuitBreakerOpenError)):
+            self._record(backend, clock.monotonic() - start, error is not None)
+
+    def _invoke(self, backend: BaseService, func_name: str, args: tuple, kwargs: dict) -> Any:
+        start = self._begin(backend)
+        try:
+            result = backend.execute_without_fallback(func_name, *args, **kwargs)
+        except BaseException as e:
+            self._end(backend, start, e)
+            raise
+        self._end(backend, start, None)
+        return result
+
+    async def _invoke_async(self, backend: BaseService, func_name: str, args: tuple, kwargs: dict) -> Any:
+        start = self._begin(backend)
+        try:
+            result = await backend.execute_without_fallback_async(func_name, *args, **kwargs)
+        except BaseException as e:
+            self._end(backend, start, e)
+            raise
+        self._end(backend, start, None)
+        return result
+
+    def execute(self, func_name: str, *args, **kwargs) -> Any:
+        """Run a service call on the best available backend, failing over and hedging as configured."""
+        order = self._route()
+        errors: List[Exception] = []
+        index = 0
+        while index < len(order):
+            backend = order[index]
+            delay = self._hedge_delay(backend) if index + 1 < len(order) else None
+            try:
+                if delay is None:
+                    index += 1
+                    return self._invoke(backend, func_name, args, kwargs)
+                # The hedged pair only fails once both backends have been called and failed
+                index += 2
+                return self._execute_hedged(backend, order[index - 1], delay, func_name, args, kwargs, errors)
+            except FAILOVER_ERRORS as e:
+                if delay is None:
+                    errors.append(e)
+                if index < len(order):
+                    self.failovers += 1
+                    logger.warning(f"{self.role} backend {order[index - 1].name} failed ({e}); failing over")
+        return self._fallback(func_name, args, kwargs, errors)
+
+    def _execute_hedged(
+        self,
+        first: BaseService,
+        second: BaseService,
+        delay: float,
+        func_name: str,
+        args: tuple,
+        kwargs: dict,
+        errors: List[Exception]
+    ) -> Any:
+        """
+        Call first, and second as well once first has run for `delay`.
+
+        If first fails before the hedge delay, second is called right away
+        as a plain failover. Failover errors of both calls are appended to
+        errors; the last one is raised when neither call succeeds.
+        """
+        # Worker threads do not inherit context variables such as the call deadline
+        first_future = self._executor.submit(contextvars.copy_context().run, self._invoke, first, func_name, args, kwargs)
+        done, _ = wait([first_future], timeout=delay)
+        if done:
+            error = first_future.exception()
+            if error is None:
+                return first_future.result()
+            if not isinstance(error, FAILOVER_ERRORS):
+                raise error
+            errors.append(error)
+            self.failovers += 1
+            logger.warning(f"{self.role} backend {first.name} failed ({error}); failing over")
+            try:
+                return self._invoke(second, func_name, args, kwargs)
+            except FAILOVER_ERRORS as e:
+                errors.append(e)
+                raise
+
+        self.hedged_requests += 1
+        futures = {
+            first_future: first,
+            self._executor.submit(contextvars.copy_context().run, self._invoke, second, func_name, args, kwargs): second
+        }
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    if futures[future] is second:
+                        self.hedge_wins += 1
+                    # A slower duplicate keeps running in the background; its result is dropped
+                    return future.result()
+                if not isinstance(error, FAILOVER_ERRORS):
+                    raise error
+                errors.append(error)
+        raise errors[-1]
+
+    async def execute_async(self, func_name: str, *args, **kwargs) -> Any:
+        """Async variant of execute(); a losing hedged request is cancelled."""
+        order = self._route()
+        errors: List[Exception] = []
+        index = 0
+        while index < len(order):
+            backend = order[index]
+            delay = self._hedge_delay(backend) if index + 1 < len(order) else None
+            try:
+                if delay is None:
+                    index += 1
+                    return await self._invoke_async(backend, func_name, args, kwargs)
+                # The hedged pair only fails once both backends have been called and failed
+                index += 2
+                return await self._execute_hedged_async(backend, order[index - 1], delay, func_name, args, kwargs, errors)
+            except FAILOVER_ERRORS as e:
+                if delay is None:
+                    errors.append(e)
+                if index < len(order):
+                    self.failovers += 1
+                    logger.warning(f"{self.role} backend {order[index - 1].name} failed ({e}); failing over")
+        return await self._fallback_async(func_name, args, kwargs, errors)
+
+    async def _execute_hedged_async(
+        self,
+        first: BaseService,
+        second: BaseService,
+        delay: float,
+        func_name: str,
+        args: tuple,
+        kwargs: dict,
+        errors: List[Exception]
+    ) -> Any:
+        first_task = asyncio.ensure_future(self._invoke_async(first, func_name, args, kwargs))
+        try:
+            done, _ = await asyncio.wait([first_task], timeout=delay)
+        except BaseException:
+            first_task.cancel()
+            raise
+        if done:
+            error = first_task.exception()
+            if error is None:
+                return first_task.result()
+            if not isinstance(error, FAILOVER_ERRORS):
+                raise error
+            errors.append(error)
+            self.failovers += 1
+            logger.warning(f"{self.role} backend {first.name} failed ({error}); failing over")
+            try:
+                return await self._invoke_async(second, func_name, args, kwargs)
+            except FAILOVER_ERRORS as e:
+                errors.append(e)
+                raise
+
+        self.hedged_requests += 1
+        tasks = {
+            first_task: first,
+            asyncio.ensure_future(self._invoke_async(second, func_name, args, kwargs)): second
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if tasks[task] is second:
+                            self.hedge_wins += 1
+                        return task.result()
+                    if not isinstance(error, FAILOVER_ERRORS):
+                        raise error
+                    errors.append(error)
+        finally:
+            for task in pending:
+                task.cancel()
+        raise errors[-1]
+
+    def _fallback(self, func_name: str, args: tuple, kwargs: dict, errors: List[Exception]) -> Any:
+        last_error = errors[-1]
+        if any(isinstance(error, CircuitBreakerOpenError) for error in errors):
+            served, value = self.primary.serve_fallback(func_name, args, kwargs, last_error)
+            if served:
+                return value
+        raise last_error
+
+    async def _fallback_async(self, func_name: str, args: tuple, kwargs: dict, errors: List[Exception]) -> Any:
+        last_error = errors[-1]
+        if any(isinstance(error, CircuitBreakerOpenError) for error in errors):
+            served, value = await self.primary.serve_fallback_async(func_name, args, kwargs, last_error)
+            if served:
+                return value
+        raise last_error
+
+    def get_status(self) -> Dict[str, Any]:
+        backends = {}
+        with self._lock:
+            for backend in self.backends:
+                stats = self._stats[backend.name]
+                backends[backend.name] = {
+                    "circuit_state": backend.circuit_breaker.state.value,
+                    "latency_ewma": stats.latency,
+                    "error_rate_ewma": stats.error_rate,
+                    "in_flight": stats.in_flight,
+                    "samples": stats.samples
+                }
+        return {
+            "role": self.role,
+            "backends": backends,
+            "failovers": self.failovers,
+            "hedged_requests": self.hedged_requests,
+            "hedge_wins": self.hedge_wins
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
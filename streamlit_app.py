@@ -4,6 +4,10 @@ import json
 import os
 import pandas as pd
 from src.app import AICallAgent
+from src.monitoring.log_reader import LogReader
+from src.monitoring.log_analytics import ErrorRateTracker
+from src.monitoring.logger import app_logger
+from src.monitoring.metrics import metrics
 
 st.set_page_config(page_title="AI Agent Resilience Dashboard", layout="wide")
 
@@ -26,6 +30,8 @@ if 'agent' not in st.session_state:
     st.session_state.agent = AICallAgent(config)
     st.session_state.agent.start()
     st.session_state.logs = []
+    st.session_state.log_reader = LogReader("app_logs.json")
+    st.session_state.error_rates = ErrorRateTracker(app_logger.sink.path)
 
 # Sidebar Controls
 st.sidebar.header("Fault Injection")
@@ -53,22 +59,47 @@ with col1:
     st.info(f"**ElevenLabs Service**")
     st.metric("Circuit State", el_cb.state.value)
     st.progress(min(el_cb.failure_count / el_cb.failure_threshold, 1.0), text=f"Failure Count: {el_cb.failure_count}")
+    el_bulkhead = st.session_state.agent.eleven_labs.get_status()["bulkhead"]
+    if el_bulkhead:
+        st.caption(f"Bulkhead: {el_bulkhead['in_flight']}/{el_bulkhead['limit']} in flight, {el_bulkhead['rejected']} rejected")
 
     # LLM Status
     llm_cb = st.session_state.agent.llm.circuit_breaker
     st.info(f"**LLM Provider**")
     st.metric("Circuit State", llm_cb.state.value)
     st.progress(min(llm_cb.failure_count / llm_cb.failure_threshold, 1.0), text=f"Failure Count: {llm_cb.failure_count}")
+    llm_bulkhead = st.session_state.agent.llm.get_status()["bulkhead"]
+    if llm_bulkhead:
+        st.caption(f"Bulkhead: {llm_bulkhead['in_flight']}/{llm_bulkhead['limit']} in flight, {llm_bulkhead['rejected']} rejected")
 
 with col2:
     st.subheader("📑 Live Logs (local/Google Sheets Mock)")
-    if os.path.exists("app_logs.json"):
-        with open("app_logs.json", "r") as f:
-            lines = f.readlines()
-            log_data = [json.loads(line) for line in lines[-10:]] # Last 10
-            df = pd.DataFrame(log_data)
-            if not df.empty:
-                st.dataframe(df, use_container_width=True)
+    service_filter = st.selectbox("Service", ["All", "ElevenLabs", "LLMProvider"])
+    # Reads only the tail of the file (and the sidecar index when filtering)
+    log_data = st.session_state.log_reader.last(
+        10, service_name=None if service_filter == "All" else service_filter
+    )
+    df = pd.DataFrame(log_data)
+    if not df.empty:
+        st.dataframe(df, use_container_width=True)
+
+st.divider()
+st.subheader("⏱️ Latency & Retries")
+# Read from the in-process metrics registry, not the log files
+snapshot = metrics.snapshot()
+latency = pd.DataFrame(snapshot.get("service_request_duration_seconds", []))
+if not latency.empty:
+    st.dataframe(latency, use_container_width=True)
+retries = pd.DataFrame(snapshot.get("retries_total", []))
+if not retries.empty:
+    st.dataframe(retries, use_container_width=True)
+
+st.divider()
+st.subheader("📊 Error Rate per Service")
+# Running counts; each refresh only decodes events appended since the last one
+error_rates = pd.DataFrame(st.session_state.error_rates.update()).T
+if not error_rates.empty:
+    st.dataframe(error_rates, use_container_width=True)
 
 st.divider()
 st.subheader("🔔 Alerts Dispatcher")
@@ -0,0 +1,18 @@
+import logging
+
+import pytest
+
+# StructuredLogger only attaches its app.log handler when the root logger has
+# none; keep test runs from appending to the working copy's logs.
+logging.getLogger().addHandler(logging.NullHandler())
+
+from src.monitoring.logger import app_logger  # noqa: E402
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_logs(tmp_path_factory):
+    """Write structured logs under a temporary directory and skip the Sheets export."""
+    app_logger.log_file = str(tmp_path_factory.mktemp("logs") / "app_logs.json")
+    app_logger.configure_sheets({"enabled": False})
+    app_logger.configure_sink()
+    yield
+    app_logger.shutdown()
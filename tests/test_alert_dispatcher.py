@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from src.monitoring.alert_dispatcher import AlertDispatcher
+
+class Recorder:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.received = []
+
+    def __call__(self, title: str, message: str):
+        if self.fail:
+            raise ConnectionError("channel down")
+        self.received.append((title, message))
+
+@pytest.fixture
+def make_dispatcher():
+    dispatchers = []
+
+    def make(**kwargs):
+        dispatcher = AlertDispatcher(**kwargs)
+        dispatchers.append(dispatcher)
+        return dispatcher
+
+    yield make
+    for dispatcher in dispatchers:
+        dispatcher.stop()
+
+def test_repeats_are_coalesced_into_one_summary(make_dispatcher):
+    channel = Recorder()
+    dispatcher = make_dispatcher(channels={"webhook": channel}, dedup_window=60)
+    for i in range(5):
+        dispatcher.dispatch("Call Blocked", f"Skipping call {i}", service_name="TTS")
+    dispatcher.flush()
+    assert channel.received == [
+        ("Call Blocked", "Skipping call 0"),
+        ("Call Blocked ×4 in last 60s", "Latest [TTS]: Skipping call 4"),
+    ]
+    assert dispatcher.get_stats()["coalesced"] == 4
+
+def test_alerts_for_different_services_are_not_coalesced(make_dispatcher):
+    channel = Recorder()
+    dispatcher = make_dispatcher(channels={"webhook": channel}, dedup_window=60)
+    dispatcher.dispatch("Circuit Breaker OPEN", "down", service_name="TTS")
+    dispatcher.dispatch("Circuit Breaker OPEN", "down", service_name="LLM")
+    dispatcher.flush()
+    assert len(channel.received) == 2
+
+def test_channel_is_rate_limited(make_dispatcher):
+    channel = Recorder()
+    dispatcher = make_dispatcher(channels={"webhook": channel}, rate_limit=10, burst=1)
+    start = time.monotonic()
+    for i in range(3):
+        dispatcher.dispatch(f"Alert {i}", "message")
+    dispatcher.flush()
+    assert len(channel.received) == 3
+    # One alert from the burst, then one every 100ms
+    assert time.monotonic() - start >= 0.15
+
+def test_dead_channel_is_skipped_without_affecting_others(make_dispatcher):
+    healthy, dead = Recorder(), Recorder(fail=True)
+    dispatcher = make_dispatcher(
+        channels={"email": healthy, "telegram": dead},
+        channel_breaker={"failure_threshold": 1, "recovery_timeout": 60}
+    )
+    for i in range(3):
+        dispatcher.dispatch(f"Alert {i}", "message")
+    dispatcher.flush()
+    stats = dispatcher.get_stats()
+    assert stats["sent"] == {"email": 3, "telegram": 0}
+    assert stats["failed"]["telegram"] == 1
+    assert stats["dropped"]["telegram"] == 2
+    assert stats["channel_circuits"]["telegram"] == "OPEN"
+
+def test_concurrent_first_dispatches_start_one_set_of_workers(make_dispatcher):
+    dispatcher = make_dispatcher(channels={"email": Recorder(), "webhook": Recorder()})
+    barrier = threading.Barrier(8)
+
+    def dispatch(i):
+        barrier.wait()
+        dispatcher.dispatch(f"Alert {i}", "message")
+
+    callers = [threading.Thread(target=dispatch, args=(i,)) for i in range(8)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join(5)
+    assert len(dispatcher._threads) == 3
@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+import pytest
+
+from src.core import clock
+from src.core.exceptions import InvalidPayloadError, ServiceUnavailableError
+from src.core.resilience.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError, CircuitState
+from src.core.resilience.retry import async_retry_with_backoff
+from src.services.base_service import BaseService
+
+class AsyncService(BaseService):
+    def __init__(self, initial_delay: float = 0.05):
+        super().__init__(
+            "Async",
+            {"max_retries": 2, "initial_delay": initial_delay},
+            {"failure_threshold": 10, "recovery_timeout": 30}
+        )
+        self.failures_left = 0
+        self.calls = 0
+
+    async def _speak_call(self, text: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.1)
+        if self.failures_left:
+            self.failures_left -= 1
+            raise ServiceUnavailableError("unavailable", service_name=self.name)
+        return text
+
+    def health_check(self) -> bool:
+        return True
+
+class Flaky:
+    def __init__(self, failures: int, error=ServiceUnavailableError):
+        self.failures = failures
+        self.error = error
+        self.attempts = 0
+
+    async def __call__(self):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise self.error("failed", service_name="Test")
+        return "ok"
+
+def test_async_retry_recovers_from_transient_errors():
+    func = Flaky(failures=2)
+    assert asyncio.run(async_retry_with_backoff(func, max_retries=3, initial_delay=0.001)) == "ok"
+    assert func.attempts == 3
+
+def test_async_retry_gives_up_after_max_retries():
+    func = Flaky(failures=5)
+    with pytest.raises(ServiceUnavailableError):
+        asyncio.run(async_retry_with_backoff(func, max_retries=2, initial_delay=0.001))
+    assert func.attempts == 3
+
+def test_async_retry_does_not_retry_permanent_errors():
+    func = Flaky(failures=5, error=InvalidPayloadError)
+    with pytest.raises(InvalidPayloadError):
+        asyncio.run(async_retry_with_backoff(func, max_retries=3, initial_delay=0.001))
+    assert func.attempts == 1
+
+def test_async_breaker_opens_and_recovers():
+    with clock.use_clock(clock.VirtualClock()) as virtual:
+        breaker = CircuitBreaker("Test", failure_threshold=2, recovery_timeout=10)
+
+        async def scenario():
+            for _ in range(2):
+                with pytest.raises(ServiceUnavailableError):
+                    await breaker.call_async(Flaky(failures=1))
+            assert breaker.state is CircuitState.OPEN
+            with pytest.raises(CircuitBreakerOpenError):
+                await breaker.call_async(Flaky(failures=0))
+            virtual.advance(11)
+            return await breaker.call_async(Flaky(failures=0))
+
+        assert asyncio.run(scenario()) == "ok"
+        assert breaker.state is CircuitState.CLOSED
+
+def test_concurrent_async_calls_share_one_event_loop():
+    service = AsyncService()
+
+    async def scenario():
+        return await asyncio.gather(*(service.execute_async("speak_call", f"text {i}") for i in range(20)))
+
+    start = time.monotonic()
+    results = asyncio.run(scenario())
+    # Twenty 100ms calls overlap instead of running one after another
+    assert time.monotonic() - start < 1.0
+    assert results == [f"text {i}" for i in range(20)]
+
+def test_backoff_yields_the_event_loop():
+    service = AsyncService(initial_delay=0.3)
+    service.failures_left = 1
+    ticks = []
+
+    async def ticker():
+        for _ in range(25):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+    async def scenario():
+        result, _ = await asyncio.gather(service.execute_async("speak_call", "hi"), ticker())
+        return result
+
+    assert asyncio.run(scenario()) == "hi"
+    assert service.calls == 2
+    # Other tasks keep running through the 300ms backoff
+    assert max(later - earlier for earlier, later in zip(ticks, ticks[1:])) < 0.2
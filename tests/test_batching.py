@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+from src.core import clock
+from src.core.exceptions import DeadlineExceededError, ServiceUnavailableError
+from src.core.resilience.circuit_breaker import CircuitBreakerOpenError, CircuitState
+from src.core.resilience.deadline import deadline_scope
+from src.services.base_service import BaseService
+
+class EchoService(BaseService):
+    def __init__(self):
+        super().__init__(
+            "Echo",
+            {"max_retries": 0, "initial_delay": 0.001},
+            {"failure_threshold": 2, "recovery_timeout": 30}
+        )
+        self.batch_sizes = []
+        self.batch_latency = 0.0
+        self.failing = set()
+
+    def _echo_call(self, text: str) -> str:
+        return text
+
+    def _echo_call_batch(self, calls):
+        self.batch_sizes.append(len(calls))
+        if self.batch_latency:
+            clock.sleep(self.batch_latency)
+        return [
+            ServiceUnavailableError(f"{text} failed", service_name=self.name) if text in self.failing else text
+            for (text,) in calls
+        ]
+
+    def health_check(self) -> bool:
+        return True
+
+def run_concurrently(service, texts):
+    results = {}
+
+    def call(text):
+        try:
+            results[text] = service.execute("echo_call", text)
+        except Exception as e:
+            results[text] = e
+
+    threads = [threading.Thread(target=call, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+def test_concurrent_calls_share_one_batch():
+    service = EchoService()
+    service.configure_batching("echo_call", max_batch_size=4, max_wait=1.0)
+    results = run_concurrently(service, ["a", "b", "c", "d"])
+    assert service.batch_sizes == [4]
+    assert results == {"a": "a", "b": "b", "c": "c", "d": "d"}
+
+def test_failed_item_fails_only_its_caller():
+    service = EchoService()
+    service.configure_batching("echo_call", max_batch_size=4, max_wait=1.0)
+    service.failing = {"b"}
+    results = run_concurrently(service, ["a", "b", "c", "d"])
+    assert isinstance(results["b"], ServiceUnavailableError)
+    assert [results[text] for text in "acd"] == ["a", "c", "d"]
+    # One failed item in four stays below the default 50% threshold
+    assert service.circuit_breaker.failure_count == 0
+
+def test_batches_of_failed_items_trip_the_breaker():
+    service = EchoService()
+    service.configure_batching("echo_call", max_batch_size=1, max_wait=0)
+    service.failing = {"a"}
+    for _ in range(2):
+        with pytest.raises(ServiceUnavailableError):
+            service.execute("echo_call", "a")
+    assert service.circuit_breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitBreakerOpenError):
+        service.execute("echo_call", "a")
+
+def test_failed_batch_shrinks_adaptive_bulkhead():
+    service = EchoService()
+    service.configure_bulkhead(8, adaptive={"min_limit": 1, "max_limit": 8})
+    service.configure_batching("echo_call", max_batch_size=1, max_wait=0)
+    service.failing = {"a"}
+    limit = service.bulkhead.limit
+    with pytest.raises(ServiceUnavailableError):
+        service.execute("echo_call", "a")
+    assert service.bulkhead.limit < limit
+
+def test_follower_waits_no_longer_than_its_deadline():
+    service = EchoService()
+    service.configure_batching("echo_call", max_batch_size=2, max_wait=1.0)
+    service.batch_latency = 1.0
+    leader = threading.Thread(target=service.execute, args=("echo_call", "leader"))
+    leader.start()
+    time.sleep(0.05)
+    start = time.monotonic()
+    with deadline_scope(0.1):
+        with pytest.raises(DeadlineExceededError):
+            service.execute("echo_call", "follower")
+    assert time.monotonic() - start < 0.5
+    leader.join(5)
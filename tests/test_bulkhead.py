@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.core import clock
+from src.core.exceptions import ServiceUnavailableError
+from src.core.resilience.bulkhead import AIMDLimiter, Bulkhead, BulkheadFullError
+from src.services.base_service import BaseService
+
+class FlakyService(BaseService):
+    def __init__(self):
+        super().__init__(
+            "Flaky",
+            {"max_retries": 1, "initial_delay": 0.3},
+            {"failure_threshold": 5, "recovery_timeout": 30}
+        )
+        self.failures_left = 1
+
+    def _flaky_call(self) -> str:
+        if self.failures_left:
+            self.failures_left -= 1
+            raise ServiceUnavailableError("unavailable", service_name=self.name)
+        return "ok"
+
+    def health_check(self) -> bool:
+        return True
+
+@pytest.fixture
+def virtual_clock():
+    with clock.use_clock(clock.VirtualClock(start=100.0)) as virtual:
+        yield virtual
+
+def test_aimd_limit_backs_off_on_failure(virtual_clock):
+    limiter = AIMDLimiter(10, min_limit=2, max_limit=20)
+    assert limiter.on_sample(0.1, failed=True, in_flight=5) == 9
+    # At most one decrease per smoothed latency (and 100ms)
+    assert limiter.on_sample(0.1, failed=True, in_flight=5) == 9
+    virtual_clock.advance(1)
+    assert limiter.on_sample(0.1, failed=True, in_flight=5) == 8
+
+def test_aimd_limit_grows_while_used_at_normal_latency(virtual_clock):
+    limiter = AIMDLimiter(4, max_limit=8)
+    for _ in range(40):
+        limiter.on_sample(0.1, failed=False, in_flight=limiter.limit)
+    assert limiter.limit > 4
+
+def test_aimd_limit_backs_off_when_latency_rises(virtual_clock):
+    limiter = AIMDLimiter(10)
+    for _ in range(20):
+        limiter.on_sample(0.1, failed=False, in_flight=1)
+    for _ in range(20):
+        virtual_clock.advance(1)
+        limiter.on_sample(1.0, failed=False, in_flight=1)
+    assert limiter.limit < 10
+
+def test_full_bulkhead_rejects_after_queue_timeout():
+    bulkhead = Bulkhead("Test", 1, queue_timeout=0.05)
+    bulkhead.acquire()
+    with pytest.raises(BulkheadFullError):
+        bulkhead.acquire()
+    bulkhead.release()
+    bulkhead.acquire()
+
+def test_slot_is_released_during_backoff():
+    service = FlakyService()
+    service.configure_bulkhead(1)
+    caller = threading.Thread(target=service.execute, args=("flaky_call",))
+    caller.start()
+    time.sleep(0.1)
+    # The caller is sleeping before its retry; its slot is free for others
+    assert service.bulkhead.in_flight == 0
+    caller.join(5)
+    assert service.bulkhead.in_flight == 0
+
+def test_async_slot_is_released_during_backoff():
+    service = FlakyService()
+    service.configure_bulkhead(1)
+
+    async def scenario():
+        call = asyncio.ensure_future(service.execute_async("flaky_call"))
+        await asyncio.sleep(0.1)
+        in_backoff = service.bulkhead.in_flight
+        return in_backoff, await call
+
+    assert asyncio.run(scenario()) == (0, "ok")
@@ -0,0 +1,161 @@
+import asyncio
+import pickle
+import sqlite3
+import threading
+
+import pytest
+
+from src.core.cache import ResponseCache, SQLiteCacheTier
+from src.services.base_service import BaseService
+
+class CountingService(BaseService):
+    def __init__(self):
+        super().__init__(
+            "Counting",
+            {"max_retries": 0, "initial_delay": 0.001},
+            {"failure_threshold": 5, "recovery_timeout": 30},
+            cache_config={"max_entries": 16}
+        )
+        self.calls = 0
+
+    async def _speak_call(self, text: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return f"audio for {text}"
+
+    def health_check(self) -> bool:
+        return True
+
+def test_concurrent_misses_share_one_load():
+    cache = ResponseCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_load("key", loader)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(cache.get_or_load("key", loader))) for _ in range(4)]
+    for follower in followers:
+        follower.start()
+    # Give the followers time to find the load in flight
+    for _ in range(100):
+        if cache.coalesced == 4:
+            break
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results) == [(False, "value")] + [(True, "value")] * 4
+    assert cache.get_stats()["cache_coalesced"] == 4
+
+def test_failed_load_is_shared_and_not_cached():
+    cache = ResponseCache()
+
+    def failing():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("key", failing)
+    assert cache.get("key") == (False, None)
+    assert cache.get_or_load("key", lambda: "value") == (False, "value")
+    assert cache.get_or_load("key", lambda: "other") == (True, "value")
+
+def test_concurrent_async_misses_share_one_load():
+    cache = ResponseCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_load_async("key", loader) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert sorted(results) == [(False, "value")] + [(True, "value")] * 4
+    assert cache.get_stats()["cache_misses"] == 1
+    assert cache.get_stats()["cache_coalesced"] == 4
+
+def test_failed_async_load_is_shared_and_not_cached():
+    cache = ResponseCache()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_load_async("key", failing) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.get("key") == (False, None)
+
+def test_counters_are_exact_under_concurrency():
+    cache = ResponseCache()
+    cache.set("key", "value")
+
+    def lookups():
+        for _ in range(2000):
+            cache.get("key")
+            cache.record_miss()
+
+    threads = [threading.Thread(target=lookups) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert (cache.hits, cache.misses) == (16000, 16000)
+
+def test_disk_tier_stores_json_and_bytes_without_pickle(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    tier = SQLiteCacheTier(path)
+    tier.set("text", "Speech audio for: hi")
+    tier.set("audio", b"\x00\xffRIFF")
+    tier.set("data", {"tokens": [1, 2]})
+    tier.close()
+
+    tier = SQLiteCacheTier(path)
+    assert tier.get("text") == (True, "Speech audio for: hi")
+    assert tier.get("audio") == (True, b"\x00\xffRIFF")
+    assert tier.get("data") == (True, {"tokens": [1, 2]})
+    tier.close()
+    with sqlite3.connect(path) as conn:
+        stored = dict(conn.execute("SELECT key, value FROM entries"))
+    assert stored["text"] == '"Speech audio for: hi"'
+
+def test_disk_tier_skips_values_json_cannot_hold(tmp_path):
+    cache = ResponseCache(disk_path=str(tmp_path / "cache.sqlite"))
+    value = object()
+    cache.set("key", value)
+    assert cache.get("key") == (True, value)
+    assert cache.disk.get("key") == (False, None)
+
+def test_disk_tier_drops_old_pickled_rows(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE cache (key TEXT PRIMARY KEY, value BLOB, expires_at REAL)")
+        conn.execute("INSERT INTO cache VALUES (?, ?, ?)", ("key", pickle.dumps("value"), 1e12))
+    tier = SQLiteCacheTier(path)
+    assert tier.get("key") == (False, None)
+    tier.close()
+
+def test_async_service_calls_share_one_upstream_call():
+    service = CountingService()
+
+    async def scenario():
+        return await asyncio.gather(*(service.execute_async("speak_call", "hi") for _ in range(4)))
+
+    assert asyncio.run(scenario()) == ["audio for hi"] * 4
+    assert service.calls == 1
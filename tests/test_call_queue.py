@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+
+from src.core.call_queue import AsyncCallQueueProcessor, CallQueueProcessor
+
+class Handler:
+    """Records how many contacts run at once; contacts starting with "bad" fail."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _enter(self):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+
+    def _exit(self):
+        with self._lock:
+            self.running -= 1
+
+    def __call__(self, contact: str):
+        self._enter()
+        try:
+            time.sleep(self.delays.get(contact, 0.02))
+            if contact.startswith("bad"):
+                raise ConnectionError(f"{contact} unreachable")
+        finally:
+            self._exit()
+
+    async def run_async(self, contact: str):
+        self._enter()
+        try:
+            await asyncio.sleep(self.delays.get(contact, 0.02))
+            if contact.startswith("bad"):
+                raise ConnectionError(f"{contact} unreachable")
+        finally:
+            self._exit()
+
+CONTACTS = ["a", "bad-b", "c", "d", "e", "f", "g", "h"]
+
+def test_failed_contact_is_skipped_and_results_keep_queue_order():
+    results = CallQueueProcessor(Handler(), workers=4).process(CONTACTS)
+    assert [result.contact for result in results] == CONTACTS
+    assert [result.contact for result in results if not result.success] == ["bad-b"]
+    failed = results[1]
+    assert failed.error_type == "ConnectionError"
+    assert isinstance(failed.exception, ConnectionError)
+
+def test_workers_bound_concurrent_calls():
+    handler = Handler()
+    CallQueueProcessor(handler, workers=3).process(CONTACTS)
+    assert handler.peak == 3
+
+def test_single_worker_runs_sequentially():
+    handler = Handler()
+    results = CallQueueProcessor(handler, workers=1).process(CONTACTS)
+    assert handler.peak == 1
+    assert len(results) == len(CONTACTS)
+
+def test_unordered_results_arrive_in_completion_order():
+    handler = Handler(delays={"slow": 0.2, "fast": 0.01})
+    results = CallQueueProcessor(handler, workers=2, ordered=False).process(["slow", "fast"])
+    assert [result.contact for result in results] == ["fast", "slow"]
+
+def test_async_processor_bounds_concurrency_and_keeps_order():
+    handler = Handler()
+    processor = AsyncCallQueueProcessor(handler.run_async, workers=3)
+    results = asyncio.run(processor.process(CONTACTS))
+    assert handler.peak == 3
+    assert [result.contact for result in results] == CONTACTS
+    assert [result.success for result in results].count(False) == 1
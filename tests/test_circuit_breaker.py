@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from src.core import clock
+from src.core.exceptions import InvalidPayloadError, ServiceTimeoutError
+from src.core.resilience.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError, CircuitState
+
+def fail():
+    raise ServiceTimeoutError("timed out", service_name="Test")
+
+@pytest.fixture
+def virtual_clock():
+    with clock.use_clock(clock.VirtualClock()) as virtual:
+        yield virtual
+
+def trip(breaker: CircuitBreaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(ServiceTimeoutError):
+            breaker.call(fail)
+    assert breaker.state is CircuitState.OPEN
+
+def test_open_circuit_rejects_until_recovery_timeout(virtual_clock):
+    breaker = CircuitBreaker("Test", failure_threshold=2, recovery_timeout=10)
+    trip(breaker)
+    with pytest.raises(CircuitBreakerOpenError):
+        breaker.call(lambda: "ok")
+    virtual_clock.advance(11)
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state is CircuitState.CLOSED
+
+def test_half_open_admits_only_max_probe_calls(virtual_clock):
+    breaker = CircuitBreaker("Test", failure_threshold=1, recovery_timeout=10, half_open_max_calls=1)
+    trip(breaker)
+    virtual_clock.advance(11)
+
+    def probe():
+        # A second caller arriving while the probe runs is turned away
+        with pytest.raises(CircuitBreakerOpenError):
+            breaker.call(lambda: "second")
+        return "probe"
+
+    assert breaker.call(probe) == "probe"
+    assert breaker.state is CircuitState.CLOSED
+
+def test_failed_probe_reopens_circuit(virtual_clock):
+    breaker = CircuitBreaker("Test", failure_threshold=1, recovery_timeout=10)
+    trip(breaker)
+    virtual_clock.advance(11)
+    with pytest.raises(ServiceTimeoutError):
+        breaker.call(fail)
+    assert breaker.state is CircuitState.OPEN
+
+def test_permanent_error_returns_probe_permit(virtual_clock):
+    breaker = CircuitBreaker("Test", failure_threshold=1, recovery_timeout=10)
+    trip(breaker)
+    virtual_clock.advance(11)
+
+    def bad_payload():
+        raise InvalidPayloadError("bad", service_name="Test")
+
+    with pytest.raises(InvalidPayloadError):
+        breaker.call(bad_payload)
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state is CircuitState.CLOSED
+
+def test_cancelled_async_probe_returns_permit(virtual_clock):
+    breaker = CircuitBreaker("Test", failure_threshold=1, recovery_timeout=10)
+    trip(breaker)
+    virtual_clock.advance(11)
+
+    async def scenario():
+        async def hang():
+            await asyncio.sleep(60)
+
+        async def ok():
+            return "ok"
+
+        probe = asyncio.ensure_future(breaker.call_async(hang))
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        assert breaker.state is CircuitState.HALF_OPEN
+        return await breaker.call_async(ok)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert breaker.state is CircuitState.CLOSED
+
+def test_interrupted_sync_probe_returns_permit(virtual_clock):
+    breaker = CircuitBreaker("Test", failure_threshold=1, recovery_timeout=10)
+    trip(breaker)
+    virtual_clock.advance(11)
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        breaker.call(interrupted)
+    assert breaker.call(lambda: "ok") == "ok"
+
+def test_status_reports_wall_clock_failure_time(virtual_clock):
+    breaker = CircuitBreaker("Test", failure_threshold=2, recovery_timeout=10)
+    virtual_clock.advance(5)
+    trip(breaker)
+    assert breaker.last_failure_at == pytest.approx(clock.time())
+    assert breaker.get_status()["last_failure_time"] == breaker.last_failure_at
+    # A wall-clock jump does not move the recovery timeout
+    virtual_clock.epoch -= 3600
+    virtual_clock.advance(11)
+    assert breaker.call(lambda: "ok") == "ok"
@@ -0,0 +1,68 @@
+import pytest
+
+from src.core import clock
+from src.core.durable_queue import DurableCallQueue
+from src.core.exceptions import ServiceTimeoutError
+
+@pytest.fixture
+def virtual_clock():
+    with clock.use_clock(clock.VirtualClock()) as virtual:
+        yield virtual
+
+@pytest.fixture
+def queue(tmp_path, virtual_clock):
+    queue = DurableCallQueue(str(tmp_path / "calls.db"), visibility_timeout=60, max_attempts=2, commit_batch=1)
+    yield queue
+    queue.close()
+
+def test_enqueue_ignores_duplicates(queue):
+    assert queue.enqueue(["alice", "bob"]) == 2
+    assert queue.enqueue(["alice", "carol"]) == 1
+    assert queue.get_stats()["queued"] == 3
+
+def test_leased_contact_is_hidden_until_ack(queue):
+    queue.enqueue(["alice"])
+    [lease] = queue.lease()
+    assert lease.contact == "alice" and lease.attempt == 1
+    assert queue.lease() == []
+    assert queue.ack(lease)
+    assert queue.get_stats()["done"] == 1
+
+def test_expired_lease_is_handed_out_again(queue, virtual_clock):
+    queue.enqueue(["alice"])
+    [first] = queue.lease()
+    virtual_clock.advance(61)
+    [second] = queue.lease()
+    assert second.job_id == first.job_id and second.attempt == 2
+    # The first worker's lease is stale; its outcome must not be applied
+    assert not queue.ack(first)
+    assert queue.ack(second)
+
+def test_nack_requeues_after_delay(queue, virtual_clock):
+    queue.enqueue(["alice"])
+    [lease] = queue.lease()
+    assert queue.nack(lease, ServiceTimeoutError("timed out"), delay=30)
+    assert queue.lease() == []
+    assert queue.get_stats()["delayed"] == 1
+    virtual_clock.advance(31)
+    [retry] = queue.lease()
+    assert retry.failures == 1
+
+def test_nack_dead_letters_after_max_attempts(queue):
+    queue.enqueue(["alice"])
+    for _ in range(2):
+        [lease] = queue.lease()
+        queue.nack(lease, ServiceTimeoutError("timed out"))
+    assert queue.lease() == []
+    [dead] = queue.dead_letters()
+    assert dead["contact"] == "alice"
+    assert dead["failures"] == 2
+    assert dead["error_type"] == "ServiceTimeoutError"
+
+def test_dead_letters_can_be_retried(queue):
+    queue.enqueue(["alice"])
+    [lease] = queue.lease()
+    queue.dead_letter(lease)
+    assert queue.retry_dead_letters() == 1
+    [lease] = queue.lease()
+    assert lease.contact == "alice" and lease.failures == 0
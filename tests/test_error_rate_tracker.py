@@ -0,0 +1,59 @@
+import json
+import os
+
+from src.monitoring.event_codec import MAGIC, EventEncoder
+from src.monitoring.log_analytics import ErrorRateTracker
+
+def event(service_name, event_type, second=0):
+    return {"timestamp": f"2026-01-29T13:00:{second:02d}", "service_name": service_name, "event_type": event_type}
+
+def append(path, records):
+    with open(path, "a") as f:
+        f.write("".join(json.dumps(record) + "\n" for record in records))
+
+def test_counts_only_finished_requests(tmp_path):
+    path = str(tmp_path / "app_logs.json")
+    append(path, [
+        event("TTS", "REQUEST_START"),
+        event("TTS", "REQUEST_SUCCESS"),
+        event("TTS", "REQUEST_FAILURE"),
+        event("LLM", "REQUEST_SUCCESS"),
+    ])
+    assert ErrorRateTracker(path).update() == {
+        "TTS": {"requests": 2, "failures": 1, "error_rate": 50.0},
+        "LLM": {"requests": 1, "failures": 0, "error_rate": 0.0},
+    }
+
+def test_missing_log_has_no_rates(tmp_path):
+    assert ErrorRateTracker(str(tmp_path / "app_logs.json")).update() == {}
+
+def test_update_reads_only_appended_events(tmp_path):
+    path = str(tmp_path / "app_logs.json")
+    tracker = ErrorRateTracker(path)
+    append(path, [event("TTS", "REQUEST_SUCCESS")])
+    tracker.update()
+    offset = tracker._tailer.offset
+    append(path, [event("TTS", "REQUEST_FAILURE")])
+    assert tracker.update()["TTS"] == {"requests": 2, "failures": 1, "error_rate": 50.0}
+    assert tracker._tailer.offset > offset
+    # Nothing new: the counts stay and nothing is re-read
+    assert tracker.update()["TTS"]["requests"] == 2
+
+def test_rotation_does_not_double_count(tmp_path):
+    path = str(tmp_path / "app_logs.json")
+    tracker = ErrorRateTracker(path)
+    append(path, [event("TTS", "REQUEST_FAILURE"), event("TTS", "REQUEST_SUCCESS")])
+    tracker.update()
+
+    os.replace(path, str(tmp_path / "app_logs.1.json"))
+    with open(f"{path}.manifest.json", "w") as f:
+        json.dump({"segments": [{"file": "app_logs.1.json"}]}, f)
+    append(path, [event("TTS", "REQUEST_SUCCESS")])
+
+    assert tracker.update()["TTS"] == {"requests": 3, "failures": 1, "error_rate": 100.0 / 3}
+
+def test_binary_log(tmp_path):
+    path = str(tmp_path / "app_logs.evt")
+    with open(path, "wb") as f:
+        f.write(MAGIC + EventEncoder().encode_batch([event("TTS", "REQUEST_FAILURE"), event("TTS", "REQUEST_SUCCESS")]))
+    assert ErrorRateTracker(path).update()["TTS"] == {"requests": 2, "failures": 1, "error_rate": 50.0}
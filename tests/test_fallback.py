@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from src.core import clock
+from src.core.exceptions import ServiceUnavailableError
+from src.core.resilience.circuit_breaker import CircuitBreakerOpenError
+from src.core.resilience.fallback import FallbackPolicy
+from src.services.base_service import BaseService
+
+class SpeechService(BaseService):
+    def __init__(self, name="Speech", fallback_config=None):
+        super().__init__(
+            name,
+            {"max_retries": 0, "initial_delay": 0.001},
+            {"failure_threshold": 1, "recovery_timeout": 60},
+            cache_config={"ttl": 10},
+            fallback_config=fallback_config
+        )
+        self.is_down = False
+
+    def _speak_call(self, text: str) -> str:
+        if self.is_down:
+            raise ServiceUnavailableError("unavailable", service_name=self.name)
+        return f"{self.name} audio for {text}"
+
+    async def _speak_async_call(self, text: str) -> str:
+        return self._speak_call(text)
+
+    def health_check(self) -> bool:
+        return not self.is_down
+
+@pytest.fixture(autouse=True)
+def virtual_clock():
+    with clock.use_clock(clock.VirtualClock()) as virtual:
+        yield virtual
+
+def trip(service):
+    service.is_down = True
+    with pytest.raises(ServiceUnavailableError):
+        service.execute("speak_call", "trip")
+
+def test_open_circuit_serves_expired_cache_entry(virtual_clock):
+    service = SpeechService(fallback_config={"strategies": ["stale_cache"]})
+    assert service.execute("speak_call", "hello") == "Speech audio for hello"
+    virtual_clock.advance(30)
+    trip(service)
+    assert service.execute("speak_call", "hello") == "Speech audio for hello"
+    assert service.fallback.get_stats() == {"stale_cache": 1}
+
+def test_strategies_are_tried_in_order():
+    service = SpeechService(fallback_config={"strategies": ["stale_cache", "static"], "static_response": "generic audio"})
+    trip(service)
+    # Nothing cached for this text, so the static clip is next
+    assert service.execute("speak_call", "never said") == "generic audio"
+    assert service.fallback.get_stats() == {"stale_cache": 0, "static": 1}
+
+def test_static_path_is_read_once(tmp_path):
+    clip = tmp_path / "sorry.wav"
+    clip.write_bytes(b"RIFF....")
+    policy = FallbackPolicy(["static"], static_path=str(clip))
+    clip.unlink()
+    assert policy.resolve_local("static", None, None) == (True, b"RIFF....")
+
+def test_secondary_provider_takes_over():
+    service = SpeechService(fallback_config={"strategies": ["secondary"]})
+    service.set_fallback_provider(SpeechService(name="Backup"))
+    trip(service)
+    assert service.execute("speak_call", "hello") == "Backup audio for hello"
+
+def test_failure_while_closed_is_not_masked():
+    service = SpeechService(fallback_config={"strategies": ["static"], "static_response": "generic audio"})
+    # The call that trips the breaker still fails; only OPEN-circuit rejections are served
+    trip(service)
+    assert service.execute("speak_call", "next") == "generic audio"
+
+def test_without_fallback_open_circuit_raises():
+    service = SpeechService()
+    trip(service)
+    with pytest.raises(CircuitBreakerOpenError):
+        service.execute("speak_call", "hello")
+
+def test_async_call_serves_fallback():
+    service = SpeechService(fallback_config={"strategies": ["static"], "static_response": "generic audio"})
+    trip(service)
+    assert asyncio.run(service.execute_async("speak_async_call", "hello")) == "generic audio"
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        FallbackPolicy(["retry_forever"])
@@ -0,0 +1,106 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from src.core import clock
+from src.core.resilience.circuit_breaker import CircuitBreaker, CircuitState
+from src.monitoring.health_check import HealthCheckManager
+
+@pytest.fixture
+def virtual_clock():
+    with clock.use_clock(clock.VirtualClock()) as virtual:
+        yield virtual
+
+def test_hung_probe_times_out_without_stalling_others():
+    release = threading.Event()
+    healthy_probes = []
+    manager = HealthCheckManager(check_interval=0.05, timeout=0.1)
+    manager.register_service("Hung", lambda: release.wait(5))
+    manager.register_service("Fast", lambda: healthy_probes.append(1) or True)
+    manager.start()
+    try:
+        time.sleep(0.5)
+        status = manager.get_status()
+    finally:
+        manager.stop()
+        release.set()
+    assert not manager.is_service_healthy("Hung")
+    assert status["Hung"]["timed_out"]
+    assert manager.is_service_healthy("Fast")
+    assert len(healthy_probes) > 3
+
+def test_failing_service_is_probed_less_often_until_it_recovers(virtual_clock):
+    healthy = False
+    manager = HealthCheckManager(check_interval=10, backoff_factor=2, max_interval=30)
+    manager.register_service("TTS", lambda: healthy)
+    intervals = []
+    for _ in range(4):
+        manager.run_due_checks()
+        intervals.append(manager.get_status()["TTS"]["interval"])
+        virtual_clock.advance(intervals[-1])
+    assert intervals == [10, 20, 30, 30]
+    healthy = True
+    manager.run_due_checks()
+    assert manager.get_status()["TTS"]["interval"] == 10
+    assert manager.is_service_healthy("TTS")
+
+def test_status_turns_stale_when_probes_stop_finishing(virtual_clock):
+    manager = HealthCheckManager(check_interval=10, timeout=5)
+    manager.register_service("TTS", lambda: True)
+    assert manager.get_status()["TTS"]["stale"]
+    manager.run_due_checks()
+    status = manager.get_status()["TTS"]
+    assert not status["stale"]
+    assert status["consecutive_failures"] == 0
+    virtual_clock.advance(31)
+    assert manager.get_status()["TTS"]["stale"]
+
+def test_failing_probe_opens_circuit_pre_emptively(virtual_clock):
+    breaker = CircuitBreaker("TTS", failure_threshold=5, recovery_timeout=60)
+    manager = HealthCheckManager(check_interval=10, open_after_failures=2)
+    manager.register_service("TTS", lambda: False, circuit_breaker=breaker)
+    manager.run_due_checks()
+    assert breaker.state is CircuitState.CLOSED
+    virtual_clock.advance(10)
+    manager.run_due_checks()
+    assert breaker.state is CircuitState.OPEN
+    assert not manager.is_service_healthy("TTS")
+
+def test_healthy_probe_recovers_circuit_before_recovery_timeout(virtual_clock):
+    breaker = CircuitBreaker("TTS", failure_threshold=5, recovery_timeout=60)
+    breaker.force_open()
+    calls = []
+    manager = HealthCheckManager(check_interval=10)
+    manager.register_service("TTS", lambda: calls.append(1) or True, circuit_breaker=breaker)
+    manager.run_due_checks()
+    assert breaker.state is CircuitState.CLOSED
+    # The scheduled probe plus synthetic probes spent on the HALF_OPEN slots
+    assert len(calls) > 1
+
+def test_unhealthy_synthetic_probe_keeps_circuit_open(virtual_clock):
+    breaker = CircuitBreaker("TTS", failure_threshold=5, recovery_timeout=60)
+    breaker.force_open()
+    results = iter([True, False])
+    manager = HealthCheckManager(check_interval=10)
+    manager.register_service("TTS", lambda: next(results, False), circuit_breaker=breaker)
+    manager.run_due_checks()
+    assert breaker.state is CircuitState.OPEN
+
+def test_recovery_runs_outside_the_manager_lock():
+    breaker = CircuitBreaker("TTS", failure_threshold=5, recovery_timeout=60)
+    breaker.force_open()
+    probe_threads = []
+    manager = HealthCheckManager(check_interval=60)
+    manager.register_service("TTS", lambda: probe_threads.append(threading.current_thread()) or True, circuit_breaker=breaker)
+    manager._executor = ThreadPoolExecutor(max_workers=1)
+    # A probe that finished before its callback was attached runs the callback inside _submit
+    future = Future()
+    future.set_result(True)
+    with manager._lock:
+        manager._probes["TTS"].future = future
+        manager._on_probe_done("TTS", future)
+    manager._executor.shutdown(wait=True)
+    assert breaker.state is CircuitState.CLOSED
+    assert probe_threads and threading.current_thread() not in probe_threads
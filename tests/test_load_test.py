@@ -0,0 +1,65 @@
+import json
+import logging
+
+from benchmarks.load_test import SCENARIOS, compare, quiet, run_scenario
+from src.monitoring.alerts import AlertSystem, alerts
+from src.monitoring.logger import StructuredLogger, app_logger
+
+def load_config():
+    with open("config.json", "r") as f:
+        return json.load(f)
+
+def small(name, contacts=40):
+    return {**SCENARIOS[name], "contacts": contacts}
+
+def test_quiet_restores_logger_and_alerts():
+    with quiet():
+        assert app_logger.log_event("TTS", "REQUEST_START", {}) is None
+        assert logging.getLogger("src").isEnabledFor(logging.CRITICAL) is False
+    assert app_logger.log_event.__func__ is StructuredLogger.log_event
+    assert alerts.send_alert.__func__ is AlertSystem.send_alert
+    assert "log_event" not in vars(app_logger)
+    assert "send_alert" not in vars(alerts)
+    assert logging.root.manager.disable == logging.NOTSET
+
+def test_quiet_restores_even_when_the_run_fails():
+    try:
+        with quiet():
+            raise RuntimeError("scenario crashed")
+    except RuntimeError:
+        pass
+    assert "log_event" not in vars(app_logger)
+    assert "send_alert" not in vars(alerts)
+
+def test_same_seed_gives_same_report():
+    config = load_config()
+    with quiet():
+        first = run_scenario("steady", small("steady"), config, seed=7, max_queue_wait=120.0)
+        second = run_scenario("steady", small("steady"), config, seed=7, max_queue_wait=120.0)
+    for report in (first, second):
+        report.pop("wall_seconds")
+    assert first == second
+    assert first["contacts"] == 40
+    assert first["success"] + first["fallback"] + first["dropped"] == 40
+
+def test_outage_reports_time_to_recovery():
+    config = load_config()
+    with quiet():
+        report = run_scenario("elevenlabs_503", small("elevenlabs_503", 150), config, seed=42, max_queue_wait=120.0)
+    [phase] = report["recovery"]
+    assert (phase["service"], phase["type"]) == ("eleven_labs", "outage")
+    assert report["fallback"] > 0
+    assert phase["time_to_recovery"] is not None
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {"steady": {"throughput_per_s": 1.0, "latency": {"p99": 2.0}, "dropped": 0}}
+    results = {"steady": {"throughput_per_s": 0.95, "latency": {"p99": 3.0}, "dropped": 1}}
+    assert compare(results, baseline, tolerance=0.1) == ["steady: latency.p99 rose from 2.0 to 3.0"]
+
+def test_harness_leaves_the_sheets_export_off():
+    config = load_config()
+    with quiet():
+        run_scenario("steady", small("steady", contacts=5), config, seed=1, max_queue_wait=120.0)
+    assert app_logger.sheets is None
+    # The caller's config is left as it was
+    assert config["logging"]["sheets"]["enabled"] is True
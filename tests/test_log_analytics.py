@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.monitoring.log_analytics import circuit_open_durations, error_rate_by_service, retries_per_minute  # noqa: E402
+from src.monitoring.log_columns import DEFAULT_FIELDS, convert_logs, load_columns, read_columns  # noqa: E402
+
+def write_log(path, records):
+    with open(path, "w") as f:
+        f.write("".join(json.dumps(record) + "\n" for record in records))
+
+def test_empty_input_has_every_column():
+    columns = read_columns([])
+    assert len(columns) == 0
+    assert set(columns.fields) == set(DEFAULT_FIELDS)
+    assert {"service_name", "event_type", "circuit_state", "error_type"} <= set(columns.vocabularies)
+
+def test_analytics_on_empty_input():
+    columns = read_columns([])
+    assert error_rate_by_service(columns) == {}
+    minutes, retries = retries_per_minute(columns)
+    assert len(minutes) == 0 and len(retries) == 0
+    assert circuit_open_durations(columns) == {}
+
+def test_empty_npz_round_trip(tmp_path):
+    path = str(tmp_path / "logs.npz")
+    assert convert_logs([], path) == 0
+    assert error_rate_by_service(load_columns(path)) == {}
+
+def test_error_rate_skips_events_without_service(tmp_path):
+    path = str(tmp_path / "app_logs.json")
+    write_log(path, [
+        {"timestamp": "2026-01-29T13:00:00", "service_name": "TTS", "event_type": "REQUEST_SUCCESS"},
+        {"timestamp": "2026-01-29T13:00:01", "service_name": "TTS", "event_type": "REQUEST_FAILURE"},
+        {"timestamp": "2026-01-29T13:00:02", "event_type": "REQUEST_SUCCESS"},
+    ])
+    assert error_rate_by_service(read_columns([path])) == {
+        "TTS": {"requests": 2, "failures": 1, "error_rate": 50.0}
+    }
@@ -0,0 +1,33 @@
+import json
+
+from src.monitoring.log_reader import LogIndex, LogTailer
+
+def test_tailer_keeps_partial_last_line(tmp_path):
+    path = tmp_path / "app_logs.json"
+    path.write_text('{"event_type": "A"}\n{"event_ty')
+    tailer = LogTailer(str(path))
+    assert tailer.read_new() == [{"event_type": "A"}]
+    with open(path, "a") as f:
+        f.write('pe": "B"}\n')
+    assert tailer.read_new() == [{"event_type": "B"}]
+
+def test_tailer_reads_past_record_longer_than_max_bytes(tmp_path):
+    path = tmp_path / "app_logs.json"
+    records = [{"event_type": "BIG", "padding": "x" * 200}, {"event_type": "SMALL"}]
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    tailer = LogTailer(str(path))
+    assert tailer.read_new(max_bytes=32) == [records[0]]
+    assert tailer.read_new(max_bytes=32) == [records[1]]
+    assert tailer.offset == path.stat().st_size
+
+def test_index_catches_up_past_oversized_record(tmp_path, monkeypatch):
+    monkeypatch.setattr(LogIndex, "READ_CHUNK", 32)
+    path = tmp_path / "app_logs.json"
+    records = [
+        {"service_name": "TTS", "event_type": "REQUEST_FAILURE", "error": "x" * 200},
+        {"service_name": "TTS", "event_type": "REQUEST_SUCCESS"},
+    ]
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    index = LogIndex(str(path))
+    assert index.update() == 2
+    assert len(index.offsets("TTS", "REQUEST_SUCCESS")) == 1
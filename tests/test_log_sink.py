@@ -0,0 +1,80 @@
+import json
+import logging
+import threading
+
+import pytest
+
+from src.monitoring import log_sink
+from src.monitoring.log_sink import BatchingLogSink
+
+def read_jsonl(path):
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f]
+
+@pytest.fixture
+def atexit_calls(monkeypatch):
+    registered = []
+    monkeypatch.setattr(log_sink.atexit, "register", registered.append)
+    monkeypatch.setattr(log_sink.atexit, "unregister", lambda func: registered.remove(func) if func in registered else None)
+    return registered
+
+def test_records_are_written_in_batches(tmp_path):
+    path = str(tmp_path / "app_logs.json")
+    sink = BatchingLogSink(path, batch_size=10, flush_interval=5)
+    for i in range(25):
+        sink.submit({"n": i})
+    assert sink.flush()
+    sink.close()
+    assert [record["n"] for record in read_jsonl(path)] == list(range(25))
+    assert sink.get_stats()["written"] == 25
+    assert sink.get_stats()["batches"] >= 3
+
+def test_closed_sink_restarts_on_submit(tmp_path):
+    path = str(tmp_path / "app_logs.json")
+    sink = BatchingLogSink(path)
+    sink.submit({"n": 1})
+    sink.close()
+    sink.submit({"n": 2})
+    sink.close()
+    assert read_jsonl(path) == [{"n": 1}, {"n": 2}]
+
+def test_drop_oldest_keeps_newest_records(tmp_path):
+    path = str(tmp_path / "app_logs.json")
+    release = threading.Event()
+    sink = BatchingLogSink(
+        path, max_queue=2, batch_size=1, flush_interval=0.01,
+        overflow_policy="drop_oldest", on_batch=lambda entries: release.wait(5)
+    )
+    sink.submit({"n": 0})
+    # The writer is now stuck in on_batch with record 0; the queue holds two
+    while sink.get_stats()["batches"] == 0:
+        pass
+    for i in range(1, 6):
+        sink.submit({"n": i})
+    release.set()
+    sink.close()
+    assert [record["n"] for record in read_jsonl(path)] == [0, 4, 5]
+    assert sink.get_stats()["dropped"] == 3
+
+def test_close_leaves_file_open_while_writer_is_stuck(tmp_path, caplog):
+    path = str(tmp_path / "app_logs.json")
+    release = threading.Event()
+    sink = BatchingLogSink(path, batch_size=1, on_batch=lambda entries: release.wait(5))
+    sink.submit({"n": 1})
+    assert not sink.flush(timeout=0.1)
+    with caplog.at_level(logging.WARNING, logger="src.monitoring.log_sink"):
+        sink.close(timeout=0.1)
+    assert "did not stop" in caplog.text
+    assert sink._file is not None and not sink._file.closed
+    release.set()
+    sink.close()
+    assert sink._file is None
+    assert read_jsonl(path) == [{"n": 1}]
+
+def test_exit_hook_is_registered_only_while_running(tmp_path, atexit_calls):
+    sink = BatchingLogSink(str(tmp_path / "app_logs.json"))
+    assert atexit_calls == []
+    sink.submit({"n": 1})
+    assert atexit_calls == [sink.close]
+    sink.close()
+    assert atexit_calls == []
@@ -0,0 +1,67 @@
+import urllib.request
+
+import pytest
+
+from src.monitoring.metrics import MetricsRegistry, MetricsServer, _Metric, log_linear_buckets
+
+def test_metric_base_is_abstract():
+    with pytest.raises(TypeError):
+        _Metric("x", "help", ())
+
+def test_log_linear_buckets():
+    assert log_linear_buckets(0.001, 0.01) == [0.001, 0.002, 0.003, 0.004, 0.005, 0.006, 0.007, 0.008, 0.009, 0.01]
+
+def test_counter_and_gauge_exposition():
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls made", ("service",))
+    calls.labels("TTS").inc()
+    calls.labels("TTS").inc(2)
+    in_flight = registry.gauge("in_flight", "Calls running")
+    in_flight.labels().set(3)
+    text = registry.render_prometheus()
+    assert "# TYPE calls_total counter" in text
+    assert 'calls_total{service="TTS"} 3.0' in text
+    assert "# TYPE in_flight gauge" in text
+    assert "in_flight 3" in text
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("service",), buckets=[0.1, 1.0])
+    for value in (0.05, 0.5, 0.5, 5.0):
+        latency.labels("TTS").observe(value)
+    text = registry.render_prometheus()
+    assert 'latency_seconds_bucket{service="TTS",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{service="TTS",le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{service="TTS",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{service="TTS"} 4' in text
+    assert 'latency_seconds_sum{service="TTS"} 6.05' in text
+
+def test_histogram_quantiles_in_snapshot():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=log_linear_buckets())
+    for _ in range(100):
+        latency.labels().observe(0.25)
+    [row] = registry.snapshot()["latency_seconds"]
+    assert row["count"] == 100
+    assert row["mean"] == pytest.approx(0.25)
+    assert 0.2 <= row["p50"] <= 0.3
+    assert 0.2 <= row["p99"] <= 0.3
+
+def test_name_registered_with_another_type_is_rejected():
+    registry = MetricsRegistry()
+    registry.counter("calls_total", "Calls made")
+    assert registry.counter("calls_total", "Calls made") is registry.counter("calls_total", "Calls made")
+    with pytest.raises(ValueError):
+        registry.gauge("calls_total", "Calls made")
+
+def test_metrics_endpoint():
+    registry = MetricsRegistry()
+    registry.counter("calls_total", "Calls made").labels().inc()
+    server = MetricsServer(registry, port=0)
+    server.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert "calls_total 1.0" in response.read().decode("utf-8")
+    finally:
+        server.stop()
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from src.core.exceptions import ServiceTimeoutError
+from src.services.llm_service import LLMService
+from src.services.provider_pool import ProviderPool
+
+RETRY = {"max_retries": 0, "initial_delay": 0.001}
+BREAKER = {"failure_threshold": 5, "recovery_timeout": 30}
+
+def make_pool(hedge: bool = True):
+    primary = LLMService(RETRY, BREAKER, name="Primary")
+    secondary = LLMService(RETRY, BREAKER, name="Secondary")
+    pool = ProviderPool("llm", [primary, secondary], hedge=hedge, hedge_min_samples=1)
+    # Primary looks fast, so it is routed first and hedged after a short delay
+    pool._record(primary, 0.01, False)
+    pool._record(secondary, 5.0, False)
+    return pool, primary, secondary
+
+@pytest.fixture
+def pool():
+    pool, primary, secondary = make_pool()
+    yield pool, primary, secondary
+    pool.shutdown()
+
+def test_hedged_call_fails_over_when_primary_fails_early(pool):
+    pool, primary, _ = pool
+    primary.is_down = True
+    assert pool.execute("get_response_call", "hi") == "AI response to: hi"
+    assert pool.failovers == 1
+    assert pool.hedged_requests == 0
+
+def test_hedged_async_call_fails_over_when_primary_fails_early(pool):
+    pool, primary, _ = pool
+    primary.is_down = True
+    assert asyncio.run(pool.execute_async("get_response_call", "hi")) == "AI response to: hi"
+    assert pool.failovers == 1
+
+def test_slow_primary_is_hedged(pool):
+    pool, primary, _ = pool
+    primary.first_token_latency = 0.5
+    assert pool.execute("get_response_call", "hi") == "AI response to: hi"
+    assert pool.hedged_requests == 1
+    assert pool.hedge_wins == 1
+
+def test_every_backend_down_raises_last_error(pool):
+    pool, primary, secondary = pool
+    primary.is_down = secondary.is_down = True
+    with pytest.raises(ServiceTimeoutError):
+        pool.execute("get_response_call", "hi")
+
+def test_failover_without_hedging():
+    pool, primary, _ = make_pool(hedge=False)
+    primary.is_down = True
+    assert pool.execute("get_response_call", "hi") == "AI response to: hi"
+    assert pool.failovers == 1
+
+def test_interrupted_call_releases_in_flight_slot():
+    pool, primary, _ = make_pool(hedge=False)
+
+    def interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    primary.execute_without_fallback = interrupted
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            pool.execute("get_response_call", "hi")
+        assert pool.get_status()["backends"]["Primary"]["in_flight"] == 0
+    finally:
+        pool.shutdown()
@@ -0,0 +1,103 @@
+import pytest
+
+from src.core import clock
+from src.core.exceptions import DeadlineExceededError, RateLimitExceededError
+from src.core.resilience.deadline import deadline_scope
+from src.core.resilience.rate_limiter import ServiceRateLimiter, TokenBucket
+from src.core.resilience.retry import retry_with_backoff
+from src.services.elevenlabs_service import ElevenLabsService
+from src.services.fault_injection import FaultProfile
+
+@pytest.fixture(autouse=True)
+def virtual_clock():
+    with clock.use_clock(clock.VirtualClock()) as virtual:
+        yield virtual
+
+class Throttled:
+    def __init__(self, retry_after: float, failures: int = 1):
+        self.retry_after = retry_after
+        self.failures = failures
+        self.attempts = []
+
+    def __call__(self):
+        self.attempts.append(clock.monotonic())
+        if len(self.attempts) <= self.failures:
+            raise RateLimitExceededError("429", service_name="Test", retry_after=self.retry_after)
+        return "ok"
+
+def make_tts():
+    tts = ElevenLabsService({"max_retries": 2, "initial_delay": 0.5}, {"failure_threshold": 2, "recovery_timeout": 30})
+    # No random failures: only the simulated vendor limit can fail a call
+    tts.fault_profile = FaultProfile()
+    return tts
+
+def test_token_bucket_refills_at_its_rate(virtual_clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.time_until_available() == pytest.approx(0.5)
+    virtual_clock.advance(0.5)
+    assert bucket.try_acquire()
+
+def test_limiter_delays_callers_within_max_wait(virtual_clock):
+    limiter = ServiceRateLimiter("TTS", requests_per_second=2, burst=1, max_wait=2.0)
+    for _ in range(3):
+        limiter.acquire()
+    # One from the burst, then one every half second
+    assert clock.monotonic() == pytest.approx(1.0)
+    assert limiter.get_status() == {"delayed": 2, "rejected": 0}
+
+def test_limiter_rejects_with_retry_after_beyond_max_wait():
+    limiter = ServiceRateLimiter("TTS", requests_per_second=1, burst=1, max_wait=0.5)
+    limiter.acquire()
+    with pytest.raises(RateLimitExceededError) as raised:
+        limiter.acquire()
+    assert raised.value.retry_after == pytest.approx(1.0)
+    assert limiter.rejected == 1
+
+def test_character_limit_paces_long_texts(virtual_clock):
+    limiter = ServiceRateLimiter("TTS", chars_per_second=100, char_burst=100, max_wait=5.0)
+    limiter.acquire(chars=100)
+    limiter.acquire(chars=50)
+    assert clock.monotonic() == pytest.approx(0.5)
+
+def test_retry_waits_exactly_retry_after():
+    func = Throttled(retry_after=3.0)
+    assert retry_with_backoff(func, max_retries=2, initial_delay=0.1) == "ok"
+    assert func.attempts[1] - func.attempts[0] == pytest.approx(3.0)
+
+def test_retry_after_past_the_deadline_gives_up_at_once():
+    func = Throttled(retry_after=30.0)
+    with deadline_scope(5.0) as deadline:
+        with pytest.raises(RateLimitExceededError):
+            retry_with_backoff(func, max_retries=2, initial_delay=0.1, deadline=deadline)
+    assert len(func.attempts) == 1
+    assert clock.monotonic() == 0.0
+
+def test_vendor_429s_do_not_open_the_circuit():
+    tts = make_tts()
+    tts.vendor_rate_limit = TokenBucket(rate=1, capacity=1)
+    for text in ("one", "two", "three"):
+        assert tts.execute("generate_speech_call", text) == f"Speech audio for: {text}"
+    assert tts.circuit_breaker.failure_count == 0
+    assert tts.circuit_breaker.state.value == "CLOSED"
+
+def test_client_limit_keeps_calls_below_the_vendor_limit(virtual_clock):
+    tts = make_tts()
+    # No retries: a single vendor 429 would fail the call
+    tts.retry_config["max_retries"] = 0
+    tts.vendor_rate_limit = TokenBucket(rate=2, capacity=2)
+    tts.configure_rate_limit(requests_per_second=2, burst=2, max_wait=5.0)
+    for i in range(6):
+        assert tts.execute("generate_speech_call", f"text {i}") == f"Speech audio for: text {i}"
+    assert tts.rate_limiter.get_status()["delayed"] == 4
+    assert clock.monotonic() == pytest.approx(2.0)
+
+def test_rate_limit_wait_is_capped_by_the_call_deadline():
+    tts = make_tts()
+    tts.configure_rate_limit(requests_per_second=0.1, burst=1, max_wait=60.0)
+    tts.execute("generate_speech_call", "first")
+    with deadline_scope(1.0):
+        with pytest.raises((RateLimitExceededError, DeadlineExceededError)):
+            tts.execute("generate_speech_call", "second")
+    assert clock.monotonic() <= 1.0
@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from src.core import clock
+from src.core.exceptions import DeadlineExceededError, ServiceUnavailableError
+from src.core.resilience.deadline import current_deadline, deadline_scope
+from src.core.resilience.retry import _Backoff, retry_with_backoff
+from src.core.resilience.retry_budget import RetryBudget
+from src.services.base_service import BaseService
+
+class DownService(BaseService):
+    def __init__(self, name: str):
+        super().__init__(name, {"max_retries": 10, "initial_delay": 1.0}, {"failure_threshold": 100, "recovery_timeout": 30})
+        self.attempts = 0
+
+    def _speak_call(self, text: str) -> str:
+        self.attempts += 1
+        raise ServiceUnavailableError("unavailable", service_name=self.name)
+
+    def health_check(self) -> bool:
+        return True
+
+class Failing:
+    def __init__(self):
+        self.attempts = []
+
+    def __call__(self):
+        self.attempts.append(clock.monotonic())
+        raise ServiceUnavailableError("unavailable", service_name="Test")
+
+@pytest.fixture
+def virtual_clock():
+    with clock.use_clock(clock.VirtualClock()) as virtual:
+        yield virtual
+
+def test_budget_allows_retries_in_proportion_to_requests(virtual_clock):
+    budget = RetryBudget(ratio=0.2, min_retries_per_second=1)
+    for _ in range(10):
+        budget.record_request()
+    # Two retries earned by ten requests, plus the per-second floor
+    assert [budget.try_spend() for _ in range(4)] == [True, True, True, False]
+    assert budget.get_status()["exhausted"] == 1
+    virtual_clock.advance(1)
+    assert budget.try_spend()
+
+def test_exhausted_budget_stops_retrying(virtual_clock):
+    budget = RetryBudget(ratio=0.0, min_retries_per_second=1)
+    func = Failing()
+    with pytest.raises(ServiceUnavailableError):
+        retry_with_backoff(func, max_retries=5, initial_delay=0.1, retry_budget=budget)
+    # The floor pays for one retry within the same second
+    assert len(func.attempts) == 2
+
+def test_deadline_caps_backoff_and_stops_retries(virtual_clock):
+    func = Failing()
+    with deadline_scope(2.5) as deadline:
+        with pytest.raises(DeadlineExceededError):
+            retry_with_backoff(func, max_retries=10, initial_delay=1.0, backoff_factor=2.0, jitter="proportional", deadline=deadline)
+    # Attempts at 0 and ~1s; the ~2s sleep is cut to the 1.5s left, then no attempt starts
+    assert len(func.attempts) == 2
+    assert clock.monotonic() == pytest.approx(2.5)
+
+def test_services_in_one_call_share_its_deadline(virtual_clock):
+    llm, tts = DownService("LLM"), DownService("TTS")
+    with deadline_scope(3.0):
+        with pytest.raises(DeadlineExceededError):
+            llm.execute("speak_call", "hi")
+        # The LLM's retries used up the budget; TTS gets no attempt at all
+        with pytest.raises(DeadlineExceededError):
+            tts.execute("speak_call", "hi")
+    assert llm.attempts >= 2
+    assert tts.attempts == 0
+
+def test_nested_scope_only_tightens_the_deadline(virtual_clock):
+    with deadline_scope(5) as outer:
+        with deadline_scope(60) as inner:
+            assert inner is outer
+        with deadline_scope(1) as inner:
+            assert inner.remaining() == 1
+            assert current_deadline() is inner
+        assert current_deadline() is outer
+    assert current_deadline() is None
+
+def test_proportional_jitter_adds_at_most_ten_percent():
+    backoff = _Backoff(1.0, 2.0, max_delay=None, jitter="proportional")
+    for base in (1.0, 2.0, 4.0):
+        assert base <= backoff.next_sleep() <= base * 1.1
+
+def test_decorrelated_jitter_stays_between_initial_and_three_times_previous():
+    random.seed(1)
+    backoff = _Backoff(0.5, 2.0, max_delay=10.0, jitter="decorrelated")
+    previous = 0.5
+    for _ in range(50):
+        sleep = backoff.next_sleep()
+        assert 0.5 <= sleep <= min(10.0, previous * 3)
+        previous = sleep
+
+def test_unknown_jitter_is_rejected():
+    with pytest.raises(ValueError):
+        retry_with_backoff(lambda: "ok", jitter="gaussian")
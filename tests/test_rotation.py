@@ -0,0 +1,105 @@
+import gzip
+import json
+import logging
+import os
+
+import pytest
+
+from src.monitoring.log_sink import BatchingLogSink
+from src.monitoring.rotation import LogRotator, RotatingTextHandler
+
+def write(path, text):
+    with open(path, "a") as f:
+        f.write(text)
+
+def test_rotated_segment_is_gzipped_and_recorded(tmp_path):
+    path = str(tmp_path / "app_logs.json")
+    write(path, '{"n": 1}\n')
+    rotator = LogRotator(path, max_bytes=5)
+    assert rotator.should_rotate(os.path.getsize(path))
+    segment_path = rotator.rotate()
+    rotator.wait_for_archival()
+
+    assert not os.path.exists(path)
+    assert not os.path.exists(segment_path)
+    with gzip.open(segment_path + ".gz", "rt") as f:
+        assert f.read() == '{"n": 1}\n'
+    [segment] = rotator.segments()
+    assert segment["file"] == os.path.basename(segment_path) + ".gz"
+    assert segment["compression"] == "gzip"
+    assert segment["bytes"] == len('{"n": 1}\n')
+
+def test_empty_file_is_not_rotated(tmp_path):
+    path = str(tmp_path / "app_logs.json")
+    write(path, "")
+    rotator = LogRotator(path, max_bytes=5)
+    assert rotator.rotate() is None
+    assert rotator.segments() == []
+
+def test_retention_deletes_oldest_segments(tmp_path):
+    path = str(tmp_path / "app_logs.json")
+    rotator = LogRotator(path, max_bytes=5, compression=None, retention=2)
+    for n in range(4):
+        write(path, f"{n}\n")
+        rotator.rotate()
+    segments = rotator.segments()
+    assert len(segments) == 2
+    remaining = sorted(name for name in os.listdir(tmp_path) if not name.endswith(".manifest.json"))
+    assert remaining == sorted(segment["file"] for segment in segments)
+    with open(tmp_path / segments[-1]["file"]) as f:
+        assert f.read() == "3\n"
+
+def test_rotates_by_age(tmp_path):
+    path = str(tmp_path / "app_logs.json")
+    rotator = LogRotator(path, max_bytes=None, rotate_interval=60)
+    assert not rotator.should_rotate(100)
+    rotator.segment_start -= 61
+    assert rotator.should_rotate(100)
+    # An old but empty file is left alone
+    assert not rotator.should_rotate(0)
+
+def test_segments_filter_by_time_range(tmp_path):
+    path = str(tmp_path / "app_logs.json")
+    rotator = LogRotator(path, compression=None)
+    rotator._write_manifest([
+        {"file": "a.json", "start": 100.0, "end": 200.0},
+        {"file": "b.json", "start": 200.0, "end": 300.0},
+    ])
+    assert [s["file"] for s in rotator.segments(start=250)] == ["b.json"]
+    assert [s["file"] for s in rotator.segments(end=150)] == ["a.json"]
+
+def test_unknown_compression_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        LogRotator(str(tmp_path / "app_logs.json"), compression="rar")
+
+def test_sink_rotation_keeps_every_record(tmp_path):
+    path = str(tmp_path / "app_logs.json")
+    sink = BatchingLogSink(path, batch_size=5, flush_interval=0.01, rotation={"max_bytes": 100})
+    for n in range(40):
+        sink.submit({"n": n})
+    sink.close()
+
+    records = []
+    for segment in sink.rotator.segments():
+        with gzip.open(tmp_path / segment["file"], "rt") as f:
+            records.extend(json.loads(line) for line in f)
+    if os.path.exists(path):
+        with open(path) as f:
+            records.extend(json.loads(line) for line in f)
+    assert len(sink.rotator.segments()) > 1
+    assert [record["n"] for record in records] == list(range(40))
+
+def test_text_handler_rotates(tmp_path):
+    path = str(tmp_path / "app.log")
+    handler = RotatingTextHandler(path, {"max_bytes": 50, "compression": None})
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    text_logger = logging.getLogger("test_rotation.text")
+    text_logger.propagate = False
+    text_logger.addHandler(handler)
+    try:
+        for n in range(10):
+            text_logger.warning(f"line {n} " + "x" * 20)
+    finally:
+        text_logger.removeHandler(handler)
+        handler.close()
+    assert len(handler.rotator.segments()) >= 3
@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from src.core.exceptions import ServiceTimeoutError
+from src.core.resilience.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError, CircuitState
+from src.core.resilience.shared_state import (
+    BreakerStateBackend, FakeRedis, FakeWatchError, LocalStateBackend, MmapStateBackend, RedisStateBackend, fcntl
+)
+
+@pytest.fixture(params=["local", "mmap", "fake_redis"])
+def backend(request, tmp_path):
+    if request.param == "local":
+        return LocalStateBackend()
+    if request.param == "mmap":
+        if fcntl is None:
+            pytest.skip("mmap backend needs fcntl")
+        return MmapStateBackend(str(tmp_path / "breakers.mmap"))
+    return RedisStateBackend(FakeRedis())
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        BreakerStateBackend()
+
+def test_transition_is_compare_and_set(backend):
+    won, state = backend.transition("Test", 0, "OPEN", 100.0)
+    assert won and state.state == "OPEN" and state.version == 1
+
+    # A worker still holding version 0 loses and sees the current state
+    won, state = backend.transition("Test", 0, "HALF_OPEN", 200.0)
+    assert not won and state.state == "OPEN" and state.version == 1
+
+    won, state = backend.transition("Test", 1, "CLOSED", 0.0)
+    assert won and backend.get("Test").state == "CLOSED"
+
+def test_concurrent_transitions_have_one_winner(backend):
+    wins = []
+    threads = [
+        threading.Thread(target=lambda: wins.append(backend.transition("Test", 0, "OPEN", 100.0)[0]))
+        for _ in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert wins.count(True) == 1
+    assert backend.get("Test").version == 1
+
+def test_failures_are_counted_across_workers(backend):
+    assert backend.add_failure("Test") == 1
+    assert backend.add_failure("Test") == 2
+    backend.reset_failures("Test")
+    assert backend.get("Test").failures == 0
+
+def test_redis_transition_rejected_when_state_changes_mid_transaction():
+    client = FakeRedis()
+    pipe = client.pipeline()
+    pipe.watch("circuit:Test")
+    client.hset("circuit:Test", mapping={"state": "OPEN", "version": 1})
+    pipe.multi()
+    pipe.hset("circuit:Test", mapping={"state": "HALF_OPEN", "version": 1})
+    with pytest.raises(FakeWatchError):
+        pipe.execute()
+    assert client.hget("circuit:Test", "state") == "OPEN"
+
+def test_breakers_follow_a_shared_trip(backend):
+    first = CircuitBreaker("Test", failure_threshold=2, recovery_timeout=30)
+    second = CircuitBreaker("Test", failure_threshold=2, recovery_timeout=30)
+    first.use_shared_state(backend, sync_interval=0)
+    second.use_shared_state(backend, sync_interval=0)
+
+    def fail():
+        raise ServiceTimeoutError("timed out", service_name="Test")
+
+    # One failure seen by each worker trips the shared circuit
+    for breaker in (first, second):
+        with pytest.raises(ServiceTimeoutError):
+            breaker.call(fail)
+    assert CircuitState.OPEN in (first.state, second.state)
+    for breaker in (first, second):
+        with pytest.raises(CircuitBreakerOpenError):
+            breaker.call(lambda: "ok")
+        assert breaker.state is CircuitState.OPEN
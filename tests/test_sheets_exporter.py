@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from src.core.exceptions import AuthenticationError, RateLimitExceededError, ServiceUnavailableError
+from src.monitoring.sheets_exporter import HttpSheetsTransport, SheetsExporter, create_sheets_exporter
+from src.monitoring.sheets_stub import SheetsStubServer
+
+def event(n):
+    return {"timestamp": f"2026-01-29T13:00:{n:02d}", "service_name": "TTS", "event_type": "REQUEST_SUCCESS", "duration": n}
+
+@pytest.fixture
+def stub():
+    server = SheetsStubServer()
+    server.start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def make_exporter(stub, tmp_path):
+    exporters = []
+
+    def make(**options):
+        options.setdefault("flush_interval", 0.05)
+        options.setdefault("retry", {"max_retries": 2, "initial_delay": 0.01})
+        exporter = SheetsExporter(
+            HttpSheetsTransport("sheet-id", base_url=stub.base_url, timeout=2),
+            spill_path=str(tmp_path / "spill" / "sheets.jsonl"),
+            **options
+        )
+        exporters.append(exporter)
+        return exporter
+
+    yield make
+    for exporter in exporters:
+        exporter.close()
+
+def test_rows_are_appended_in_batches(stub, make_exporter):
+    exporter = make_exporter(batch_size=4)
+    exporter.submit([event(n) for n in range(10)])
+    assert exporter.flush()
+    assert [row[4] for row in stub.rows] == list(range(10))
+    assert stub.rows[0][:3] == ["2026-01-29T13:00:00", "TTS", "REQUEST_SUCCESS"]
+    assert exporter.get_stats()["batches"] == 3
+
+def test_transient_errors_are_retried(stub, make_exporter):
+    stub.fail_next(2, status=503)
+    exporter = make_exporter()
+    exporter.submit([event(1)])
+    assert exporter.flush()
+    assert len(stub.rows) == 1
+    assert stub.requests == 3
+    assert exporter.get_stats()["failed_batches"] == 0
+
+def test_undeliverable_rows_are_spilled_then_replayed(stub, make_exporter):
+    stub.set_down()
+    exporter = make_exporter(circuit_breaker={"failure_threshold": 10})
+    exporter.submit([event(1), event(2)])
+    assert exporter.flush()
+    assert stub.rows == []
+    assert exporter.spilled_rows() == 2
+
+    stub.set_down(False)
+    exporter.submit([event(3)])
+    assert exporter.flush()
+    assert sorted(row[4] for row in stub.rows) == [1, 2, 3]
+    assert exporter.spilled_rows() == 0
+    assert exporter.get_stats()["replayed"] == 2
+
+def test_rejected_rows_are_kept_aside(stub, make_exporter, tmp_path):
+    stub.fail_next(1, status=400)
+    exporter = make_exporter()
+    exporter.submit([event(1)])
+    assert exporter.flush()
+    with open(tmp_path / "spill" / "sheets.jsonl.rejected") as f:
+        assert [json.loads(line)[4] for line in f] == [1]
+    # A rejected batch is not retried
+    assert stub.requests == 1
+    assert exporter.get_stats()["rejected"] == 1
+
+def test_overflow_spills_instead_of_growing_memory(stub, make_exporter):
+    stub.set_down()
+    exporter = make_exporter(batch_size=2, max_buffer=2, flush_interval=5)
+    exporter.submit([event(n) for n in range(5)])
+    assert exporter.get_stats()["buffered"] <= 2
+    assert exporter.get_stats()["spilled"] >= 3
+
+def test_http_errors_map_to_app_errors(stub):
+    transport = HttpSheetsTransport("sheet-id", base_url=stub.base_url, timeout=2)
+    stub.fail_next(1, status=429)
+    with pytest.raises(RateLimitExceededError) as raised:
+        transport.append_rows([["row"]])
+    assert raised.value.retry_after == 1.0
+    stub.fail_next(1, status=503)
+    with pytest.raises(ServiceUnavailableError):
+        transport.append_rows([["row"]])
+    stub.fail_next(1, status=401)
+    with pytest.raises(AuthenticationError):
+        transport.append_rows([["row"]])
+
+def test_disabled_config_builds_no_exporter():
+    assert create_sheets_exporter({"enabled": False}) is None
+    with pytest.raises(ValueError):
+        create_sheets_exporter({"transport": "carrier-pigeon"})
@@ -0,0 +1,76 @@
+import pytest
+
+from src.core import clock
+from src.core.exceptions import ServiceTimeoutError
+from src.core.resilience.circuit_breaker import CircuitBreaker, CircuitState
+from src.core.resilience.sliding_window import CountBasedSlidingWindow, TimeBasedSlidingWindow
+
+def fail():
+    raise ServiceTimeoutError("timed out", service_name="Test")
+
+def ok():
+    return "ok"
+
+@pytest.fixture
+def virtual_clock():
+    with clock.use_clock(clock.VirtualClock()) as virtual:
+        yield virtual
+
+def test_count_window_keeps_only_the_last_calls():
+    window = CountBasedSlidingWindow(4)
+    for failed in (True, True, False, False, False, False):
+        window.record(failed, False, 0)
+    snapshot = window.snapshot(0)
+    assert (snapshot.total_calls, snapshot.failed_calls) == (4, 0)
+    window.record(True, True, 0)
+    snapshot = window.snapshot(0)
+    assert snapshot.failure_rate == 25.0
+    assert snapshot.slow_call_rate == 25.0
+
+def test_time_window_forgets_calls_older_than_its_size():
+    window = TimeBasedSlidingWindow(10)
+    window.record(True, False, 100.0)
+    window.record(False, False, 105.0)
+    assert window.snapshot(105.0).total_calls == 2
+    assert window.snapshot(110.5).total_calls == 1
+    # A gap longer than the window clears everything
+    assert window.snapshot(500.0).total_calls == 0
+
+def test_rate_breaker_waits_for_minimum_calls(virtual_clock):
+    breaker = CircuitBreaker("Test", window_type="count", window_size=10, failure_rate_threshold=50, minimum_calls=4)
+    for _ in range(3):
+        with pytest.raises(ServiceTimeoutError):
+            breaker.call(fail)
+    assert breaker.state is CircuitState.CLOSED
+    with pytest.raises(ServiceTimeoutError):
+        breaker.call(fail)
+    assert breaker.state is CircuitState.OPEN
+
+def test_scattered_failures_below_the_rate_keep_circuit_closed(virtual_clock):
+    # A consecutive counter with threshold 3 would trip on the run of three failures
+    breaker = CircuitBreaker("Test", window_type="count", window_size=20, failure_rate_threshold=50, minimum_calls=10)
+    for _ in range(10):
+        breaker.call(ok)
+    for _ in range(3):
+        with pytest.raises(ServiceTimeoutError):
+            breaker.call(fail)
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.get_status()["failure_rate"] == 23.08
+
+def test_slow_calls_trip_the_circuit(virtual_clock):
+    breaker = CircuitBreaker(
+        "Test", window_type="count", window_size=10, slow_call_rate_threshold=50,
+        slow_call_duration=1.0, minimum_calls=4
+    )
+
+    def slow():
+        virtual_clock.advance(2)
+        return "ok"
+
+    for _ in range(4):
+        assert breaker.call(slow) == "ok"
+    assert breaker.state is CircuitState.OPEN
+
+def test_unknown_window_type_is_rejected():
+    with pytest.raises(ValueError):
+        CircuitBreaker("Test", window_type="weekly")
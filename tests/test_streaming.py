@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+
+from src.core.resilience.deadline import current_deadline, deadline_scope
+from src.core.streaming import SentenceChunker, chunk_sentences, stream_speech
+
+def tokens(text):
+    # Roughly word-sized tokens, as an LLM would stream them
+    return [word + " " for word in text.split(" ")]
+
+def test_sentences_are_emitted_as_soon_as_complete():
+    chunker = SentenceChunker(min_chars=5)
+    assert chunker.feed("Hello there.") == []
+    # The sentence end only counts once whitespace follows it
+    assert chunker.feed(" How are") == ["Hello there."]
+    assert chunker.feed(" you? I am") == ["How are you?"]
+    assert chunker.feed(" fine.") == []
+    assert chunker.flush() == "I am fine."
+
+def test_short_sentences_are_merged():
+    text = "Hi. Thanks for taking my call today. Bye."
+    assert list(chunk_sentences(tokens(text), min_chars=20)) == ["Hi. Thanks for taking my call today.", "Bye."]
+
+def test_run_on_sentence_is_cut_at_a_space():
+    text = "word " * 30
+    chunks = list(chunk_sentences(tokens(text.strip()), min_chars=5, max_chars=40))
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+def test_quotes_after_the_full_stop_stay_with_the_sentence():
+    assert list(chunk_sentences(tokens('He said "call me back." Then he hung up.'), min_chars=5)) == [
+        'He said "call me back."', "Then he hung up."
+    ]
+
+def test_audio_is_yielded_in_order_despite_out_of_order_completion():
+    delays = {"first": 0.2, "second": 0.01, "third": 0.05}
+
+    def synthesize(chunk):
+        time.sleep(delays[chunk])
+        return f"audio:{chunk}"
+
+    assert list(stream_speech(["first", "second", "third"], synthesize, max_parallel=3)) == [
+        "audio:first", "audio:second", "audio:third"
+    ]
+
+def test_synthesis_starts_before_the_token_stream_ends():
+    first_synthesized = threading.Event()
+
+    def slow_chunks():
+        yield "first"
+        # The LLM is still generating while the first sentence is synthesized
+        assert first_synthesized.wait(2)
+        yield "second"
+
+    def synthesize(chunk):
+        first_synthesized.set()
+        return chunk.upper()
+
+    assert list(stream_speech(slow_chunks(), synthesize)) == ["FIRST", "SECOND"]
+
+def test_parallel_synthesis_is_bounded():
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def synthesize(chunk):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return chunk
+
+    assert len(list(stream_speech([str(i) for i in range(10)], synthesize, max_parallel=2))) == 10
+    assert peak[0] <= 2
+
+def test_failed_chunk_raises_from_the_iterator():
+    def synthesize(chunk):
+        if chunk == "bad":
+            raise ConnectionError("TTS down")
+        return chunk
+
+    stream = stream_speech(["good", "bad", "never"], synthesize, max_parallel=1)
+    assert next(stream) == "good"
+    with pytest.raises(ConnectionError):
+        next(stream)
+
+def test_workers_see_the_callers_deadline():
+    seen = []
+
+    def synthesize(chunk):
+        seen.append(current_deadline())
+        return chunk
+
+    with deadline_scope(30) as deadline:
+        list(stream_speech(["one", "two"], synthesize))
+    assert seen == [deadline, deadline]
@@ -0,0 +1,150 @@
+import json
+import pstats
+import threading
+import time
+
+import pytest
+
+from src.core.exceptions import ServiceUnavailableError
+from src.monitoring.profiling import Profiler
+from src.monitoring.tracing import ChromeTraceExporter, Tracer, current_span, current_trace_id, tracer
+from src.services.base_service import BaseService
+
+class FlakyService(BaseService):
+    def __init__(self):
+        super().__init__("TTS", {"max_retries": 2, "initial_delay": 0.001}, {"failure_threshold": 5, "recovery_timeout": 30})
+        self.failures = 1
+
+    def _speak_call(self, text: str) -> str:
+        if self.failures:
+            self.failures -= 1
+            raise ServiceUnavailableError("unavailable", service_name=self.name)
+        return f"audio for {text}"
+
+    def health_check(self) -> bool:
+        return True
+
+def read_events(path):
+    # The array is left open so the file can keep growing
+    with open(path) as f:
+        return json.loads(f.read().rstrip().rstrip(",") + "]")
+
+def test_sampled_trace_exports_nested_spans(tmp_path):
+    path = str(tmp_path / "traces" / "trace.json")
+    tracer = Tracer(sample_rate=1.0, exporter=ChromeTraceExporter(path))
+    with tracer.start_trace("call", contact="Alice") as root:
+        with tracer.span("attempt", service="TTS") as attempt:
+            assert current_span() is attempt
+        assert current_span() is root
+    assert current_span() is None
+    tracer.flush()
+    events = {event["name"]: event for event in read_events(path)}
+    assert events["attempt"]["ph"] == "X"
+    assert events["attempt"]["cat"] == "TTS"
+    assert events["attempt"]["args"]["parent_id"] == root.span_id
+    assert events["attempt"]["args"]["trace_id"] == events["call"]["args"]["trace_id"]
+    assert events["call"]["args"]["contact"] == "Alice"
+    assert events["call"]["dur"] >= events["attempt"]["dur"]
+
+def test_service_attempts_nest_under_the_call(tmp_path, monkeypatch):
+    path = str(tmp_path / "trace.json")
+    monkeypatch.setattr(tracer, "sample_rate", 1.0)
+    monkeypatch.setattr(tracer, "exporter", ChromeTraceExporter(path))
+    service = FlakyService()
+    with tracer.start_trace("call") as root:
+        assert service.execute("speak_call", "hello") == "audio for hello"
+    tracer.flush()
+    attempts = [event for event in read_events(path) if event["name"] == "attempt"]
+    # The retried attempt shows up as its own span, tagged with the failure
+    assert [event["args"]["attempt"] for event in attempts] == [1, 2]
+    assert attempts[0]["args"]["error"] == "ServiceUnavailableError"
+    assert all(event["args"]["trace_id"] == root.trace_id for event in attempts)
+
+def test_unsampled_trace_keeps_an_id_but_records_nothing(tmp_path):
+    exporter = ChromeTraceExporter(str(tmp_path / "trace.json"), flush_every=1)
+    tracer = Tracer(sample_rate=0.0, exporter=exporter)
+    with tracer.start_trace("call"):
+        # Log lines of unsampled calls still carry a trace ID
+        assert len(current_trace_id()) == 16
+        with tracer.span("attempt") as span:
+            assert span is None
+    assert current_trace_id() is None
+    assert exporter.exported == 0
+
+def test_failed_span_records_the_error(tmp_path):
+    path = str(tmp_path / "trace.json")
+    tracer = Tracer(sample_rate=1.0, exporter=ChromeTraceExporter(path, flush_every=1))
+    with pytest.raises(ConnectionError):
+        with tracer.start_trace("call"):
+            raise ConnectionError("TTS down")
+    assert read_events(path)[0]["args"]["error"] == "ConnectionError"
+
+def test_nested_start_trace_becomes_a_child_span(tmp_path):
+    tracer = Tracer(sample_rate=1.0, exporter=ChromeTraceExporter(str(tmp_path / "trace.json")))
+    with tracer.start_trace("call") as root:
+        with tracer.start_trace("inner") as inner:
+            assert inner.trace_id == root.trace_id
+            assert inner.parent_id == root.span_id
+
+def test_exported_spans_are_buffered(tmp_path):
+    path = tmp_path / "trace.json"
+    tracer = Tracer(sample_rate=1.0, exporter=ChromeTraceExporter(str(path), flush_every=3))
+    for _ in range(2):
+        with tracer.start_trace("call"):
+            pass
+    assert not path.exists()
+    with tracer.start_trace("call"):
+        pass
+    assert len(read_events(path)) == 3
+
+def test_configure_disabled_drops_the_exporter(tmp_path):
+    tracer = Tracer()
+    tracer.configure({"enabled": True, "sample_rate": 0.5, "path": str(tmp_path / "trace.json")})
+    assert tracer.sample_rate == 0.5 and tracer.exporter is not None
+    tracer.configure({"enabled": False})
+    assert tracer.sample_rate == 0.0 and tracer.exporter is None
+
+def busy(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+def test_sampling_profiler_writes_folded_stacks_of_other_threads(tmp_path):
+    profiler = Profiler(interval=0.001, output_dir=str(tmp_path))
+    stop = threading.Event()
+    worker = threading.Thread(target=busy, args=(stop,), name="busy-worker")
+    worker.start()
+    profiler.start()
+    time.sleep(0.1)
+    path = profiler.stop()
+    stop.set()
+    worker.join()
+    assert path.endswith(".folded")
+    with open(path) as f:
+        lines = f.read().splitlines()
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) >= 1
+    assert any(line.startswith("busy-worker;") and "busy (test_tracing.py" in line for line in lines)
+
+def test_cprofile_mode_writes_pstats(tmp_path):
+    profiler = Profiler(output_dir=str(tmp_path))
+    profiler.start("cprofile")
+    sum(range(1000))
+    path = profiler.stop()
+    assert path.endswith(".prof")
+    assert pstats.Stats(path).total_calls > 0
+
+def test_profiler_start_and_stop_are_idempotent(tmp_path):
+    profiler = Profiler(interval=0.001, output_dir=str(tmp_path))
+    assert profiler.stop() is None
+    profiler.start()
+    # A second start (e.g. another toggle request) keeps the running profile
+    profiler.start("cprofile")
+    assert profiler.get_status() == {"running": True, "mode": "sampling"}
+    assert profiler.toggle().endswith(".folded")
+    assert not profiler.running
+
+def test_unknown_profiler_mode_is_rejected():
+    with pytest.raises(ValueError):
+        Profiler(mode="perf")
+    with pytest.raises(ValueError):
+        Profiler().start("perf")